@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of preparing a relay command request.
+
+Compares building the URL, body and headers of a relay command from
+scratch, as the API client did before request templates, with the
+prebuilt parts the client now caches per (GUID, state) and API key. Reports
+time and memory allocated per command.
+
+Usage:
+    python benchmarks/bench_relay_request.py [--relays 32] [--commands 20000]
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from pathlib import Path
+import sys
+import timeit
+import tracemalloc
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from yarl import URL  # noqa: E402
+
+from payloads import make_device_list  # noqa: E402
+
+from custom_components.eltako_esr62pf.api import EltakoAPI  # noqa: E402
+from custom_components.eltako_esr62pf.const import ENDPOINT_RELAY  # noqa: E402
+
+
+def _prepare_from_scratch(api: EltakoAPI, device_guid: str, state: str) -> tuple:
+    """Build a relay request the way the client did without templates."""
+    endpoint = ENDPOINT_RELAY.format(device_guid=device_guid)
+    payload = {"type": "enumeration", "identifier": "relay", "value": state}
+    body = api._serializer.dumps(payload)
+    url = URL(f"{api.base_url}{endpoint}")
+    headers = {"Content-Type": "application/json", "Authorization": api._api_key}
+    return url, body, headers, api._endpoint_template(endpoint)
+
+
+def _prepare_from_templates(api: EltakoAPI, device_guid: str, state: str) -> tuple:
+    """Build a relay request from the client's prebuilt parts."""
+    endpoint, body = api._relay_request(device_guid, state)
+    url, endpoint_template = api._endpoint_info(endpoint)
+    headers = api._request_headers(api._api_key, True)
+    return url, body, headers, endpoint_template
+
+
+def _measure(
+    prepare: Callable[[EltakoAPI, str, str], Any],
+    api: EltakoAPI,
+    commands: list[tuple[str, str]],
+) -> tuple[float, float, float]:
+    """Return time, allocated bytes and allocated blocks per command."""
+    # Warm up caches so only steady-state commands are measured
+    for device_guid, state in commands:
+        prepare(api, device_guid, state)
+
+    def run() -> None:
+        for device_guid, state in commands:
+            prepare(api, device_guid, state)
+
+    seconds = min(timeit.repeat(run, number=1, repeat=5)) / len(commands)
+
+    results = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for device_guid, state in commands:
+        # Keep the results alive so their allocations are counted
+        results.append(prepare(api, device_guid, state))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+    blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    return seconds, size / len(commands), blocks / len(commands)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--relays", type=int, default=32)
+    parser.add_argument("--commands", type=int, default=20000)
+    args = parser.parse_args()
+
+    guids = [device["deviceGuid"] for device in make_device_list(args.relays)]
+    commands = [
+        (guids[index % len(guids)], "on" if index % 3 else "off")
+        for index in range(args.commands)
+    ]
+
+    print(f"{'variant':<12} {'per command':>14} {'bytes':>10} {'blocks':>8}")
+    for name, prepare in (
+        ("scratch", _prepare_from_scratch),
+        ("templates", _prepare_from_templates),
+    ):
+        api = EltakoAPI(ip_address="192.168.1.100", pop_credential="12345678")
+        api._api_key = "0123456789abcdef0123456789abcdef"
+        seconds, size, blocks = _measure(prepare, api, commands)
+        print(f"{name:<12} {seconds * 1e6:>11.2f} us {size:>10.1f} {blocks:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the JSON serializers used by the API client.
+
+Compares the standard library serializer with orjson on the payloads the
+integration sends and receives: login and relay command bodies, their
+responses, and device list responses of different gateway sizes. Device
+lists are also decoded with the streaming decoder the API client uses for
+bodies above DEVICE_LIST_STREAM_THRESHOLD, and the peak memory of each
+device list decoder is measured with tracemalloc.
+
+Usage:
+    python benchmarks/bench_serializer.py [--devices 16 64 256] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+import sys
+import timeit
+import tracemalloc
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from payloads import (  # noqa: E402
+    LOGIN_PAYLOAD,
+    LOGIN_RESPONSE,
+    RELAY_PAYLOAD,
+    make_device_list,
+)
+
+from custom_components.eltako_esr62pf.const import (  # noqa: E402
+    DEVICE_LIST_CHUNK_SIZE,
+    DEVICE_LIST_STREAM_THRESHOLD,
+)
+from custom_components.eltako_esr62pf.models import EltakoDevice  # noqa: E402
+from custom_components.eltako_esr62pf.serializer import (  # noqa: E402
+    ORJSON_SERIALIZER,
+    STDLIB_SERIALIZER,
+)
+from custom_components.eltako_esr62pf.streaming import (  # noqa: E402
+    JSONArrayStreamDecoder,
+)
+
+
+def _best_time(statement: Callable[[], Any], repeat: int) -> tuple[float, int]:
+    """Return the best time per call in seconds and the loop count."""
+    timer = timeit.Timer(statement)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number, number
+
+
+def _run_case(name: str, candidates: dict[str, Callable[[], Any]], repeat: int) -> None:
+    """Time one case with every candidate and print the results.
+
+    The first candidate is the baseline for the speedup column.
+    """
+    baseline = None
+    for backend, statement in candidates.items():
+        seconds, _ = _best_time(statement, repeat)
+        baseline = baseline or seconds
+        print(
+            f"{name:<36} {backend:<8} {seconds * 1e6:>12.2f} us"
+            f" {baseline / seconds:>8.2f}x"
+        )
+
+
+def _chunks(body: bytes) -> list[bytes]:
+    """Split a body into the chunks the API client reads."""
+    return [
+        body[start : start + DEVICE_LIST_CHUNK_SIZE]
+        for start in range(0, len(body), DEVICE_LIST_CHUNK_SIZE)
+    ]
+
+
+def _decode_whole(serializer: Any, chunks: list[bytes]) -> list:
+    """Decode a device list after buffering the whole body."""
+    document = serializer.loads(b"".join(chunks))
+    return [EltakoDevice.from_json(device) for device in document]
+
+
+def _decode_streaming(chunks: list[bytes]) -> list:
+    """Decode a device list the way the API client streams it."""
+    decoder = JSONArrayStreamDecoder()
+    devices = []
+    for chunk in chunks:
+        devices.extend(EltakoDevice.from_json(device) for device in decoder.feed(chunk))
+    decoder.close()
+    return devices
+
+
+def _peak_memory(statement: Callable[[], Any]) -> int:
+    """Return the peak memory in bytes allocated while running a statement.
+
+    The statement runs once before measuring, so one-time allocations such
+    as a backend's lazy initialization are not counted.
+    """
+    statement()
+    tracemalloc.start()
+    try:
+        result = statement()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    serializers = [STDLIB_SERIALIZER]
+    if ORJSON_SERIALIZER is None:
+        print("orjson is not installed; only the standard library is measured")
+    else:
+        serializers.append(ORJSON_SERIALIZER)
+
+    print(f"{'case':<36} {'backend':<8} {'per call':>15} {'speedup':>9}")
+
+    # Request bodies
+    for name, payload in (("encode login", LOGIN_PAYLOAD), ("encode relay", RELAY_PAYLOAD)):
+        _run_case(
+            name,
+            {s.name: partial(s.dumps, payload) for s in serializers},
+            args.repeat,
+        )
+
+    # Responses decoded as a whole
+    for name, payload in (
+        ("decode login response", LOGIN_RESPONSE),
+        ("decode relay response", RELAY_PAYLOAD),
+    ):
+        body = STDLIB_SERIALIZER.dumps(payload)
+        _run_case(
+            name,
+            {s.name: partial(s.loads, body) for s in serializers},
+            args.repeat,
+        )
+
+    # Device lists: whole-document decoding compared with streaming
+    device_lists = []
+    for count in args.devices:
+        body = STDLIB_SERIALIZER.dumps(make_device_list(count))
+        chunks = _chunks(body)
+        candidates = {s.name: partial(_decode_whole, s, chunks) for s in serializers}
+        candidates["stream"] = partial(_decode_streaming, chunks)
+        name = f"device list ({count}, {len(body) // 1024} KiB)"
+        _run_case(name, candidates, args.repeat)
+        device_lists.append((name, len(body), candidates))
+
+    # Peak memory of the device list decoders, including the buffered body
+    print()
+    print(f"{'case':<36} {'backend':<8} {'peak memory':>15} {'client':>9}")
+    for name, size, candidates in device_lists:
+        # The decoder the API client picks for a body of this size
+        client = (
+            "stream" if size > DEVICE_LIST_STREAM_THRESHOLD else serializers[-1].name
+        )
+        for backend, statement in candidates.items():
+            peak = _peak_memory(statement)
+            marker = "*" if backend == client else ""
+            print(f"{name:<36} {backend:<8} {peak / 1024:>11.0f} KiB {marker:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Realistic Eltako ESR62PF-IP payloads for micro-benchmarks."""
+from __future__ import annotations
+
+from typing import Any
+import uuid
+
+
+def make_device(index: int) -> dict[str, Any]:
+    """Build a device list entry shaped like the gateway's response.
+
+    Args:
+        index: Index of the device, used for names and GUIDs
+
+    Returns:
+        Device object as returned by GET /api/v0/devices
+    """
+    return {
+        "deviceGuid": str(uuid.UUID(int=index)),
+        "productGuid": str(uuid.UUID(int=10_000 + index % 4)),
+        "displayName": f"Relay {index} (Floor {index // 16})",
+        "functions": [
+            {"type": "enumeration", "identifier": "relay", "value": "on" if index % 2 else "off"},
+            {"type": "enumeration", "identifier": "operatingMode", "value": "normal"},
+        ],
+        "infos": [
+            {"type": "string", "identifier": "firmwareVersion", "value": "1.2.3"},
+            {"type": "number", "identifier": "rssi", "value": -60 - index % 20},
+            {"type": "string", "identifier": "serialNumber", "value": f"ESR62-{index:08d}"},
+        ],
+        "settings": [
+            {"type": "number", "identifier": "delayOn", "value": 0, "min": 0, "max": 3600},
+            {"type": "number", "identifier": "delayOff", "value": 0, "min": 0, "max": 3600},
+            {"type": "enumeration", "identifier": "powerOnState", "value": "last", "options": ["on", "off", "last"]},
+            {"type": "string", "identifier": "location", "value": f"Room {index % 12}"},
+        ],
+    }
+
+
+def make_device_list(count: int) -> list[dict[str, Any]]:
+    """Build a device list response with count devices."""
+    return [make_device(index) for index in range(count)]
+
+
+RELAY_PAYLOAD = {"type": "enumeration", "identifier": "relay", "value": "on"}
+LOGIN_PAYLOAD = {"user": "admin", "password": "12345678"}
+LOGIN_RESPONSE = {"apiKey": "0123456789abcdef0123456789abcdef"}
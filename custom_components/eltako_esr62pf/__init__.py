@@ -8,17 +8,37 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
 from homeassistant.const import CONF_IP_ADDRESS, CONF_PORT, Platform
+from homeassistant.helpers import config_validation as cv
 
 from .api import EltakoAPI
 from .const import (
+    CONF_CERT_FINGERPRINT,
+    CONF_CIRCUIT_FAILURE_THRESHOLD,
+    CONF_CIRCUIT_RECOVERY_TIMEOUT,
+    CONF_DEVICE_CACHE_MAX_STALE,
+    CONF_DEVICE_CACHE_TTL,
+    CONF_HEDGE_RELAY_COMMANDS,
     CONF_POLL_INTERVAL,
     CONF_POP_CREDENTIAL,
+    CONF_PROACTIVE_TOKEN_REFRESH,
+    CONF_RATE_LIMIT,
+    CONF_RATE_LIMIT_BURST,
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+    DEFAULT_CIRCUIT_RECOVERY_TIMEOUT,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT_BURST,
     DEFAULT_TIMEOUT,
+    DEFAULT_TOKEN_REFRESH_FRACTION,
+    DEVICE_CACHE_MAX_STALE,
+    DEVICE_CACHE_TTL,
     DOMAIN,
 )
 from .coordinator import EltakoDataUpdateCoordinator
+from .services import async_setup_services
+from .session import async_get_session_pool
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +46,24 @@ __version__ = "1.0.0"
 
 PLATFORMS: list[Platform] = [Platform.SWITCH]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Eltako ESR62PF-IP integration.
+
+    Services are registered once for all config entries.
+
+    Args:
+        hass: Home Assistant instance
+        config: Home Assistant configuration
+
+    Returns:
+        True if setup was successful
+    """
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Eltako ESR62PF-IP from a config entry.
@@ -56,31 +94,79 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "enabled" if update_interval else "disabled",
     )
 
-    # Create API client
-    api = EltakoAPI(
-        ip_address=ip_address,
-        pop_credential=pop_credential,
-        port=port,
-        verify_ssl=False,  # Self-signed certificates are common
-        timeout=DEFAULT_TIMEOUT,
-    )
-
-    # Create coordinator
-    coordinator = EltakoDataUpdateCoordinator(
-        hass=hass,
-        api=api,
-        update_interval=update_interval,
-    )
-
-    # Perform initial data fetch
-    await coordinator.async_config_entry_first_refresh()
-
-    # Store coordinator in hass.data for access by platform entities
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
-
-    # Forward setup to platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Share one keep-alive connection pool per device host:port
+    session_pool = async_get_session_pool(hass)
+    session = session_pool.acquire(ip_address, port, DEFAULT_TIMEOUT)
+
+    # Until setup completes, a failure must close the client and give the
+    # pooled session back
+    api: EltakoAPI | None = None
+    try:
+        # Create API client
+        api = EltakoAPI(
+            ip_address=ip_address,
+            pop_credential=pop_credential,
+            port=port,
+            verify_ssl=False,  # Self-signed certificates are common
+            session=session,
+            timeout=DEFAULT_TIMEOUT,
+            cert_fingerprint=entry.options.get(CONF_CERT_FINGERPRINT),
+            # Renew the API key in the background only if enabled, so an
+            # idle installation does not log in on a timer
+            token_refresh_fraction=(
+                DEFAULT_TOKEN_REFRESH_FRACTION
+                if entry.options.get(CONF_PROACTIVE_TOKEN_REFRESH, False)
+                else None
+            ),
+            # Entries for the same device share its request budget and
+            # outage state, like its connection pool
+            circuit_breaker=session_pool.circuit_breaker(
+                ip_address,
+                port,
+                failure_threshold=entry.options.get(
+                    CONF_CIRCUIT_FAILURE_THRESHOLD, DEFAULT_CIRCUIT_FAILURE_THRESHOLD
+                ),
+                recovery_timeout=entry.options.get(
+                    CONF_CIRCUIT_RECOVERY_TIMEOUT, DEFAULT_CIRCUIT_RECOVERY_TIMEOUT
+                ),
+            ),
+            hedge_relay_commands=entry.options.get(CONF_HEDGE_RELAY_COMMANDS, False),
+            rate_limiter=session_pool.rate_limiter(
+                ip_address,
+                port,
+                rate=entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                burst=entry.options.get(
+                    CONF_RATE_LIMIT_BURST, DEFAULT_RATE_LIMIT_BURST
+                ),
+            ),
+            device_cache_ttl=entry.options.get(CONF_DEVICE_CACHE_TTL, DEVICE_CACHE_TTL),
+            device_cache_max_stale=entry.options.get(
+                CONF_DEVICE_CACHE_MAX_STALE, DEVICE_CACHE_MAX_STALE
+            ),
+        )
+
+        # Create coordinator
+        coordinator = EltakoDataUpdateCoordinator(
+            hass=hass,
+            api=api,
+            update_interval=update_interval,
+        )
+
+        # Perform initial data fetch
+        await coordinator.async_config_entry_first_refresh()
+
+        # Store coordinator in hass.data for access by platform entities
+        hass.data.setdefault(DOMAIN, {})
+        hass.data[DOMAIN][entry.entry_id] = coordinator
+
+        # Forward setup to platforms
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        if api is not None:
+            await api.async_close()
+        await session_pool.async_release(ip_address, port)
+        raise
 
     # Register update listener for options changes
     entry.async_on_unload(entry.add_update_listener(async_update_options))
@@ -109,8 +195,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Retrieve coordinator
         coordinator: EltakoDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-        # Close API client
+        # Close API client and release its shared connection pool
         await coordinator.api.async_close()
+        await async_get_session_pool(hass).async_release(
+            entry.data[CONF_IP_ADDRESS], entry.data[CONF_PORT]
+        )
 
         # Remove coordinator from hass.data
         hass.data[DOMAIN].pop(entry.entry_id)
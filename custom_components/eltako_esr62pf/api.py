@@ -1,37 +1,78 @@
 """API client for Eltako ESR62PF-IP device."""
 import asyncio
+from collections.abc import Awaitable, Callable
+from functools import partial
 import logging
+import random
 import ssl
 import time
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 import aiohttp
+from yarl import URL
 from homeassistant.util.ssl import client_context_no_verify
 
+from .circuit_breaker import CircuitBreaker
+from .concurrency import AdaptiveConcurrencyLimiter
 from .const import (
     API_TOKEN_TTL,
+    CIRCUIT_STATE_HALF_OPEN,
+    DEFAULT_MAX_CONCURRENT_RELAY_COMMANDS,
+    DEFAULT_MAX_CONCURRENT_STATE_READS,
     DEFAULT_PORT,
     DEFAULT_TIMEOUT,
     DEFAULT_USERNAME,
+    DEVICE_CACHE_MAX_STALE,
     DEVICE_CACHE_TTL,
+    DEVICE_LIST_CHUNK_SIZE,
+    DEVICE_LIST_STREAM_THRESHOLD,
     ENDPOINT_DEVICES,
     ENDPOINT_LOGIN,
     ENDPOINT_RELAY,
     ERROR_MSG_AUTHENTICATION,
+    ERROR_MSG_CIRCUIT_OPEN,
     ERROR_MSG_CONNECTION,
+    ERROR_MSG_FINGERPRINT_MISMATCH,
     ERROR_MSG_TIMEOUT,
-    MAX_RETRIES,
+    HEDGE_MAX_DELAY,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
     RELAY_STATE_OFF,
     RELAY_STATE_ON,
-    RETRY_BACKOFF_BASE,
+    TOKEN_REFRESH_JITTER,
 )
 from .exceptions import (
     EltakoAPIError,
     EltakoAuthenticationError,
+    EltakoCircuitOpenError,
     EltakoConnectionError,
+    EltakoError,
     EltakoInvalidDeviceError,
     EltakoTimeoutError,
 )
+from .latency import LatencyTracker
+from .models import BulkRelayResult, EltakoDevice, RelayCommandResult
+from .priority import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_METADATA,
+    PRIORITY_RECONCILE,
+    RequestPriorityScheduler,
+)
+from .rate_limit import RateLimiter, parse_retry_after
+from .retry import (
+    RETRY_AUTH,
+    RETRY_CONNECT,
+    RETRY_THROTTLED,
+    RETRY_TIMEOUT,
+    RetryBudget,
+    RetryPolicy,
+)
+from .scheduler import RelayCommandScheduler
+from .serializer import JSONSerializer, get_default_serializer
+from .session import create_session, parse_certificate_fingerprint
+from .streaming import JSONArrayStreamDecoder
+from .timeouts import PHASE_TOTAL, AdaptiveTimeouts
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,6 +88,19 @@ class EltakoAPI:
         verify_ssl: bool = True,
         session: Optional[aiohttp.ClientSession] = None,
         timeout: int = DEFAULT_TIMEOUT,
+        max_concurrent_relay_commands: int = DEFAULT_MAX_CONCURRENT_RELAY_COMMANDS,
+        cert_fingerprint: Optional[str] = None,
+        token_refresh_fraction: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedge_relay_commands: bool = False,
+        adaptive_timeouts: Optional[AdaptiveTimeouts] = None,
+        max_concurrent_state_reads: int = DEFAULT_MAX_CONCURRENT_STATE_READS,
+        serializer: Optional[JSONSerializer] = None,
+        device_cache_ttl: float = DEVICE_CACHE_TTL,
+        device_cache_max_stale: float = DEVICE_CACHE_MAX_STALE,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
     ) -> None:
         """Initialize the API client.
 
@@ -56,39 +110,164 @@ class EltakoAPI:
             port: Port number (default: 443)
             verify_ssl: Whether to verify SSL certificates (default: True)
             session: Optional aiohttp session to use
-            timeout: Request timeout in seconds (default: 10)
+            timeout: Maximum request timeout in seconds (default: 10)
+            max_concurrent_relay_commands: Maximum relay commands in flight
+                for different relays at the same time (default: 16)
+            cert_fingerprint: Optional SHA-256 fingerprint of the device
+                certificate to pin instead of verifying it against CAs
+            token_refresh_fraction: Optional fraction of API_TOKEN_TTL after
+                which the API key is renewed in the background (default: None,
+                tokens are only refreshed lazily once expired)
+            retry_policy: Optional retry policy (default: RetryPolicy())
+            circuit_breaker: Optional circuit breaker for the device host
+                (default: CircuitBreaker())
+            hedge_relay_commands: Whether to send a second, identical relay
+                command when the first is slower than recent relay commands
+                (default: False)
+            adaptive_timeouts: Optional per-endpoint timeouts learned from
+                observed latencies (default: AdaptiveTimeouts capped at
+                timeout)
+            max_concurrent_state_reads: Maximum relay state reads in flight
+                at the same time (default: 4)
+            serializer: JSON serializer for request bodies and responses
+                (default: orjson if installed, else the standard library)
+            device_cache_ttl: Seconds a cached device list is fresh
+                (default: 60)
+            device_cache_max_stale: Maximum age in seconds of a cached device
+                list that is still returned while it refreshes in the
+                background (default: 600)
+            rate_limiter: Optional limiter for all requests to the device
+                (default: RateLimiter())
+            concurrency_limiter: Optional adaptive limit on the requests in
+                flight to the device (default: AdaptiveConcurrencyLimiter())
+
+        Raises:
+            ValueError: If cert_fingerprint is not a valid SHA-256 fingerprint,
+                token_refresh_fraction is not between 0 and 1, or
+                device_cache_max_stale is smaller than device_cache_ttl
         """
         self._ip_address = ip_address
         self._pop_credential = pop_credential
         self._port = port
         self._verify_ssl = verify_ssl
         self._timeout = timeout
+        # Per-endpoint timeouts adapt to the device's observed latency
+        self._adaptive_timeouts = adaptive_timeouts or AdaptiveTimeouts(
+            first_byte_ceiling=timeout, total_ceiling=timeout
+        )
         self._session = session
         self._owns_session = session is None
 
+        # SSL context is built once and reused for the client's lifetime, so
+        # pooled connections (keyed on its identity) can be reused
+        self._cert_fingerprint = (
+            parse_certificate_fingerprint(cert_fingerprint)
+            if cert_fingerprint
+            else None
+        )
+        self._ssl_context: Union[ssl.SSLContext, aiohttp.Fingerprint, None] = None
+        self._ssl_context_ready = False
+
         # Token management
         self._api_key: Optional[str] = None
         self._token_timestamp: Optional[float] = None
-        self._token_lock = asyncio.Lock()
+        # Single-flight login shared by concurrent callers
+        self._login_task: Optional[asyncio.Task] = None
+        self._logins = 0
+        self._logins_avoided = 0
+
+        # Proactive background token refresh
+        if token_refresh_fraction is not None and not 0 < token_refresh_fraction < 1:
+            raise ValueError("token_refresh_fraction must be between 0 and 1")
+        self._token_refresh_fraction = token_refresh_fraction
+        self._token_refresh_handle: Optional[asyncio.TimerHandle] = None
+        self._token_refresh_task: Optional[asyncio.Task] = None
+
+        # Retry handling: per-call policy and per-device retry budget
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._retry_budget = RetryBudget()
+        self._retry_stats = {
+            RETRY_AUTH: 0,
+            RETRY_CONNECT: 0,
+            RETRY_TIMEOUT: 0,
+            RETRY_THROTTLED: 0,
+            "deadline_exceeded": 0,
+        }
 
-        # Device caching
-        self._devices_cache: Optional[list[dict[str, Any]]] = None
-        self._devices_cache_timestamp: Optional[float] = None
+        # Fail fast while the device host is unreachable
+        self._circuit_breaker = circuit_breaker or CircuitBreaker()
 
-        # Relay control queueing
-        self._relay_lock = asyncio.Lock()
+        # Queue requests beyond the rate the device can take
+        self._rate_limiter = rate_limiter or RateLimiter()
+        # Adapt the requests in flight to what the device currently handles
+        self._concurrency_limiter = concurrency_limiter or AdaptiveConcurrencyLimiter()
 
-    def _get_ssl_context(self) -> Optional[ssl.SSLContext]:
+        # Device caching: stale-while-revalidate between TTL and max staleness
+        if device_cache_max_stale < device_cache_ttl:
+            raise ValueError("device_cache_max_stale must not be below device_cache_ttl")
+        self._device_cache_ttl = device_cache_ttl
+        self._device_cache_max_stale = device_cache_max_stale
+        self._devices_cache: Optional[list[EltakoDevice]] = None
+        self._devices_cache_timestamp: Optional[float] = None
+        self._device_refresh_task: Optional[asyncio.Task] = None
+        # Single-flight device list request shared by concurrent callers
+        self._device_fetch_task: Optional[asyncio.Task] = None
+        self._device_cache_stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "background_refreshes": 0,
+            "background_failures": 0,
+            "requests_coalesced": 0,
+        }
+        # Called after a background refresh replaced a stale device list
+        self._device_listeners: list[Callable[[], None]] = []
+
+        # Relay control queueing: one ordered lane per relay GUID
+        self._relay_scheduler = RelayCommandScheduler(max_concurrent_relay_commands)
+        self._bulk_relay_stats = {"operations": 0, "commands": 0, "failures": 0}
+
+        # Relay commands go first; state reads and polls wait for them
+        self._request_priority = RequestPriorityScheduler()
+
+        self._max_concurrent_state_reads = max_concurrent_state_reads
+        self._serializer = serializer or get_default_serializer()
+
+        # Relay command latency and optional hedging of slow commands
+        self._relay_latency = LatencyTracker()
+        self._hedge_relay_commands = hedge_relay_commands
+        self._hedge_stats = {"commands": 0, "hedged": 0, "hedge_wins": 0}
+
+        # Prebuilt request parts: URL and endpoint template per path, path
+        # and encoded body per relay command, headers per API key
+        self._endpoints: dict[str, tuple[URL, str]] = {}
+        self._relay_requests: dict[tuple[str, str], tuple[str, bytes]] = {}
+        self._headers_token: Optional[str] = None
+        self._headers: dict[str, Optional[str]] = {}
+        self._json_headers: dict[str, Optional[str]] = {}
+        self._header_builds = 0
+
+    def _get_ssl_context(self) -> Union[ssl.SSLContext, aiohttp.Fingerprint, None]:
         """Get SSL context for HTTPS connections.
 
+        The context is created on first use and cached for the lifetime of the
+        client. A pinned certificate fingerprint takes precedence over the
+        verify_ssl setting: the self-signed device certificate is accepted
+        only if its SHA-256 digest matches.
+
         Returns:
-            SSL context or None if SSL verification is enabled (uses default)
+            Fingerprint to pin, SSL context without verification, or None if
+            SSL verification is enabled (uses default)
         """
-        if not self._verify_ssl:
-            # Use Home Assistant's helper to create SSL context without verification
-            # This helper handles blocking I/O operations safely
-            return client_context_no_verify()
-        return None  # Use aiohttp's default SSL verification
+        if not self._ssl_context_ready:
+            if self._cert_fingerprint is not None:
+                self._ssl_context = aiohttp.Fingerprint(self._cert_fingerprint)
+            elif not self._verify_ssl:
+                # Use Home Assistant's helper to create SSL context without verification
+                # This helper handles blocking I/O operations safely
+                self._ssl_context = client_context_no_verify()
+            self._ssl_context_ready = True
+        return self._ssl_context
 
     @property
     def base_url(self) -> str:
@@ -110,12 +289,14 @@ class EltakoAPI:
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session.
 
+        A session created here uses the same tuned keep-alive connector as
+        the shared pools in session.py.
+
         Returns:
             aiohttp ClientSession
         """
         if self._session is None:
-            timeout = aiohttp.ClientTimeout(total=self._timeout)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            self._session = create_session(self._ip_address, self._timeout)
         return self._session
 
     async def async_login(self) -> str:
@@ -129,20 +310,26 @@ class EltakoAPI:
             EltakoConnectionError: If connection fails
             EltakoTimeoutError: If request times out
         """
-        url = f"{self.base_url}{ENDPOINT_LOGIN}"
+        url, _ = self._endpoint_info(ENDPOINT_LOGIN)
         payload = {
             "user": DEFAULT_USERNAME,
             "password": self._pop_credential,
         }
 
+        await self._rate_limiter.async_acquire()
+        timing: dict[str, float] = {}
+        start = time.monotonic()
+
         try:
             session = await self._get_session()
             ssl_context = self._get_ssl_context()
             async with session.post(
                 url,
-                json=payload,
+                data=self._serializer.dumps(payload),
                 headers={"Content-Type": "application/json"},
                 ssl=ssl_context,
+                timeout=self._adaptive_timeouts.client_timeout(ENDPOINT_LOGIN),
+                trace_request_ctx=timing,
             ) as response:
                 if response.status == 401:
                     error_msg = ERROR_MSG_AUTHENTICATION
@@ -150,6 +337,7 @@ class EltakoAPI:
                     raise EltakoAuthenticationError(error_msg)
 
                 if response.status != 200:
+                    self._pause_if_throttled(response)
                     error_text = await response.text()
                     _LOGGER.error(
                         "Login failed with status %d: %s",
@@ -157,29 +345,36 @@ class EltakoAPI:
                         error_text,
                     )
                     raise EltakoAPIError(
-                        f"Login failed with status {response.status}: {error_text}"
+                        f"Login failed with status {response.status}: {error_text}",
+                        response.status,
                     )
 
-                # Eltako device returns Content-Type: text/html even for JSON responses
-                # Use content_type=None to bypass content type check
-                data = await response.json(content_type=None)
-                api_key = data.get("apiKey")
+                data = await self._read_json(response)
+                api_key = data.get("apiKey") if isinstance(data, dict) else None
 
                 if not api_key:
                     raise EltakoAPIError("No API key in login response")
 
+                self._record_timing(ENDPOINT_LOGIN, timing, start)
+
                 # Cache the token with timestamp
                 self._api_key = api_key
                 self._token_timestamp = time.time()
+                self._logins += 1
+                self._schedule_token_refresh()
 
                 _LOGGER.debug("Successfully authenticated and cached API key")
                 return api_key
 
+        except aiohttp.ServerFingerprintMismatch as err:
+            _LOGGER.error("Certificate fingerprint mismatch during login: %s", err)
+            raise EltakoConnectionError(ERROR_MSG_FINGERPRINT_MISMATCH) from err
         except aiohttp.ClientConnectorError as err:
             error_msg = ERROR_MSG_CONNECTION.format(ip=self._ip_address, port=self._port)
             _LOGGER.error("Connection error during login: %s", err)
             raise EltakoConnectionError(error_msg) from err
         except asyncio.TimeoutError as err:
+            self._adaptive_timeouts.record_timeout(ENDPOINT_LOGIN)
             error_msg = ERROR_MSG_TIMEOUT
             _LOGGER.error("Timeout during login")
             raise EltakoTimeoutError(error_msg) from err
@@ -188,148 +383,645 @@ class EltakoAPI:
             _LOGGER.error("HTTP error during login: %s", err)
             raise EltakoConnectionError(error_msg) from err
 
+    def _schedule_token_refresh(self) -> None:
+        """Schedule a background refresh of the current API key.
+
+        The refresh runs at token_refresh_fraction of API_TOKEN_TTL, shortened
+        by a random jitter so several clients do not renew at the same time.
+        """
+        if self._token_refresh_fraction is None:
+            return
+
+        if self._token_refresh_handle is not None:
+            self._token_refresh_handle.cancel()
+
+        delay = API_TOKEN_TTL * self._token_refresh_fraction
+        delay *= 1 - random.uniform(0, TOKEN_REFRESH_JITTER)
+        self._token_refresh_handle = asyncio.get_running_loop().call_later(
+            delay, self._start_token_refresh
+        )
+        _LOGGER.debug("Scheduled background token refresh in %.0fs", delay)
+
+    def _start_token_refresh(self) -> None:
+        """Start the background token refresh task."""
+        self._token_refresh_handle = None
+        if self._token_refresh_task is None or self._token_refresh_task.done():
+            self._token_refresh_task = asyncio.get_running_loop().create_task(
+                self._async_refresh_token()
+            )
+
+    async def _async_refresh_token(self) -> None:
+        """Renew the API key in the background.
+
+        In-flight commands are not blocked and keep using the current, still
+        valid key. On failure the key is left untouched and the next request
+        refreshes it lazily once it has expired.
+        """
+        _LOGGER.debug("Refreshing API key in the background")
+        try:
+            await self._async_login_once(self._api_key)
+        except EltakoError as err:
+            _LOGGER.debug(
+                "Background token refresh failed, falling back to lazy refresh: %s",
+                err,
+            )
+
+    def _on_login_done(self, task: asyncio.Task) -> None:
+        """Clear the finished single-flight login task.
+
+        Args:
+            task: The finished login task
+        """
+        if self._login_task is task:
+            self._login_task = None
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _async_login_once(self, stale_token: Optional[str]) -> None:
+        """Log in, sharing a single login among all concurrent callers.
+
+        The first caller starts the login; callers arriving while it runs
+        wait for its result instead of logging in again. Callers whose stale
+        token has already been replaced by a fresh one return immediately.
+
+        Args:
+            stale_token: API key the caller found expired or rejected
+
+        Raises:
+            EltakoAuthenticationError: If authentication fails
+            EltakoConnectionError: If connection fails
+            EltakoTimeoutError: If request times out
+        """
+        if self._api_key != stale_token and not self._is_token_expired():
+            self._logins_avoided += 1
+            _LOGGER.debug("Token already refreshed by a concurrent request")
+            return
+
+        if self._login_task is None:
+            self._login_task = asyncio.get_running_loop().create_task(
+                self.async_login()
+            )
+            self._login_task.add_done_callback(self._on_login_done)
+        else:
+            self._logins_avoided += 1
+            _LOGGER.debug("Waiting for login already in progress")
+
+        # Shield so a cancelled caller does not abort the shared login
+        await asyncio.shield(self._login_task)
+
     async def _ensure_valid_token(self) -> None:
         """Ensure we have a valid, non-expired API token.
 
         This method checks if the token is expired and refreshes it if needed.
-        Uses a lock to prevent concurrent refresh attempts.
+        Concurrent callers share a single login.
 
         Raises:
             EltakoAuthenticationError: If token refresh fails
         """
-        async with self._token_lock:
-            if self._is_token_expired():
-                _LOGGER.debug("Token expired or not set, refreshing...")
-                await self.async_login()
+        if self._is_token_expired():
+            _LOGGER.debug("Token expired or not set, refreshing...")
+            await self._async_login_once(self._api_key)
+
+    @property
+    def circuit_state(self) -> str:
+        """Return the circuit breaker state (closed, open or half_open)."""
+        return self._circuit_breaker.state
 
     async def _make_request(
         self,
         method: str,
         endpoint: str,
-        retry_count: int = 0,
+        response_parser: Optional[
+            Callable[[aiohttp.ClientResponse], Awaitable[Any]]
+        ] = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        dispatched: Optional[asyncio.Event] = None,
+        request_timing: Optional[dict[str, float]] = None,
         **kwargs: Any,
     ) -> dict[str, Any]:
-        """Make an authenticated API request with retry logic.
+        """Make an authenticated API request guarded by the circuit breaker.
+
+        While the breaker is open the request fails immediately without any
+        network I/O. Transport errors, timeouts and 5xx responses count as
+        failures; any other response from the device closes it. Errors
+        raised locally, such as a certificate fingerprint mismatch or a
+        deadline expiring while the request is queued, count as neither.
+        Requests of a background priority class are deferred while more
+        urgent requests are pending.
 
         Args:
             method: HTTP method (GET, POST, PUT, etc.)
             endpoint: API endpoint path
-            retry_count: Current retry attempt (for internal use)
+            response_parser: Optional coroutine function reading a successful
+                response body instead of decoding it as a whole
+            priority: Priority class of the request
+            dispatched: Optional event set once the request leaves the local
+                queues and is sent to the device
+            request_timing: Optional dictionary receiving the phase latencies
+                of the successful attempt, measured from its dispatch
             **kwargs: Additional arguments to pass to aiohttp request
 
         Returns:
-            JSON response data
+            JSON response data, or the response parser's result
 
         Raises:
+            EltakoCircuitOpenError: If the circuit breaker is open
             EltakoAuthenticationError: If authentication fails
             EltakoConnectionError: If connection fails
             EltakoAPIError: If API returns an error
             EltakoTimeoutError: If request times out
         """
-        # Ensure we have a valid token before making the request
-        await self._ensure_valid_token()
+        breaker = self._circuit_breaker
+        if not breaker.allow_request():
+            raise EltakoCircuitOpenError(
+                ERROR_MSG_CIRCUIT_OPEN.format(
+                    ip=self._ip_address, port=self._port, retry_in=breaker.retry_in
+                )
+            )
+        # The half-open probe is a single attempt, not a full retry ladder
+        probe = breaker.state == CIRCUIT_STATE_HALF_OPEN
 
-        url = f"{self.base_url}{endpoint}"
-        headers = kwargs.pop("headers", {})
-        headers["Authorization"] = self._api_key
+        try:
+            async with self._request_priority.async_slot(priority):
+                result = await self._make_request_with_retries(
+                    method,
+                    endpoint,
+                    probe,
+                    response_parser,
+                    dispatched=dispatched,
+                    request_timing=request_timing,
+                    **kwargs,
+                )
+        except EltakoError as err:
+            if self._is_device_failure(err):
+                breaker.record_failure()
+            elif isinstance(err, (EltakoConnectionError, EltakoTimeoutError)):
+                # Failed locally, which says nothing about the device
+                if probe:
+                    breaker.release_probe()
+            else:
+                # The device answered, so the host is reachable
+                breaker.record_success()
+            raise
+        except BaseException:
+            if probe:
+                breaker.release_probe()
+            raise
+
+        breaker.record_success()
+        return result
+
+    @staticmethod
+    def _is_device_failure(err: EltakoError) -> bool:
+        """Check whether a request error shows the device failing.
 
-        # Set Content-Type for JSON requests
-        if "json" in kwargs:
-            headers.setdefault("Content-Type", "application/json")
+        Args:
+            err: Error raised by the request
 
-        try:
-            session = await self._get_session()
-            ssl_context = self._get_ssl_context()
-            async with session.request(
-                method,
-                url,
-                headers=headers,
-                ssl=ssl_context,
-                **kwargs,
-            ) as response:
-                # Handle 401 - token expired, refresh and retry once
-                if response.status == 401 and retry_count == 0:
-                    _LOGGER.debug("Received 401, refreshing token and retrying")
-                    async with self._token_lock:
-                        await self.async_login()
-                    # Retry the request once with new token
-                    return await self._make_request(
-                        method, endpoint, retry_count=retry_count + 1, **kwargs
-                    )
+        Returns:
+            True for transport errors, timeouts on the wire and 5xx responses
+        """
+        if isinstance(err, EltakoAPIError):
+            return err.status is not None and err.status >= 500
+        cause = err.__cause__
+        return isinstance(
+            cause, (aiohttp.ClientError, asyncio.TimeoutError)
+        ) and not isinstance(cause, aiohttp.ServerFingerprintMismatch)
+
+    async def _make_request_with_retries(
+        self,
+        method: str,
+        endpoint: str,
+        probe: bool = False,
+        response_parser: Optional[
+            Callable[[aiohttp.ClientResponse], Awaitable[Any]]
+        ] = None,
+        dispatched: Optional[asyncio.Event] = None,
+        request_timing: Optional[dict[str, float]] = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Make an authenticated API request with retry logic.
 
-                if response.status not in (200, 201, 202, 204):
-                    error_text = await response.text()
-                    _LOGGER.error(
-                        "API request failed with status %d: %s",
-                        response.status,
-                        error_text,
-                    )
-                    raise EltakoAPIError(
-                        f"API request failed with status {response.status}"
-                    )
+        Retries follow the client's RetryPolicy: all attempts share one
+        deadline, authentication, connection and timeout errors have separate
+        retry limits, and every backoff retry spends a token from the
+        per-device RetryBudget.
 
-                # Handle empty responses (e.g., 204 No Content)
-                if response.status == 204:
-                    return {}
+        Args:
+            method: HTTP method (GET, POST, PUT, etc.)
+            endpoint: API endpoint path
+            probe: Whether this is the circuit breaker's half-open probe,
+                which is not retried after connection errors or timeouts
+            response_parser: Optional coroutine function reading a successful
+                response body instead of decoding it as a whole
+            dispatched: Optional event set once an attempt is sent
+            request_timing: Optional dictionary receiving the phase latencies
+                of the successful attempt
+            **kwargs: Additional arguments to pass to aiohttp request
+
+        Returns:
+            JSON response data, or the response parser's result
 
-                # Handle accepted responses (e.g., 202 Accepted for relay control)
-                if response.status == 202:
-                    # Device returns JSON response with status details
-                    return await response.json(content_type=None)
+        Raises:
+            EltakoAuthenticationError: If authentication fails
+            EltakoConnectionError: If connection fails
+            EltakoAPIError: If API returns an error
+            EltakoTimeoutError: If request times out
+        """
+        url, endpoint_template = self._endpoint_info(endpoint)
+        extra_headers = kwargs.pop("headers", None)
 
-                # Eltako device returns Content-Type: text/html even for JSON responses
-                # Use content_type=None to bypass content type check
-                return await response.json(content_type=None)
+        # Encode JSON bodies once for all attempts; every body sent is JSON
+        if "json" in kwargs:
+            kwargs["data"] = self._serializer.dumps(kwargs.pop("json"))
+        json_body = "data" in kwargs
+
+        deadline = time.monotonic() + self._retry_policy.deadline
+        retries = dict.fromkeys(
+            (RETRY_AUTH, RETRY_CONNECT, RETRY_TIMEOUT, RETRY_THROTTLED), 0
+        )
+
+        # Token rejected with a 401 by the previous attempt
+        rejected_token: Optional[str] = None
+
+        while True:
+            if rejected_token is not None:
+                # Concurrent 401s for the same token share one login
+                await self._async_login_once(rejected_token)
+                rejected_token = None
+
+            # Ensure we have a valid token before making the request
+            await self._ensure_valid_token()
+
+            token = self._api_key
+            headers = self._request_headers(token, json_body)
+            if extra_headers:
+                headers = {**headers, **extra_headers}
+
+            # Queue behind other requests instead of overloading the device
+            await self._rate_limiter.async_acquire()
+
+            # Never let a single attempt run past the call's deadline
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                _LOGGER.error("Request deadline exceeded before sending request")
+                raise EltakoTimeoutError(ERROR_MSG_TIMEOUT)
+            # The breaker's probe must not fail on timeouts learned while
+            # the device was still fast
+            timeout = self._adaptive_timeouts.client_timeout(
+                endpoint_template, remaining, learned=not probe
+            )
+            timing: dict[str, float] = {}
+
+            try:
+                session = await self._get_session()
+                ssl_context = self._get_ssl_context()
+                # Logins and backoff run outside the concurrency slot, so
+                # they neither hold a slot nor count as slow requests
+                async with self._concurrency_limiter.async_slot(
+                    f"{method} {endpoint_template}"
+                ) as slot:
+                    # Latencies are measured from dispatch, without the time
+                    # spent waiting in the local queues
+                    start = time.monotonic()
+                    if dispatched is not None:
+                        dispatched.set()
+                    async with session.request(
+                        method,
+                        url,
+                        headers=headers,
+                        ssl=ssl_context,
+                        timeout=timeout,
+                        trace_request_ctx=timing,
+                        **kwargs,
+                    ) as response:
+                        # Handle 401 - token expired, refresh and retry
+                        if response.status == 401 and self._can_retry(
+                            RETRY_AUTH, retries, deadline
+                        ):
+                            _LOGGER.debug(
+                                "Received 401, refreshing token and retrying"
+                            )
+                            rejected_token = token
+                            continue
+
+                        if response.status in (429, 503):
+                            slot.mark_overloaded()
+
+                        # Overloaded device asking to retry later: hold back
+                        # all requests and retry once the pause has passed
+                        retry_after = self._pause_if_throttled(response)
+                        if (
+                            retry_after is not None
+                            and time.monotonic() + retry_after < deadline
+                            and self._can_retry(RETRY_THROTTLED, retries, deadline)
+                        ):
+                            _LOGGER.debug(
+                                "Received %d, retrying in %.1fs",
+                                response.status,
+                                retry_after,
+                            )
+                            continue
+
+                        if response.status not in (200, 201, 202, 204):
+                            error_text = await response.text()
+                            _LOGGER.error(
+                                "API request failed with status %d: %s",
+                                response.status,
+                                error_text,
+                            )
+                            raise EltakoAPIError(
+                                f"API request failed with status {response.status}",
+                                response.status,
+                            )
+
+                        # Handle empty responses (e.g., 204 No Content)
+                        if response.status == 204:
+                            result = {}
+
+                        # Handle accepted responses (e.g., 202 Accepted for relay control)
+                        elif response.status == 202:
+                            # Device returns JSON response with status details
+                            result = await self._read_json(response)
+
+                        elif response_parser is not None:
+                            result = await response_parser(response)
+
+                        else:
+                            result = await self._read_json(response)
+
+                        self._record_timing(endpoint_template, timing, start)
+                        if request_timing is not None:
+                            request_timing.update(timing)
+                        return result
+
+            except aiohttp.ServerFingerprintMismatch as err:
+                # A different certificate will not go away by retrying
+                _LOGGER.error("Certificate fingerprint mismatch: %s", err)
+                raise EltakoConnectionError(ERROR_MSG_FINGERPRINT_MISMATCH) from err
+
+            except (aiohttp.ClientConnectorError, aiohttp.ServerDisconnectedError) as err:
+                # Connection refused, or a kept-alive connection closed by the device
+                delay = (
+                    None
+                    if probe
+                    else self._next_retry_delay(RETRY_CONNECT, retries, deadline)
+                )
+                if delay is not None:
+                    _LOGGER.warning(
+                        "Connection error to %s:%s (attempt %d/%d), retrying in %.1fs: %s",
+                        self._ip_address,
+                        self._port,
+                        retries[RETRY_CONNECT],
+                        self._retry_policy.max_retries(RETRY_CONNECT),
+                        delay,
+                        err,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
 
-        except aiohttp.ClientConnectorError as err:
-            # Implement exponential backoff retry for connection errors
-            if retry_count < MAX_RETRIES:
-                wait_time = RETRY_BACKOFF_BASE ** retry_count
-                _LOGGER.warning(
-                    "Connection error to %s:%s (attempt %d/%d), retrying in %ds: %s",
-                    self._ip_address,
-                    self._port,
-                    retry_count + 1,
-                    MAX_RETRIES,
-                    wait_time,
-                    err,
+                error_msg = ERROR_MSG_CONNECTION.format(ip=self._ip_address, port=self._port)
+                _LOGGER.error(
+                    "Connection error after %d retries: %s", retries[RETRY_CONNECT], err
                 )
-                await asyncio.sleep(wait_time)
-                return await self._make_request(
-                    method, endpoint, retry_count=retry_count + 1, **kwargs
+                raise EltakoConnectionError(error_msg) from err
+
+            except asyncio.TimeoutError as err:
+                self._adaptive_timeouts.record_timeout(endpoint_template)
+                delay = (
+                    None
+                    if probe
+                    else self._next_retry_delay(RETRY_TIMEOUT, retries, deadline)
                 )
+                if delay is not None:
+                    _LOGGER.warning(
+                        "Timeout to %s:%s (attempt %d/%d), retrying in %.1fs",
+                        self._ip_address,
+                        self._port,
+                        retries[RETRY_TIMEOUT],
+                        self._retry_policy.max_retries(RETRY_TIMEOUT),
+                        delay,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
 
-            error_msg = ERROR_MSG_CONNECTION.format(ip=self._ip_address, port=self._port)
-            _LOGGER.error(
-                "Connection error after %d retries: %s", MAX_RETRIES, err
+                error_msg = ERROR_MSG_TIMEOUT
+                _LOGGER.error(
+                    "Request timed out after %d retries", retries[RETRY_TIMEOUT]
+                )
+                raise EltakoTimeoutError(error_msg) from err
+
+            except aiohttp.ClientError as err:
+                error_msg = f"HTTP error connecting to {self._ip_address}:{self._port}: {err}"
+                _LOGGER.error("HTTP error: %s", err)
+                raise EltakoConnectionError(error_msg) from err
+
+    async def _read_json(self, response: aiohttp.ClientResponse) -> Any:
+        """Decode a JSON response body with the client's serializer.
+
+        The Eltako device returns Content-Type: text/html even for JSON
+        responses, so the content type is not checked.
+
+        Args:
+            response: Response to read
+
+        Returns:
+            Decoded JSON data, or None for an empty body
+        """
+        body = await response.read()
+        if not body.strip():
+            return None
+        return self._serializer.loads(body)
+
+    def _endpoint_info(self, endpoint: str) -> tuple[URL, str]:
+        """Get the prebuilt URL and endpoint template of a request path.
+
+        Args:
+            endpoint: API endpoint path
+
+        Returns:
+            Tuple of the absolute URL and the endpoint template
+        """
+        info = self._endpoints.get(endpoint)
+        if info is None:
+            info = self._endpoints[endpoint] = (
+                URL(f"{self.base_url}{endpoint}"),
+                self._endpoint_template(endpoint),
             )
-            raise EltakoConnectionError(error_msg) from err
+        return info
 
-        except asyncio.TimeoutError as err:
-            # Implement exponential backoff retry for timeouts
-            if retry_count < MAX_RETRIES:
-                wait_time = RETRY_BACKOFF_BASE ** retry_count
-                _LOGGER.warning(
-                    "Timeout to %s:%s (attempt %d/%d), retrying in %ds",
-                    self._ip_address,
-                    self._port,
-                    retry_count + 1,
-                    MAX_RETRIES,
-                    wait_time,
-                )
-                await asyncio.sleep(wait_time)
-                return await self._make_request(
-                    method, endpoint, retry_count=retry_count + 1, **kwargs
-                )
+    def _request_headers(
+        self, token: Optional[str], json_body: bool
+    ) -> dict[str, Optional[str]]:
+        """Get the shared request headers for an API key.
 
-            error_msg = ERROR_MSG_TIMEOUT
-            _LOGGER.error("Request timed out after %d retries", MAX_RETRIES)
-            raise EltakoTimeoutError(error_msg) from err
+        The header mappings are rebuilt only when the API key changes and
+        must not be modified by callers.
 
-        except aiohttp.ClientError as err:
-            error_msg = f"HTTP error connecting to {self._ip_address}:{self._port}: {err}"
-            _LOGGER.error("HTTP error: %s", err)
-            raise EltakoConnectionError(error_msg) from err
+        Args:
+            token: API key to authorize the request with
+            json_body: Whether the request has a JSON body
+
+        Returns:
+            Header mapping with Authorization and, for JSON bodies, Content-Type
+        """
+        if token != self._headers_token or not self._headers:
+            self._headers_token = token
+            self._headers = {"Authorization": token}
+            self._json_headers = {
+                "Authorization": token,
+                "Content-Type": "application/json",
+            }
+            self._header_builds += 1
+        return self._json_headers if json_body else self._headers
+
+    def _relay_request(self, device_guid: str, state: str) -> tuple[str, bytes]:
+        """Get the prebuilt path and encoded body of a relay command.
+
+        Args:
+            device_guid: GUID of the device to control
+            state: Relay state ('on' or 'off')
+
+        Returns:
+            Tuple of the relay endpoint path and the encoded JSON body
+        """
+        key = (device_guid, state)
+        request = self._relay_requests.get(key)
+        if request is None:
+            # API requires all three fields: type, identifier, and value
+            payload = {
+                "type": "enumeration",
+                "identifier": "relay",
+                "value": state,
+            }
+            request = self._relay_requests[key] = (
+                ENDPOINT_RELAY.format(device_guid=device_guid),
+                self._serializer.dumps(payload),
+            )
+        return request
+
+    @staticmethod
+    def _endpoint_template(endpoint: str) -> str:
+        """Map a request path to the endpoint template it was built from.
+
+        Args:
+            endpoint: API endpoint path, e.g. a formatted ENDPOINT_RELAY
+
+        Returns:
+            ENDPOINT_RELAY for relay paths, otherwise the path itself
+        """
+        prefix, _, suffix = ENDPOINT_RELAY.partition("{device_guid}")
+        if (
+            endpoint.startswith(prefix)
+            and endpoint.endswith(suffix)
+            and len(endpoint) > len(prefix) + len(suffix)
+        ):
+            return ENDPOINT_RELAY
+        return endpoint
+
+    def _record_timing(
+        self, endpoint_template: str, timing: dict[str, float], start: float
+    ) -> None:
+        """Feed the latencies of a successful request to the adaptive timeouts.
+
+        Args:
+            endpoint_template: Endpoint template the request was sent to
+            timing: Phase latencies collected by the session's request trace
+            start: Monotonic time at which the request was started
+        """
+        timing[PHASE_TOTAL] = time.monotonic() - start
+        self._adaptive_timeouts.record(endpoint_template, timing)
+
+    def _pause_if_throttled(self, response: aiohttp.ClientResponse) -> Optional[float]:
+        """Pause the rate limiter as asked by a 429 or 503 response.
+
+        Args:
+            response: Response from the device
+
+        Returns:
+            Seconds from the response's Retry-After header, or None if the
+            response does not ask to retry later
+        """
+        if response.status not in (429, 503):
+            return None
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            _LOGGER.warning(
+                "Device at %s:%s is overloaded (status %d), pausing requests for %.1fs",
+                self._ip_address,
+                self._port,
+                response.status,
+                retry_after,
+            )
+            self._rate_limiter.pause(retry_after)
+        return retry_after
+
+    def _can_retry(self, kind: str, retries: dict[str, int], deadline: float) -> bool:
+        """Check and count an immediate retry of a call.
+
+        Args:
+            kind: Retry class of the error
+            retries: Retries made so far per class, updated in place
+            deadline: Monotonic time at which the call must give up
+
+        Returns:
+            True if the call may be retried
+        """
+        if retries[kind] >= self._retry_policy.max_retries(kind):
+            return False
+        if time.monotonic() >= deadline:
+            self._retry_stats["deadline_exceeded"] += 1
+            return False
+
+        retries[kind] += 1
+        self._retry_stats[kind] += 1
+        return True
+
+    def _next_retry_delay(
+        self, kind: str, retries: dict[str, int], deadline: float
+    ) -> Optional[float]:
+        """Get the backoff before retrying a call, if it may be retried.
+
+        Args:
+            kind: Retry class of the error
+            retries: Retries made so far per class, updated in place
+            deadline: Monotonic time at which the call must give up
+
+        Returns:
+            Delay in seconds, or None if the call must fail now
+        """
+        if retries[kind] >= self._retry_policy.max_retries(kind):
+            return None
+
+        if self._circuit_breaker.is_open:
+            # Other calls already gave up on the device
+            _LOGGER.debug("Not retrying %s error, circuit breaker is open", kind)
+            return None
+
+        delay = self._retry_policy.backoff(retries[kind])
+        if time.monotonic() + delay >= deadline:
+            _LOGGER.debug("Not retrying %s error, request deadline would be exceeded", kind)
+            self._retry_stats["deadline_exceeded"] += 1
+            return None
+
+        if not self._retry_budget.try_acquire():
+            _LOGGER.debug("Not retrying %s error, retry budget exhausted", kind)
+            return None
+
+        retries[kind] += 1
+        self._retry_stats[kind] += 1
+        return delay
+
+    def _device_cache_age(self) -> Optional[float]:
+        """Get the age of the cached device list.
+
+        Returns:
+            Age in seconds, or None if no device list is cached
+        """
+        if self._devices_cache is None or self._devices_cache_timestamp is None:
+            return None
+        return time.time() - self._devices_cache_timestamp
 
     def _is_device_cache_expired(self) -> bool:
         """Check if the device cache is expired.
@@ -337,22 +1029,24 @@ class EltakoAPI:
         Returns:
             True if cache is expired or not set, False otherwise
         """
-        if self._devices_cache is None or self._devices_cache_timestamp is None:
-            return True
-
-        elapsed = time.time() - self._devices_cache_timestamp
-        return elapsed >= DEVICE_CACHE_TTL
+        age = self._device_cache_age()
+        return age is None or age >= self._device_cache_ttl
 
     async def async_get_devices(
         self, force_refresh: bool = False
-    ) -> list[dict[str, Any]]:
+    ) -> list[EltakoDevice]:
         """Get list of devices from the Eltako API.
 
+        A fresh cached list is returned as is. A cached list older than the
+        TTL but within the max-staleness bound is returned immediately while
+        a single background request refreshes it. Older or missing lists are
+        fetched before returning.
+
         Args:
             force_refresh: Force refresh cache even if not expired
 
         Returns:
-            List of device dictionaries containing GUIDs and metadata
+            List of device records with GUID, name and relay function
 
         Raises:
             EltakoAuthenticationError: If authentication fails
@@ -360,43 +1054,114 @@ class EltakoAPI:
             EltakoAPIError: If API returns an error
             EltakoTimeoutError: If request times out
         """
-        # Return cached devices if available and not expired
-        if not force_refresh and not self._is_device_cache_expired():
-            _LOGGER.debug("Returning cached device list")
-            return self._devices_cache
+        if not force_refresh:
+            age = self._device_cache_age()
+            if age is not None and age < self._device_cache_ttl:
+                _LOGGER.debug("Returning cached device list")
+                self._device_cache_stats["hits"] += 1
+                return self._devices_cache
+            if age is not None and age < self._device_cache_max_stale:
+                _LOGGER.debug("Returning stale device list (%.0fs old)", age)
+                self._device_cache_stats["stale_hits"] += 1
+                self._start_device_refresh()
+                return self._devices_cache
+
+        self._device_cache_stats["misses"] += 1
+        return await self._async_fetch_devices_once()
+
+    def _on_device_fetch_done(self, task: asyncio.Task) -> None:
+        """Clear the finished single-flight device list request.
 
-        _LOGGER.debug("Fetching device list from API")
-        response = await self._make_request("GET", ENDPOINT_DEVICES)
+        Args:
+            task: The finished device list request task
+        """
+        if self._device_fetch_task is task:
+            self._device_fetch_task = None
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
 
-        # The API returns a list directly, not a dict with "devices" key
-        if isinstance(response, list):
-            devices = response
+    async def _async_fetch_devices_once(self) -> list[EltakoDevice]:
+        """Fetch the device list, sharing one request among concurrent callers.
+
+        The first caller starts the request; callers arriving while it runs,
+        including the background refresh, wait for its result or exception
+        instead of issuing their own.
+
+        Returns:
+            List of device records
+
+        Raises:
+            EltakoError: If the shared request fails
+        """
+        if self._device_fetch_task is None:
+            self._device_fetch_task = asyncio.get_running_loop().create_task(
+                self._async_fetch_devices()
+            )
+            self._device_fetch_task.add_done_callback(self._on_device_fetch_done)
         else:
-            # Fallback for potential future API changes
-            devices = response.get("devices", [])
+            self._device_cache_stats["requests_coalesced"] += 1
+            _LOGGER.debug("Waiting for device list request already in progress")
 
-        if not isinstance(devices, list):
-            _LOGGER.error("Invalid devices response format: expected list")
-            raise EltakoAPIError("Invalid devices response format")
+        # Shield so a cancelled caller does not abort the shared request
+        return await asyncio.shield(self._device_fetch_task)
 
-        # Normalize device structure to match expected format
-        # API returns deviceGuid and displayName, we normalize to guid and name
-        normalized_devices = []
-        for device in devices:
-            normalized_device = {
-                "guid": device.get("deviceGuid", ""),
-                "name": device.get("displayName", "Unknown"),
-                # Keep original fields for reference
-                "deviceGuid": device.get("deviceGuid", ""),
-                "productGuid": device.get("productGuid", ""),
-                "displayName": device.get("displayName", ""),
-                "functions": device.get("functions", []),
-                "infos": device.get("infos", []),
-                "settings": device.get("settings", []),
-            }
-            normalized_devices.append(normalized_device)
+    def add_devices_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback for device lists refreshed in the background.
+
+        A stale device list is returned at once and refreshed afterwards, so
+        its caller never sees the refreshed list. The listener is called when
+        the refresh succeeded; the list is then fresh in the cache.
+
+        Args:
+            listener: Callback without arguments
+
+        Returns:
+            Function that removes the listener
+        """
+        self._device_listeners.append(listener)
+        return partial(self._device_listeners.remove, listener)
+
+    def _start_device_refresh(self) -> None:
+        """Start the background device list refresh unless one is running."""
+        if self._device_refresh_task is None or self._device_refresh_task.done():
+            self._device_cache_stats["background_refreshes"] += 1
+            self._device_refresh_task = asyncio.get_running_loop().create_task(
+                self._async_refresh_devices()
+            )
+
+    async def _async_refresh_devices(self) -> None:
+        """Refresh the device list in the background.
+
+        On failure the stale list stays cached; once it exceeds the
+        max-staleness bound the next caller fetches it in the foreground.
+        """
+        try:
+            await self._async_fetch_devices_once()
+        except EltakoError as err:
+            self._device_cache_stats["background_failures"] += 1
+            _LOGGER.debug("Background device list refresh failed: %s", err)
+            return
+
+        for listener in list(self._device_listeners):
+            listener()
+
+    async def _async_fetch_devices(self) -> list[EltakoDevice]:
+        """Fetch the device list from the device and cache it.
+
+        Returns:
+            List of device records
 
-        devices = normalized_devices
+        Raises:
+            EltakoError: If the request fails
+        """
+        _LOGGER.debug("Fetching device list from API")
+        devices = await self._make_request(
+            "GET",
+            ENDPOINT_DEVICES,
+            response_parser=self._async_read_device_list,
+            priority=PRIORITY_METADATA,
+        )
 
         # Cache the devices with timestamp
         self._devices_cache = devices
@@ -405,9 +1170,158 @@ class EltakoAPI:
         _LOGGER.debug("Successfully fetched and cached %d devices", len(devices))
         return devices
 
+    async def _async_read_device_list(
+        self, response: aiohttp.ClientResponse
+    ) -> list[EltakoDevice]:
+        """Decode a device list response into device records.
+
+        Bodies up to DEVICE_LIST_STREAM_THRESHOLD bytes, i.e. most
+        gateways, are decoded as a whole with the client's serializer,
+        which is fastest. Larger bodies are decoded while they stream:
+        devices are parsed as soon as their JSON object has arrived, so
+        the raw objects, including the unused ``infos`` and ``settings``
+        arrays, are dropped one at a time instead of building the whole
+        document first.
+
+        Args:
+            response: Successful response of the devices endpoint
+
+        Returns:
+            List of device records
+
+        Raises:
+            EltakoAPIError: If the response is not a valid device list
+        """
+        chunks: list[bytes] = []
+        size = 0
+        decoder: Optional[JSONArrayStreamDecoder] = None
+        devices: list[EltakoDevice] = []
+        try:
+            async for chunk in response.content.iter_chunked(DEVICE_LIST_CHUNK_SIZE):
+                if decoder is None:
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size <= DEVICE_LIST_STREAM_THRESHOLD:
+                        continue
+                    # Large gateway: decode what has arrived and stream the rest
+                    decoder = JSONArrayStreamDecoder()
+                    pending, chunks = chunks, []
+                else:
+                    pending = [chunk]
+                for data in pending:
+                    devices.extend(
+                        EltakoDevice.from_json(device)
+                        for device in decoder.feed(data)
+                        if isinstance(device, dict)
+                    )
+            if decoder is None:
+                document = self._serializer.loads(b"".join(chunks))
+            else:
+                document = decoder.close()
+        except ValueError as err:
+            _LOGGER.error("Invalid devices response: %s", err)
+            raise EltakoAPIError("Invalid devices response format") from err
+
+        # The API returns a list directly, not a dict with "devices" key
+        if decoder is not None and decoder.is_array:
+            return devices
+        if isinstance(document, list):
+            raw_devices = document
+        else:
+            # Fallback for potential future API changes
+            raw_devices = (
+                document.get("devices", []) if isinstance(document, dict) else None
+            )
+        if not isinstance(raw_devices, list):
+            _LOGGER.error("Invalid devices response format: expected list")
+            raise EltakoAPIError("Invalid devices response format")
+
+        return [
+            EltakoDevice.from_json(device)
+            for device in raw_devices
+            if isinstance(device, dict)
+        ]
+
+    async def async_get_relay_state(self, device_guid: str) -> Optional[str]:
+        """Read the current state of a relay from the device.
+
+        Args:
+            device_guid: GUID of the device to read
+
+        Returns:
+            Relay state ('on' or 'off'), or None if the device reported
+            no valid relay value
+
+        Raises:
+            EltakoInvalidDeviceError: If device GUID is invalid
+            EltakoAuthenticationError: If authentication fails
+            EltakoConnectionError: If connection fails
+            EltakoAPIError: If API returns an error
+            EltakoTimeoutError: If request times out
+        """
+        if not device_guid or not isinstance(device_guid, str):
+            raise EltakoInvalidDeviceError("Device GUID must be a non-empty string")
+
+        endpoint = ENDPOINT_RELAY.format(device_guid=device_guid)
+        response = await self._make_request("GET", endpoint, priority=PRIORITY_RECONCILE)
+
+        value = response.get("value") if isinstance(response, dict) else None
+        if value not in (RELAY_STATE_ON, RELAY_STATE_OFF):
+            _LOGGER.debug("Unexpected relay value for %s: %s", device_guid, value)
+            return None
+        return value
+
+    async def async_get_relay_states(
+        self, device_guids: list[str]
+    ) -> dict[str, str]:
+        """Read the current state of several relays concurrently.
+
+        At most ``max_concurrent_state_reads`` reads are in flight at once.
+        A relay whose read fails is left out of the result; only if every
+        read fails is the first error raised.
+
+        Args:
+            device_guids: GUIDs of the devices to read
+
+        Returns:
+            Dictionary mapping device GUIDs to their relay state
+
+        Raises:
+            EltakoError: The first read's error if all reads failed
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrent_state_reads)
+
+        async def read_state(device_guid: str) -> Optional[str]:
+            async with semaphore:
+                return await self.async_get_relay_state(device_guid)
+
+        results = await asyncio.gather(
+            *(read_state(device_guid) for device_guid in device_guids),
+            return_exceptions=True,
+        )
+
+        states: dict[str, str] = {}
+        errors: list[EltakoError] = []
+        for device_guid, result in zip(device_guids, results):
+            if isinstance(result, EltakoError):
+                _LOGGER.debug("Failed to read relay state of %s: %s", device_guid, result)
+                errors.append(result)
+            elif isinstance(result, BaseException):
+                raise result
+            elif result is not None:
+                states[device_guid] = result
+
+        if errors and len(errors) == len(device_guids):
+            raise errors[0]
+        return states
+
     async def async_set_relay(self, device_guid: str, state: str) -> None:
         """Set relay state for a device.
 
+        Commands for a relay that arrive while an earlier command for it is
+        still in flight are coalesced: only the newest state is sent, and all
+        superseded callers complete together with that request.
+
         Args:
             device_guid: GUID of the device to control
             state: Relay state ('on' or 'off')
@@ -419,32 +1333,303 @@ class EltakoAPI:
             EltakoAPIError: If API returns an error
             EltakoTimeoutError: If request times out
         """
-        # Validate device GUID
+        self._validate_relay_command(device_guid, state)
+
+        # Queue relay commands per relay: commands for different relays run
+        # concurrently, rapid commands for the same relay collapse to the
+        # newest state while a request for it is in flight
+        await self._relay_scheduler.async_submit(
+            device_guid, state, partial(self._send_relay_command, device_guid)
+        )
+
+    @staticmethod
+    def _validate_relay_command(device_guid: str, state: str) -> None:
+        """Validate the target and state of a relay command.
+
+        Args:
+            device_guid: GUID of the device to control
+            state: Relay state ('on' or 'off')
+
+        Raises:
+            EltakoInvalidDeviceError: If device GUID is invalid
+            EltakoAPIError: If the state is invalid
+        """
         if not device_guid or not isinstance(device_guid, str):
             raise EltakoInvalidDeviceError("Device GUID must be a non-empty string")
 
-        # Validate state
         if state not in (RELAY_STATE_ON, RELAY_STATE_OFF):
             raise EltakoAPIError(
                 f"Invalid relay state: {state}. Must be '{RELAY_STATE_ON}' or '{RELAY_STATE_OFF}'"
             )
 
-        # Queue relay commands to prevent race conditions
-        async with self._relay_lock:
-            endpoint = ENDPOINT_RELAY.format(device_guid=device_guid)
-            # API requires all three fields: type, identifier, and value
-            payload = {
-                "type": "enumeration",
-                "identifier": "relay",
-                "value": state,
-            }
+    async def async_set_relays(self, states: dict[str, str]) -> BulkRelayResult:
+        """Set the state of several relays at once.
+
+        The token is checked once for the whole batch, then the commands are
+        sent through the relay command queue, so at most
+        ``max_concurrent_relay_commands`` are in flight and commands for the
+        same relay stay ordered. A relay that is invalid or fails does not
+        stop the others; its error is reported in the result.
+
+        Args:
+            states: Dictionary mapping device GUIDs to relay states
+
+        Returns:
+            Outcome, latency and error of every relay command
+
+        Raises:
+            EltakoAuthenticationError: If authentication fails
+            EltakoConnectionError: If connection fails
+            EltakoTimeoutError: If the login request times out
+        """
+        self._bulk_relay_stats["operations"] += 1
+        self._bulk_relay_stats["commands"] += len(states)
+
+        results: dict[str, RelayCommandResult] = {}
+        valid: dict[str, str] = {}
+        for device_guid, state in states.items():
+            try:
+                self._validate_relay_command(device_guid, state)
+            except EltakoError as err:
+                results[device_guid] = RelayCommandResult(device_guid, state, 0.0, err)
+            else:
+                valid[device_guid] = state
+
+        if valid:
+            await self._ensure_valid_token()
+
+        async def set_relay(device_guid: str, state: str) -> RelayCommandResult:
+            start = time.monotonic()
+            try:
+                await self._relay_scheduler.async_submit(
+                    device_guid, state, partial(self._send_relay_command, device_guid)
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                # A failing relay never aborts the others; unexpected errors
+                # are reported like API errors
+                error = err
+                if not isinstance(err, EltakoError):
+                    error = EltakoAPIError(f"Unexpected error: {err}")
+                    error.__cause__ = err
+                _LOGGER.debug(
+                    "Failed to set relay %s to %s: %s", device_guid, state, error
+                )
+                return RelayCommandResult(
+                    device_guid, state, time.monotonic() - start, error
+                )
+            return RelayCommandResult(device_guid, state, time.monotonic() - start)
+
+        for result in await asyncio.gather(
+            *(set_relay(device_guid, state) for device_guid, state in valid.items())
+        ):
+            results[result.guid] = result
+
+        bulk_result = BulkRelayResult(
+            {device_guid: results[device_guid] for device_guid in states}
+        )
+        self._bulk_relay_stats["failures"] += len(bulk_result.failed)
+        return bulk_result
+
+    async def _send_relay_command(self, device_guid: str, state: str) -> None:
+        """Send a relay command to the device.
+
+        Args:
+            device_guid: GUID of the device to control
+            state: Relay state ('on' or 'off')
+        """
+        # Path and body are built once per relay and state, so a hedged
+        # duplicate and later commands send the same bytes
+        endpoint, body = self._relay_request(device_guid, state)
+
+        _LOGGER.debug("Setting relay %s to %s", device_guid, state)
+        if self._hedge_relay_commands:
+            await self._make_hedged_request("PUT", endpoint, data=body)
+        else:
+            await self._make_timed_relay_request("PUT", endpoint, data=body)
+        _LOGGER.debug("Successfully set relay %s to %s", device_guid, state)
+
+    async def _make_timed_relay_request(
+        self, method: str, endpoint: str, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Make a relay request and record its latency on success.
+
+        The latency is measured from dispatch, so time spent waiting in the
+        scheduler, rate limiter and concurrency queues is not counted.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            **kwargs: Additional arguments to pass to _make_request
+
+        Returns:
+            JSON response data
+        """
+        timing: dict[str, float] = {}
+        result = await self._make_request(
+            method, endpoint, request_timing=timing, **kwargs
+        )
+        self._relay_latency.record(timing[PHASE_TOTAL])
+        return result
+
+    def _hedge_delay(self) -> float:
+        """Get the time to wait for a relay command before hedging it.
+
+        Returns:
+            HEDGE_PERCENTILE of recent relay latencies, bounded by
+            HEDGE_MIN_DELAY and HEDGE_MAX_DELAY
+        """
+        if len(self._relay_latency) < HEDGE_MIN_SAMPLES:
+            return HEDGE_MAX_DELAY
+        latency = self._relay_latency.percentile(HEDGE_PERCENTILE)
+        return min(HEDGE_MAX_DELAY, max(HEDGE_MIN_DELAY, latency))
+
+    async def _make_hedged_request(
+        self, method: str, endpoint: str, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Make an idempotent request, hedging it if the response is slow.
 
-            _LOGGER.debug("Setting relay %s to %s", device_guid, state)
-            await self._make_request("PUT", endpoint, json=payload)
-            _LOGGER.debug("Successfully set relay %s to %s", device_guid, state)
+        If no response arrives within the hedge delay after the request was
+        dispatched, an identical request is sent; waiting in the local
+        queues does not count towards the delay. While the first request
+        still occupies its connection, the second one is sent over another
+        pooled or new connection. The first successful response wins and the
+        other request is cancelled.
+
+        Args:
+            method: HTTP method (the request must be idempotent)
+            endpoint: API endpoint path
+            **kwargs: Additional arguments to pass to _make_request
+
+        Returns:
+            JSON response data of the winning request
+
+        Raises:
+            EltakoError: The first request's error if both requests fail
+        """
+        self._hedge_stats["commands"] += 1
+        delay = self._hedge_delay()
+
+        dispatched = asyncio.Event()
+        primary = asyncio.create_task(
+            self._make_timed_relay_request(
+                method, endpoint, dispatched=dispatched, **kwargs
+            )
+        )
+        pending: set[asyncio.Task] = {primary}
+        try:
+            # Queueing is not the device being slow: start the hedge delay
+            # once the request is sent
+            dispatch = asyncio.create_task(dispatched.wait())
+            try:
+                await asyncio.wait(
+                    {primary, dispatch}, return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                dispatch.cancel()
+            if not primary.done():
+                await asyncio.wait(pending, timeout=delay)
+            if primary.done():
+                pending.discard(primary)
+                return primary.result()
+
+            _LOGGER.debug(
+                "No response to %s %s after %.3fs, sending hedge request",
+                method,
+                endpoint,
+                delay,
+            )
+            self._hedge_stats["hedged"] += 1
+            hedge = asyncio.create_task(
+                self._make_timed_relay_request(method, endpoint, **kwargs)
+            )
+            pending.add(hedge)
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._hedge_stats["hedge_wins"] += 1
+                        return task.result()
+
+            # Both requests failed
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return runtime statistics of the API client.
+
+        Returns:
+            Dictionary of statistics, e.g. for diagnostics
+        """
+        return {
+            "auth": {
+                "logins": self._logins,
+                "logins_avoided": self._logins_avoided,
+            },
+            "retries": {
+                **self._retry_stats,
+                "budget": self._retry_budget.as_dict(),
+            },
+            "circuit_breaker": self._circuit_breaker.as_dict(),
+            "rate_limiter": self._rate_limiter.as_dict(),
+            "concurrency": self._concurrency_limiter.as_dict(),
+            "relay_latency": self._relay_latency.as_dict(),
+            "timeouts": self._adaptive_timeouts.as_dict(),
+            "hedging": {
+                **self._hedge_stats,
+                "enabled": self._hedge_relay_commands,
+                "hedge_rate": (
+                    self._hedge_stats["hedged"] / self._hedge_stats["commands"]
+                    if self._hedge_stats["commands"]
+                    else 0.0
+                ),
+                "delay": self._hedge_delay(),
+            },
+            "relay_scheduler": self._relay_scheduler.get_stats(),
+            "bulk_relay": dict(self._bulk_relay_stats),
+            "request_priority": self._request_priority.get_stats(),
+            "serializer": self._serializer.name,
+            "device_cache": {
+                **self._device_cache_stats,
+                "ttl": self._device_cache_ttl,
+                "max_stale": self._device_cache_max_stale,
+                "age": self._device_cache_age(),
+            },
+            "request_templates": {
+                "endpoints": len(self._endpoints),
+                "relay_requests": len(self._relay_requests),
+                "header_builds": self._header_builds,
+            },
+        }
 
     async def async_close(self) -> None:
         """Close the API client and cleanup resources."""
+        if self._token_refresh_handle is not None:
+            self._token_refresh_handle.cancel()
+            self._token_refresh_handle = None
+        if self._token_refresh_task is not None and not self._token_refresh_task.done():
+            self._token_refresh_task.cancel()
+            await asyncio.gather(self._token_refresh_task, return_exceptions=True)
+        self._token_refresh_task = None
+        if self._device_refresh_task is not None and not self._device_refresh_task.done():
+            self._device_refresh_task.cancel()
+            await asyncio.gather(self._device_refresh_task, return_exceptions=True)
+        self._device_refresh_task = None
+        if self._device_fetch_task is not None:
+            self._device_fetch_task.cancel()
+            await asyncio.gather(self._device_fetch_task, return_exceptions=True)
+        if self._login_task is not None:
+            self._login_task.cancel()
+            await asyncio.gather(self._login_task, return_exceptions=True)
+
+        await self._relay_scheduler.async_shutdown()
         if self._session and self._owns_session:
             await self._session.close()
             self._session = None
@@ -0,0 +1,159 @@
+"""Circuit breaker for Eltako ESR62PF-IP API requests."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from .const import (
+    CIRCUIT_STATE_CLOSED,
+    CIRCUIT_STATE_HALF_OPEN,
+    CIRCUIT_STATE_OPEN,
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+    DEFAULT_CIRCUIT_RECOVERY_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Closed, open and half-open circuit breaker for one device host.
+
+    The breaker opens after ``failure_threshold`` requests in a row failed to
+    reach the device. While open, requests are rejected without any network
+    I/O. Once ``recovery_timeout`` has passed, the breaker turns half-open
+    and lets a single probe request through: its success closes the breaker,
+    its failure opens it again for another recovery timeout.
+    """
+
+    __slots__ = (
+        "_failure_threshold",
+        "_recovery_timeout",
+        "_state",
+        "_failures",
+        "_opened_at",
+        "_probe_in_flight",
+        "_times_opened",
+        "_rejected",
+    )
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_CIRCUIT_RECOVERY_TIMEOUT,
+    ) -> None:
+        """Initialize a closed circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failed requests before opening
+            recovery_timeout: Seconds to stay open before sending a probe
+
+        Raises:
+            ValueError: If failure_threshold is smaller than 1 or
+                recovery_timeout is negative
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        if recovery_timeout < 0:
+            raise ValueError("recovery_timeout must not be negative")
+
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._state = CIRCUIT_STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._times_opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Return the breaker state (closed, open or half_open)."""
+        if self._state == CIRCUIT_STATE_OPEN and self.retry_in == 0:
+            return CIRCUIT_STATE_HALF_OPEN
+        return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until an open breaker lets a probe through."""
+        if self._state != CIRCUIT_STATE_OPEN:
+            return 0.0
+        elapsed = time.monotonic() - self._opened_at
+        return max(0.0, self._recovery_timeout - elapsed)
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if requests are currently rejected."""
+        return self._state == CIRCUIT_STATE_OPEN and self.retry_in > 0
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent.
+
+        While half-open, only the first caller is allowed through as the
+        probe; ``state`` stays half_open until its outcome is recorded.
+
+        Returns:
+            True if the request may be sent, False if it must be rejected
+        """
+        if self._state == CIRCUIT_STATE_CLOSED:
+            return True
+
+        if self._state == CIRCUIT_STATE_OPEN and self.retry_in == 0:
+            _LOGGER.debug("Circuit breaker half-open, sending probe request")
+            self._state = CIRCUIT_STATE_HALF_OPEN
+
+        if self._state == CIRCUIT_STATE_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        self._rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a request that reached the device."""
+        if self._state != CIRCUIT_STATE_CLOSED:
+            _LOGGER.info("Circuit breaker closed, device is reachable again")
+        self._state = CIRCUIT_STATE_CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a request that failed to reach the device."""
+        self._failures += 1
+
+        if self._state == CIRCUIT_STATE_HALF_OPEN:
+            self._probe_in_flight = False
+            self._open()
+        elif (
+            self._state == CIRCUIT_STATE_CLOSED
+            and self._failures >= self._failure_threshold
+        ):
+            self._open()
+
+    def release_probe(self) -> None:
+        """Give up the probe slot without an outcome, e.g. when cancelled."""
+        self._probe_in_flight = False
+
+    def _open(self) -> None:
+        """Open the breaker for the recovery timeout."""
+        self._state = CIRCUIT_STATE_OPEN
+        self._opened_at = time.monotonic()
+        self._times_opened += 1
+        _LOGGER.warning(
+            "Circuit breaker opened after %d failed requests, "
+            "pausing requests for %ss",
+            self._failures,
+            self._recovery_timeout,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state as a dictionary."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "failure_threshold": self._failure_threshold,
+            "recovery_timeout": self._recovery_timeout,
+            "retry_in": round(self.retry_in, 1),
+            "times_opened": self._times_opened,
+            "rejected": self._rejected,
+        }
@@ -0,0 +1,278 @@
+"""Adaptive concurrency limiting for Eltako ESR62PF-IP API requests."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+from .const import (
+    CONCURRENCY_BASELINE_PERCENTILE,
+    CONCURRENCY_DECREASE_FACTOR,
+    CONCURRENCY_INITIAL_LIMIT,
+    CONCURRENCY_LATENCY_TOLERANCE,
+    CONCURRENCY_MAX_LIMIT,
+    CONCURRENCY_MIN_LIMIT,
+    CONCURRENCY_MIN_SAMPLES,
+    CONCURRENCY_SPIKE_MIN_EXCESS,
+)
+from .latency import LatencyTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+# Errors showing that the device could not keep up
+OVERLOAD_ERRORS = (
+    asyncio.TimeoutError,
+    aiohttp.ClientConnectorError,
+    aiohttp.ServerDisconnectedError,
+)
+
+
+class ConcurrencySlot:
+    """Permission to have one request in flight."""
+
+    __slots__ = ("key", "epoch", "start", "overloaded")
+
+    def __init__(self, key: str, epoch: int) -> None:
+        """Initialize the slot.
+
+        Args:
+            key: Latency baseline the request is compared against
+            epoch: Number of limit decreases when the request started
+        """
+        self.key = key
+        self.epoch = epoch
+        self.start = time.monotonic()
+        self.overloaded = False
+
+    def mark_overloaded(self) -> None:
+        """Report that the device rejected the request as overloaded."""
+        self.overloaded = True
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on the requests in flight to one device.
+
+    The limit grows by one after a window of ``limit`` requests completed
+    without a latency spike while the limit was fully used, and is
+    multiplied by ``decrease_factor`` when a request times out, cannot
+    connect, is rejected as overloaded, or takes more than
+    ``latency_tolerance`` times the usual latency of its request type,
+    e.g. reading or setting a relay (and at least
+    CONCURRENCY_SPIKE_MIN_EXCESS seconds longer, so jitter on fast
+    responses is ignored). Only requests started after the last decrease
+    can decrease the limit again, so one overload episode halves it once.
+    Requests beyond the limit wait in arrival order.
+
+    By default the limit starts at its maximum, the number of relay
+    commands the client sends at once (itself bounded by the connections
+    per host), so a bulk command is not throttled before the device has
+    shown any sign of overload. The controller then only backs off and
+    recovers: additive increase applies after a decrease, or when a lower
+    ``initial_limit`` is passed.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = CONCURRENCY_INITIAL_LIMIT,
+        min_limit: int = CONCURRENCY_MIN_LIMIT,
+        max_limit: int = CONCURRENCY_MAX_LIMIT,
+        decrease_factor: float = CONCURRENCY_DECREASE_FACTOR,
+        latency_tolerance: float = CONCURRENCY_LATENCY_TOLERANCE,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            initial_limit: Requests allowed in flight before any feedback
+            min_limit: Lowest limit the controller may reach
+            max_limit: Highest limit the controller may reach
+            decrease_factor: Factor applied to the limit on overload
+            latency_tolerance: Multiple of the baseline latency above which
+                a request counts as a latency spike
+
+        Raises:
+            ValueError: If the limits are not 1 <= min <= initial <= max, or
+                decrease_factor is not between 0 and 1
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min <= initial <= max")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self._limit = initial_limit
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._decrease_factor = decrease_factor
+        self._latency_tolerance = latency_tolerance
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        # Latency baselines per request type
+        self._latencies: dict[str, LatencyTracker] = {}
+        # Successes in the current window and whether the limit was reached
+        self._successes = 0
+        self._saturated = False
+        self._epoch = 0
+        self._stats = {
+            "increases": 0,
+            "decreases": 0,
+            "overloads": 0,
+            "latency_spikes": 0,
+            "waits": 0,
+        }
+
+    @property
+    def limit(self) -> int:
+        """Return the current number of requests allowed in flight."""
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests currently in flight."""
+        return self._in_flight
+
+    async def _async_acquire(self) -> None:
+        """Wait until another request may be in flight."""
+        if self._in_flight < self._limit and not self._waiters:
+            self._in_flight += 1
+            self._saturated |= self._in_flight >= self._limit
+            return
+
+        self._saturated = True
+        self._stats["waits"] += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just before the cancellation
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def _release(self) -> None:
+        """Free a request's slot and hand free slots to waiters."""
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """Grant slots to waiting requests while the limit allows."""
+        while self._waiters and self._in_flight < self._limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    @asynccontextmanager
+    async def async_slot(self, key: str) -> AsyncIterator[ConcurrencySlot]:
+        """Hold a slot while one request is in flight.
+
+        Timeouts and connection errors raised in the block, and slots
+        marked overloaded, decrease the limit; other completed requests
+        feed the latency baseline of ``key`` and may increase it.
+
+        Args:
+            key: Request type, e.g. method and endpoint, for its latency
+                baseline
+
+        Yields:
+            Slot of the request
+        """
+        await self._async_acquire()
+        slot = ConcurrencySlot(key, self._epoch)
+        try:
+            yield slot
+        except OVERLOAD_ERRORS:
+            self._on_overload(slot)
+            raise
+        except Exception:  # pylint: disable=broad-except
+            # Any other response or error still tells how long it took
+            self._on_complete(slot)
+            raise
+        else:
+            if slot.overloaded:
+                self._on_overload(slot)
+            else:
+                self._on_complete(slot)
+        finally:
+            self._release()
+
+    def _on_overload(self, slot: ConcurrencySlot) -> None:
+        """Decrease the limit after an overload signal.
+
+        Args:
+            slot: Slot of the overloaded request
+        """
+        self._stats["overloads"] += 1
+        if slot.epoch != self._epoch:
+            # The limit was already cut after this request started
+            return
+
+        new_limit = max(self._min_limit, int(self._limit * self._decrease_factor))
+        self._epoch += 1
+        self._successes = 0
+        self._saturated = False
+        if new_limit < self._limit:
+            _LOGGER.debug(
+                "Device overloaded, lowering concurrency limit from %d to %d",
+                self._limit,
+                new_limit,
+            )
+            self._limit = new_limit
+            self._stats["decreases"] += 1
+
+    def _on_complete(self, slot: ConcurrencySlot) -> None:
+        """Record a completed request and grow the limit if warranted.
+
+        Args:
+            slot: Slot of the completed request
+        """
+        latency = time.monotonic() - slot.start
+        tracker = self._latencies.get(slot.key)
+        if tracker is None:
+            tracker = self._latencies[slot.key] = LatencyTracker()
+
+        baseline = (
+            tracker.percentile(CONCURRENCY_BASELINE_PERCENTILE)
+            if len(tracker) >= CONCURRENCY_MIN_SAMPLES
+            else None
+        )
+        tracker.record(latency)
+
+        if baseline is not None and latency > max(
+            baseline * self._latency_tolerance,
+            baseline + CONCURRENCY_SPIKE_MIN_EXCESS,
+        ):
+            self._stats["latency_spikes"] += 1
+            self._on_overload(slot)
+            return
+
+        self._successes += 1
+        if (
+            self._successes >= self._limit
+            and self._saturated
+            and self._limit < self._max_limit
+        ):
+            self._limit += 1
+            self._successes = 0
+            self._saturated = False
+            self._stats["increases"] += 1
+            _LOGGER.debug("Raising concurrency limit to %d", self._limit)
+            self._wake_waiters()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the limiter state as a dictionary."""
+        return {
+            "limit": self._limit,
+            "min_limit": self._min_limit,
+            "max_limit": self._max_limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            **self._stats,
+        }
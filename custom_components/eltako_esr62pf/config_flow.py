@@ -15,11 +15,28 @@ import homeassistant.helpers.config_validation as cv
 
 from .api import EltakoAPI
 from .const import (
+    CONF_CERT_FINGERPRINT,
+    CONF_CIRCUIT_FAILURE_THRESHOLD,
+    CONF_CIRCUIT_RECOVERY_TIMEOUT,
+    CONF_DEVICE_CACHE_MAX_STALE,
+    CONF_DEVICE_CACHE_TTL,
+    CONF_HEDGE_RELAY_COMMANDS,
     CONF_POLL_INTERVAL,
     CONF_POP_CREDENTIAL,
+    CONF_PROACTIVE_TOKEN_REFRESH,
+    CONF_RATE_LIMIT,
+    CONF_RATE_LIMIT_BURST,
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+    DEFAULT_CIRCUIT_RECOVERY_TIMEOUT,
     DEFAULT_POLL_INTERVAL,
     DEFAULT_PORT,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT_BURST,
+    DEVICE_CACHE_MAX_STALE,
+    DEVICE_CACHE_TTL,
     DOMAIN,
+    MIN_CIRCUIT_RECOVERY_TIMEOUT,
+    MIN_DEVICE_CACHE_TTL,
     MIN_POLL_INTERVAL,
 )
 from .exceptions import (
@@ -27,6 +44,7 @@ from .exceptions import (
     EltakoConnectionError,
     EltakoTimeoutError,
 )
+from .session import parse_certificate_fingerprint
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -203,6 +221,22 @@ class EltakoOptionsFlowHandler(config_entries.OptionsFlow):
                 if poll_interval < MIN_POLL_INTERVAL:
                     errors["poll_interval"] = "invalid_poll_interval"
 
+            # Validate pinned certificate fingerprint
+            cert_fingerprint = (user_input.get(CONF_CERT_FINGERPRINT) or "").strip()
+            if cert_fingerprint:
+                try:
+                    parse_certificate_fingerprint(cert_fingerprint)
+                except ValueError:
+                    errors[CONF_CERT_FINGERPRINT] = "invalid_fingerprint"
+
+            # Validate device list cache: a stale list must outlive the TTL
+            device_cache_ttl = user_input.get(CONF_DEVICE_CACHE_TTL, DEVICE_CACHE_TTL)
+            device_cache_max_stale = user_input.get(
+                CONF_DEVICE_CACHE_MAX_STALE, DEVICE_CACHE_MAX_STALE
+            )
+            if device_cache_max_stale < device_cache_ttl:
+                errors[CONF_DEVICE_CACHE_MAX_STALE] = "invalid_device_cache_max_stale"
+
             # If no errors, save options
             if not errors:
                 # Prepare options data
@@ -213,6 +247,40 @@ class EltakoOptionsFlowHandler(config_entries.OptionsFlow):
                     options[CONF_POLL_INTERVAL] = poll_interval
                 # If polling disabled, don't include poll_interval (None will disable it)
 
+                # Save circuit breaker thresholds
+                options[CONF_CIRCUIT_FAILURE_THRESHOLD] = user_input.get(
+                    CONF_CIRCUIT_FAILURE_THRESHOLD, DEFAULT_CIRCUIT_FAILURE_THRESHOLD
+                )
+                options[CONF_CIRCUIT_RECOVERY_TIMEOUT] = user_input.get(
+                    CONF_CIRCUIT_RECOVERY_TIMEOUT, DEFAULT_CIRCUIT_RECOVERY_TIMEOUT
+                )
+
+                # Save relay command hedging
+                options[CONF_HEDGE_RELAY_COMMANDS] = user_input.get(
+                    CONF_HEDGE_RELAY_COMMANDS, False
+                )
+
+                # Save background token refresh
+                options[CONF_PROACTIVE_TOKEN_REFRESH] = user_input.get(
+                    CONF_PROACTIVE_TOKEN_REFRESH, False
+                )
+
+                # Save rate limit
+                options[CONF_RATE_LIMIT] = user_input.get(
+                    CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT
+                )
+                options[CONF_RATE_LIMIT_BURST] = user_input.get(
+                    CONF_RATE_LIMIT_BURST, DEFAULT_RATE_LIMIT_BURST
+                )
+
+                # Save device list cache lifetimes
+                options[CONF_DEVICE_CACHE_TTL] = device_cache_ttl
+                options[CONF_DEVICE_CACHE_MAX_STALE] = device_cache_max_stale
+
+                # Save certificate pinning only if a fingerprint was entered
+                if cert_fingerprint:
+                    options[CONF_CERT_FINGERPRINT] = cert_fingerprint
+
                 # Update config entry data if PoP credential changed
                 if new_pop and new_pop != old_pop:
                     new_data = dict(self.config_entry.data)
@@ -229,6 +297,29 @@ class EltakoOptionsFlowHandler(config_entries.OptionsFlow):
             CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL
         )
         enable_polling = self.config_entry.options.get(CONF_POLL_INTERVAL) is not None
+        current_fingerprint = self.config_entry.options.get(CONF_CERT_FINGERPRINT, "")
+        current_failure_threshold = self.config_entry.options.get(
+            CONF_CIRCUIT_FAILURE_THRESHOLD, DEFAULT_CIRCUIT_FAILURE_THRESHOLD
+        )
+        current_recovery_timeout = self.config_entry.options.get(
+            CONF_CIRCUIT_RECOVERY_TIMEOUT, DEFAULT_CIRCUIT_RECOVERY_TIMEOUT
+        )
+        current_hedge = self.config_entry.options.get(CONF_HEDGE_RELAY_COMMANDS, False)
+        current_token_refresh = self.config_entry.options.get(
+            CONF_PROACTIVE_TOKEN_REFRESH, False
+        )
+        current_rate_limit = self.config_entry.options.get(
+            CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT
+        )
+        current_rate_limit_burst = self.config_entry.options.get(
+            CONF_RATE_LIMIT_BURST, DEFAULT_RATE_LIMIT_BURST
+        )
+        current_device_cache_ttl = self.config_entry.options.get(
+            CONF_DEVICE_CACHE_TTL, DEVICE_CACHE_TTL
+        )
+        current_device_cache_max_stale = self.config_entry.options.get(
+            CONF_DEVICE_CACHE_MAX_STALE, DEVICE_CACHE_MAX_STALE
+        )
 
         # Build options schema
         options_schema = vol.Schema(
@@ -238,6 +329,33 @@ class EltakoOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional(
                     CONF_POLL_INTERVAL, default=current_poll_interval
                 ): vol.All(cv.positive_int, vol.Range(min=MIN_POLL_INTERVAL)),
+                vol.Optional(
+                    CONF_CERT_FINGERPRINT, default=current_fingerprint
+                ): str,
+                vol.Optional(
+                    CONF_CIRCUIT_FAILURE_THRESHOLD, default=current_failure_threshold
+                ): vol.All(cv.positive_int, vol.Range(min=1)),
+                vol.Optional(
+                    CONF_CIRCUIT_RECOVERY_TIMEOUT, default=current_recovery_timeout
+                ): vol.All(
+                    cv.positive_int, vol.Range(min=MIN_CIRCUIT_RECOVERY_TIMEOUT)
+                ),
+                vol.Optional(CONF_HEDGE_RELAY_COMMANDS, default=current_hedge): bool,
+                vol.Optional(
+                    CONF_PROACTIVE_TOKEN_REFRESH, default=current_token_refresh
+                ): bool,
+                vol.Optional(
+                    CONF_RATE_LIMIT, default=current_rate_limit
+                ): vol.All(cv.positive_int, vol.Range(min=1)),
+                vol.Optional(
+                    CONF_RATE_LIMIT_BURST, default=current_rate_limit_burst
+                ): vol.All(cv.positive_int, vol.Range(min=1)),
+                vol.Optional(
+                    CONF_DEVICE_CACHE_TTL, default=current_device_cache_ttl
+                ): vol.All(cv.positive_int, vol.Range(min=MIN_DEVICE_CACHE_TTL)),
+                vol.Optional(
+                    CONF_DEVICE_CACHE_MAX_STALE, default=current_device_cache_max_stale
+                ): vol.All(cv.positive_int, vol.Range(min=MIN_DEVICE_CACHE_TTL)),
             }
         )
 
@@ -7,17 +7,93 @@ DOMAIN = "eltako_esr62pf"
 CONF_IP_ADDRESS = "ip_address"
 CONF_PORT = "port"
 CONF_POP_CREDENTIAL = "pop_credential"
+CONF_CERT_FINGERPRINT = "cert_fingerprint"
+CONF_CIRCUIT_FAILURE_THRESHOLD = "circuit_failure_threshold"
+CONF_CIRCUIT_RECOVERY_TIMEOUT = "circuit_recovery_timeout"
+CONF_HEDGE_RELAY_COMMANDS = "hedge_relay_commands"
+CONF_PROACTIVE_TOKEN_REFRESH = "proactive_token_refresh"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_RATE_LIMIT_BURST = "rate_limit_burst"
+CONF_DEVICE_CACHE_TTL = "device_cache_ttl"
+CONF_DEVICE_CACHE_MAX_STALE = "device_cache_max_stale"
 
 # API Configuration
 API_TOKEN_TTL = 900  # 15 minutes in seconds
+DEFAULT_TOKEN_REFRESH_FRACTION = 0.8  # Renew API key in background at 80% of TTL
+TOKEN_REFRESH_JITTER = 0.1  # Refresh up to 10% earlier to spread logins
 DEVICE_CACHE_TTL = 60  # Device list cache TTL in seconds
+DEVICE_CACHE_MAX_STALE = 600  # Oldest device list served while it refreshes
+MIN_DEVICE_CACHE_TTL = 10  # Minimum device list cache TTL in seconds
+DEVICE_LIST_CHUNK_SIZE = 16384  # Bytes decoded per chunk of the device list
+DEVICE_LIST_STREAM_THRESHOLD = 65536  # Bytes above which the device list is stream-decoded
 DEFAULT_PORT = 443
 DEFAULT_TIMEOUT = 10  # seconds
 DEFAULT_USERNAME = "admin"  # Fixed username for Eltako devices
 
 # Retry Configuration
-MAX_RETRIES = 3
+MAX_RETRIES = 3  # Retries after connection errors
+TIMEOUT_RETRIES = 1  # Retries after timeouts (each may take DEFAULT_TIMEOUT)
+AUTH_RETRIES = 1  # Retries with a fresh token after a 401 response
+THROTTLED_RETRIES = 2  # Retries after a 429/503 response with Retry-After
+REQUEST_DEADLINE = 15  # Total seconds for all attempts of one request
+RETRY_BACKOFF_INITIAL = 1  # Backoff ceiling in seconds for the first retry
 RETRY_BACKOFF_BASE = 2  # Exponential backoff multiplier
+RETRY_BACKOFF_MAX = 8  # Maximum backoff ceiling in seconds
+RETRY_BUDGET_CAPACITY = 10  # Retry tokens per device
+RETRY_BUDGET_REFILL_RATE = 0.5  # Retry tokens regained per second
+
+# Rate Limiting Configuration
+DEFAULT_RATE_LIMIT = 10  # Sustained requests per second per device
+DEFAULT_RATE_LIMIT_BURST = 20  # Requests sent at once after a quiet period
+RETRY_AFTER_MAX = 60  # Longest Retry-After pause honored, in seconds
+
+# Circuit Breaker Configuration
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 3  # Failed requests in a row before opening
+DEFAULT_CIRCUIT_RECOVERY_TIMEOUT = 30  # Seconds open before a probe request
+MIN_CIRCUIT_RECOVERY_TIMEOUT = 5  # Minimum recovery timeout in seconds
+CIRCUIT_STATE_CLOSED = "closed"
+CIRCUIT_STATE_OPEN = "open"
+CIRCUIT_STATE_HALF_OPEN = "half_open"
+
+# Connection Pool Configuration
+DATA_SESSION_POOL = f"{DOMAIN}_session_pool"  # hass.data key of the shared pool
+CONNECTION_POOL_LIMIT_PER_HOST = 16  # Keep >= DEFAULT_MAX_CONCURRENT_RELAY_COMMANDS
+CONNECTION_KEEPALIVE_TIMEOUT = 15  # Seconds an idle connection is kept open
+DNS_CACHE_TTL = 300  # DNS cache TTL in seconds for host names
+
+# Relay Command Scheduling
+DEFAULT_MAX_CONCURRENT_RELAY_COMMANDS = 16  # Relay commands in flight per device
+DEFAULT_MAX_CONCURRENT_STATE_READS = 4  # Relay state reads in flight per poll
+PRIORITY_MAX_DEFERRAL = 5  # Seconds a background request may wait for commands
+
+# Adaptive Concurrency Limiting
+# Requests in flight per device before feedback: the relay command cap, so
+# a bulk set_relays is not throttled before the device shows overload
+CONCURRENCY_INITIAL_LIMIT = DEFAULT_MAX_CONCURRENT_RELAY_COMMANDS
+CONCURRENCY_MIN_LIMIT = 1  # Lowest adaptive limit
+CONCURRENCY_MAX_LIMIT = 16  # Highest adaptive limit; keep <= CONNECTION_POOL_LIMIT_PER_HOST
+CONCURRENCY_DECREASE_FACTOR = 0.5  # Multiplicative decrease on overload
+CONCURRENCY_LATENCY_TOLERANCE = 3  # Latency above this multiple of the baseline is a spike
+CONCURRENCY_BASELINE_PERCENTILE = 50  # Percentile of recent latencies used as baseline
+CONCURRENCY_SPIKE_MIN_EXCESS = 0.25  # Seconds above the baseline a spike must also exceed
+CONCURRENCY_MIN_SAMPLES = 10  # Samples needed before latency spikes are detected
+
+# Adaptive Request Timeouts
+ADAPTIVE_TIMEOUT_PERCENTILE = 99  # Latency percentile the timeouts are based on
+ADAPTIVE_TIMEOUT_MULTIPLIER = 4  # Safety factor applied to the percentile
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = 20  # Samples needed before timeouts adapt
+CONNECT_TIMEOUT_FLOOR = 0.3  # Seconds; lower bound of the connect timeout
+CONNECT_TIMEOUT_CEILING = 5  # Seconds; upper bound of the connect timeout
+FIRST_BYTE_TIMEOUT_FLOOR = 0.5  # Seconds; lower bound of the first-byte timeout
+TOTAL_TIMEOUT_FLOOR = 0.8  # Seconds; lower bound of the total timeout
+# First-byte and total timeouts are capped by the client's timeout
+
+# Relay Command Hedging
+LATENCY_WINDOW = 100  # Recent latency samples kept per request type
+HEDGE_PERCENTILE = 95  # Latency percentile after which a hedge request is sent
+HEDGE_MIN_SAMPLES = 10  # Samples needed before the percentile is trusted
+HEDGE_MIN_DELAY = 0.05  # Lower bound of the hedge delay in seconds
+HEDGE_MAX_DELAY = 2.0  # Upper bound (and cold-start value) of the hedge delay
 
 # API Endpoints
 ENDPOINT_LOGIN = "/api/v0/login"
@@ -28,6 +104,11 @@ ENDPOINT_RELAY = "/api/v0/devices/{device_guid}/functions/relay"
 RELAY_STATE_ON = "on"
 RELAY_STATE_OFF = "off"
 
+# Services
+SERVICE_SET_RELAYS = "set_relays"
+ATTR_RELAYS = "relays"
+ATTR_GUID = "guid"
+
 # Coordinator Configuration
 CONF_POLL_INTERVAL = "poll_interval"
 MIN_POLL_INTERVAL = 10  # Minimum polling interval in seconds
@@ -40,5 +121,7 @@ NOTIFICATION_ID_PREFIX = "eltako_esr62pf_error"  # Prefix for persistent notific
 # Error Messages
 ERROR_MSG_CONNECTION = "Cannot reach Eltako device at {ip}:{port}. Check network and device power."
 ERROR_MSG_AUTHENTICATION = "Authentication failed. Verify the PoP credential in integration settings."
+ERROR_MSG_FINGERPRINT_MISMATCH = "Device certificate does not match the pinned fingerprint. Update the fingerprint in integration settings."
+ERROR_MSG_CIRCUIT_OPEN = "Eltako device at {ip}:{port} is unreachable. Requests are paused and will resume in {retry_in:.0f}s."
 ERROR_MSG_TIMEOUT = "Device not responding. Check network connection and device status."
 ERROR_MSG_API_ERROR = "API error occurred: {error}. Please check device logs."
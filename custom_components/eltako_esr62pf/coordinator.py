@@ -1,12 +1,12 @@
 """DataUpdateCoordinator for Eltako ESR62PF-IP integration."""
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import timedelta
 import logging
-from typing import Any
 
 from homeassistant.components import persistent_notification
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
@@ -24,39 +24,67 @@ from .const import (
 from .exceptions import (
     EltakoAPIError,
     EltakoAuthenticationError,
+    EltakoCircuitOpenError,
     EltakoConnectionError,
     EltakoTimeoutError,
 )
+from .models import BulkRelayResult, EltakoDevice, RelayState
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _has_relay_function(device: dict[str, Any]) -> bool:
-    """Check if a device has relay control capability.
+class DeviceListDiff:
+    """GUIDs added, removed and changed by a device list update."""
 
-    Args:
-        device: Device data dictionary from API
+    __slots__ = ("added", "removed", "changed")
 
-    Returns:
-        True if device has a function with identifier "relay", False otherwise
-    """
-    functions = device.get("functions", [])
-    if not isinstance(functions, list):
-        return False
+    def __init__(
+        self,
+        added: set[str] | None = None,
+        removed: set[str] | None = None,
+        changed: set[str] | None = None,
+    ) -> None:
+        """Initialize the diff.
 
-    for function in functions:
-        if isinstance(function, dict) and function.get("identifier") == "relay":
-            return True
+        Args:
+            added: GUIDs of relays that appeared
+            removed: GUIDs of relays that disappeared
+            changed: GUIDs of relays whose data changed
+        """
+        self.added = added or set()
+        self.removed = removed or set()
+        self.changed = changed or set()
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(self.added or self.removed or self.changed)
 
-    return False
+    @property
+    def guids(self) -> set[str]:
+        """Return all GUIDs touched by the update."""
+        return self.added | self.removed | self.changed
 
 
-class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, RelayState]]):
     """Class to manage fetching Eltako device data.
 
     Supports both optimistic updates (immediate UI feedback) and optional polling.
     By default, polling is disabled (update_interval=None) and the coordinator
     relies on optimistic updates when switch entities are controlled.
+
+    Polls read the device list live from the device, since it carries the
+    relay states. The first refresh and refreshes requested while polling is
+    disabled (e.g. by homeassistant.update_entity) check which relays exist
+    and are available, and read the API client's cached list; a cached list
+    may predate the latest relay command, so it only fills in relay states
+    that are still unknown. When a stale cached list is refreshed in the
+    background, the coordinator refreshes again from the new list.
+
+    Polls are diffed against the previous device list: a poll that changes
+    nothing does not notify listeners. Listeners registered with a device
+    GUID as context (e.g. CoordinatorEntity(coordinator, context=guid)) are
+    only called when that device changed; listeners without a context are
+    called on every update.
     """
 
     def __init__(
@@ -77,12 +105,17 @@ class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             _LOGGER,
             name="Eltako ESR62PF",
             update_interval=update_interval,
+            # Quiet polls return the previous data and skip listener updates
+            always_update=False,
         )
         self.api = api
-        self._devices: dict[str, Any] = {}
+        self._devices: dict[str, RelayState] = {}
         self._consecutive_failures = 0
         self._last_error: str | None = None
         self._notification_shown = False
+        # GUIDs touched by the latest update, None if all may have changed
+        self._changed_guids: set[str] | None = None
+        api.add_devices_listener(self._async_devices_revalidated)
 
     def _get_notification_id(self) -> str:
         """Get the notification ID for this coordinator.
@@ -155,7 +188,9 @@ class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._notification_shown = False
         _LOGGER.debug("Cleared persistent notification")
 
-    async def _handle_update_success(self, device_data: dict[str, Any]) -> None:
+    async def _handle_update_success(
+        self, device_data: dict[str, RelayState]
+    ) -> None:
         """Handle successful update - clear errors and restore devices.
 
         Args:
@@ -175,8 +210,9 @@ class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             await self._clear_persistent_notification()
 
             # Mark all devices as available again
-            for device_guid in device_data:
-                device_data[device_guid]["available"] = True
+            for device_guid, entry in device_data.items():
+                if not entry.available:
+                    device_data[device_guid] = replace(entry, available=True)
 
     async def _handle_update_failure(
         self, error: Exception, error_type: str, error_msg: str
@@ -190,16 +226,18 @@ class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """
         self._consecutive_failures += 1
         self._last_error = str(error)
+        self._changed_guids = None
 
         # Mark all devices as unavailable
-        for device_guid in self._devices:
-            self._devices[device_guid]["available"] = False
+        for device_guid, entry in self._devices.items():
+            if entry.available:
+                self._devices[device_guid] = replace(entry, available=False)
 
         # Show persistent notification after MAX_CONSECUTIVE_FAILURES
         if self._consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
             await self._show_persistent_notification(error_msg, error_type)
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    async def _async_update_data(self) -> dict[str, RelayState]:
         """Fetch data from API.
 
         This method is called automatically when polling is enabled.
@@ -215,43 +253,37 @@ class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         try:
             _LOGGER.debug("Fetching device states from API")
 
-            # Fetch device list from API
-            devices = await self.api.async_get_devices()
+            # Polls need the live relay states the device list carries; the
+            # first refresh and requested refreshes may use the cached list
+            poll = self.update_interval is not None and self.data is not None
+            devices = await self.api.async_get_devices(force_refresh=poll)
 
-            # Filter devices to only include those with relay control capability
-            relay_devices = [d for d in devices if _has_relay_function(d)]
+            # Transform API response to coordinator data format
+            device_data, diff = self._diff_devices(devices)
+            await self._async_sync_relay_states(
+                devices,
+                device_data,
+                diff,
+                keep_known=not poll and self.data is not None,
+            )
 
             _LOGGER.debug(
-                "Filtered devices: %d relay-capable out of %d total devices",
-                len(relay_devices),
-                len(devices),
+                "Device list diff: %d added, %d removed, %d changed",
+                len(diff.added),
+                len(diff.removed),
+                len(diff.changed),
             )
 
-            # Transform API response to coordinator data format
-            # Note: The API returns device metadata but not current relay states
-            # For now, we'll initialize devices and preserve existing states
-            device_data: dict[str, Any] = {}
-
-            for device in relay_devices:
-                device_guid = device.get("guid")
-                if not device_guid:
-                    _LOGGER.warning("Device missing GUID, skipping: %s", device)
-                    continue
-
-                # Preserve existing state if available, otherwise default to unknown
-                if device_guid in self._devices:
-                    device_data[device_guid] = self._devices[device_guid]
-                else:
-                    device_data[device_guid] = {
-                        "state": None,  # Unknown state until first control
-                        "available": True,
-                        "name": device.get("name", f"Relay {device_guid[:8]}"),
-                        "guid": device_guid,
-                    }
-
             # Handle successful update
             await self._handle_update_success(device_data)
 
+            self._changed_guids = diff.guids
+            if not diff and self.data is not None:
+                # Nothing changed: return the previous data so that the
+                # coordinator does not notify any listener
+                _LOGGER.debug("Device list unchanged (%d devices)", len(device_data))
+                return self.data
+
             self._devices = device_data
             _LOGGER.debug("Successfully fetched %d devices", len(device_data))
 
@@ -263,6 +295,15 @@ class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             await self._handle_update_failure(err, "authentication", error_msg)
             raise UpdateFailed(error_msg) from err
 
+        except EltakoCircuitOpenError as err:
+            # Device already known to be down; the breaker logged the outage
+            error_msg = ERROR_MSG_CONNECTION.format(
+                ip=self.api._ip_address, port=self.api._port
+            )
+            _LOGGER.debug("Skipped device fetch, circuit breaker is open: %s", err)
+            await self._handle_update_failure(err, "connection", error_msg)
+            raise UpdateFailed(error_msg) from err
+
         except EltakoConnectionError as err:
             error_msg = ERROR_MSG_CONNECTION.format(
                 ip=self.api._ip_address, port=self.api._port
@@ -289,6 +330,144 @@ class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             await self._handle_update_failure(err, "unexpected", error_msg)
             raise UpdateFailed(error_msg) from err
 
+    def _diff_devices(
+        self, devices: list[EltakoDevice]
+    ) -> tuple[dict[str, RelayState], DeviceListDiff]:
+        """Build coordinator data from a device list and diff it.
+
+        Relays whose device record is unchanged keep their existing data
+        object, so only added and changed relays get new data.
+
+        Args:
+            devices: Device list from API
+
+        Returns:
+            Tuple of the new device data and the diff to the previous data
+        """
+        device_data: dict[str, RelayState] = {}
+        diff = DeviceListDiff()
+        relay_count = 0
+
+        for device in devices:
+            if device.relay is None:
+                continue
+            relay_count += 1
+
+            device_guid = device.guid
+            if not device_guid:
+                _LOGGER.warning("Device missing GUID, skipping: %s", device)
+                continue
+
+            existing = self._devices.get(device_guid)
+            if existing is None:
+                # Unknown state until reported, read or controlled
+                diff.added.add(device_guid)
+                device_data[device_guid] = RelayState(device)
+            elif existing.device != device or not existing.available:
+                # Preserve the relay state, refresh everything else
+                diff.changed.add(device_guid)
+                device_data[device_guid] = replace(
+                    existing, device=device, available=True
+                )
+            else:
+                device_data[device_guid] = existing
+
+        diff.removed.update(set(self._devices) - set(device_data))
+
+        _LOGGER.debug(
+            "Filtered devices: %d relay-capable out of %d total devices",
+            relay_count,
+            len(devices),
+        )
+        return device_data, diff
+
+    async def _async_sync_relay_states(
+        self,
+        devices: list[EltakoDevice],
+        device_data: dict[str, RelayState],
+        diff: DeviceListDiff,
+        keep_known: bool = False,
+    ) -> None:
+        """Merge the physical relay states into the device data.
+
+        States reported in the device list are used as they are; relays
+        without a reported value are read from the device one by one.
+        Relays whose state changed, e.g. at the wall switch, get a new data
+        entry and are added to the diff.
+
+        Args:
+            devices: Device list from API
+            device_data: Device data built from the device list, updated in place
+            diff: Device list diff, updated in place
+            keep_known: Only set relays whose state is still unknown, for
+                device lists that may be older than the known states
+        """
+        states: dict[str, str] = {}
+        unreported: list[str] = []
+        for device in devices:
+            device_guid = device.guid
+            if device_guid not in device_data:
+                continue
+            if keep_known and device_data[device_guid].state is not None:
+                continue
+            if device.relay.value is not None:
+                states[device_guid] = device.relay.value
+            else:
+                unreported.append(device_guid)
+
+        if unreported:
+            states.update(await self.api.async_get_relay_states(unreported))
+
+        for device_guid, state in states.items():
+            entry = device_data[device_guid]
+            if entry.state == state:
+                continue
+            _LOGGER.debug("Relay %s is now %s", device_guid, state)
+            device_data[device_guid] = replace(entry, state=state)
+            if device_guid not in diff.added:
+                diff.changed.add(device_guid)
+
+    @callback
+    def _async_devices_revalidated(self) -> None:
+        """Refresh from a device list the API client refreshed in the background."""
+        if self.update_interval is not None or self.data is None:
+            # The next poll or the first refresh reads the list anyway
+            return
+        _LOGGER.debug("Device list refreshed in the background, updating devices")
+        self.hass.async_create_task(self.async_refresh())
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners of the devices touched by the latest update."""
+        self.async_update_device_listeners(self._changed_guids)
+
+    @callback
+    def async_update_device_listeners(self, device_guids: set[str] | None) -> None:
+        """Update the listeners of some devices.
+
+        Args:
+            device_guids: GUIDs of the changed devices, None for all devices.
+                Listeners without a device context are always updated.
+        """
+        for update_callback, context in list(self._listeners.values()):
+            if device_guids is None or context is None or context in device_guids:
+                update_callback()
+
+    @callback
+    def _async_devices_updated(self, device_guids: set[str]) -> None:
+        """Publish changes of some devices to their listeners in one pass.
+
+        Args:
+            device_guids: GUIDs of the changed devices
+        """
+        if self.last_update_success:
+            self.data = self._devices
+            self.async_update_device_listeners(device_guids)
+        else:
+            # Recovering from a failed update changes every device
+            self._changed_guids = None
+            self.async_set_updated_data(self._devices)
+
     async def async_set_device_state(
         self, device_guid: str, state: str
     ) -> None:
@@ -298,6 +477,20 @@ class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         instant UI feedback, without waiting for the next poll interval.
         This is the primary method for state updates when polling is disabled.
 
+        Args:
+            device_guid: GUID of the device to update
+            state: New relay state ('on' or 'off')
+        """
+        self._set_optimistic_state(device_guid, state)
+
+        # Notify only the listeners of this device
+        self._async_devices_updated({device_guid})
+
+        _LOGGER.debug("Optimistic state update complete for %s", device_guid)
+
+    def _set_optimistic_state(self, device_guid: str, state: str) -> None:
+        """Store a commanded relay state without notifying listeners.
+
         Args:
             device_guid: GUID of the device to update
             state: New relay state ('on' or 'off')
@@ -305,22 +498,50 @@ class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         _LOGGER.debug("Setting optimistic state for %s to %s", device_guid, state)
 
         # Initialize device data if not present
-        if device_guid not in self._devices:
-            self._devices[device_guid] = {
-                "state": state,
-                "available": True,
-                "name": f"Relay {device_guid[:8]}",
-                "guid": device_guid,
-            }
+        entry = self._devices.get(device_guid)
+        if entry is None:
+            device = EltakoDevice(guid=device_guid, name=f"Relay {device_guid[:8]}")
+            self._devices[device_guid] = RelayState(device, state=state)
         else:
             # Update existing device state
-            self._devices[device_guid]["state"] = state
-            self._devices[device_guid]["available"] = True
+            self._devices[device_guid] = replace(entry, state=state, available=True)
 
-        # Notify all listeners (entities) of the state change
-        self.async_set_updated_data(self._devices)
+    async def async_set_relays(self, states: dict[str, str]) -> BulkRelayResult:
+        """Set several relays in one bulk operation.
 
-        _LOGGER.debug("Optimistic state update complete for %s", device_guid)
+        The commands are sent together, then the optimistic states of the
+        relays that were set and the unavailability of those that failed
+        are published in a single listener update.
+
+        Args:
+            states: Dictionary mapping device GUIDs to relay states
+
+        Returns:
+            Per-relay outcome of the bulk operation
+
+        Raises:
+            EltakoAuthenticationError: If authentication fails
+            EltakoConnectionError: If connection fails
+            EltakoTimeoutError: If the login request times out
+        """
+        result = await self.api.async_set_relays(states)
+
+        changed: set[str] = set()
+        for device_guid in result.succeeded:
+            self._set_optimistic_state(device_guid, result.results[device_guid].state)
+            changed.add(device_guid)
+        for device_guid, err in result.failed.items():
+            entry = self._devices.get(device_guid)
+            if entry is not None:
+                _LOGGER.warning(
+                    "Marking device %s as unavailable: %s", device_guid, err
+                )
+                self._devices[device_guid] = replace(entry, available=False)
+                changed.add(device_guid)
+
+        if changed:
+            self._async_devices_updated(changed)
+        return result
 
     async def async_mark_device_unavailable(self, device_guid: str) -> None:
         """Mark a device as unavailable after a failed operation.
@@ -328,10 +549,11 @@ class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         Args:
             device_guid: GUID of the device to mark unavailable
         """
-        if device_guid in self._devices:
+        entry = self._devices.get(device_guid)
+        if entry is not None:
             _LOGGER.warning("Marking device %s as unavailable", device_guid)
-            self._devices[device_guid]["available"] = False
-            self.async_set_updated_data(self._devices)
+            self._devices[device_guid] = replace(entry, available=False)
+            self._async_devices_updated({device_guid})
 
     @property
     def consecutive_failures(self) -> int:
@@ -342,6 +564,15 @@ class EltakoDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """
         return self._consecutive_failures
 
+    @property
+    def circuit_state(self) -> str:
+        """Get the circuit breaker state of the device host.
+
+        Returns:
+            Circuit breaker state: closed, open or half_open
+        """
+        return self.api.circuit_state
+
     @property
     def last_error(self) -> str | None:
         """Get the last error message.
@@ -0,0 +1,42 @@
+"""Diagnostics support for Eltako ESR62PF-IP integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_POP_CREDENTIAL, DOMAIN
+from .coordinator import EltakoDataUpdateCoordinator
+
+TO_REDACT = {CONF_POP_CREDENTIAL}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry to report on
+
+    Returns:
+        Dictionary with redacted entry data, coordinator state and API statistics
+    """
+    coordinator: EltakoDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "device_count": len(coordinator.data or {}),
+            "consecutive_failures": coordinator.consecutive_failures,
+            "last_error": coordinator.last_error,
+            "circuit_state": coordinator.circuit_state,
+        },
+        "api": coordinator.api.get_stats(),
+    }
@@ -13,9 +13,23 @@ class EltakoConnectionError(EltakoError):
     """Exception raised when connection to device fails."""
 
 
+class EltakoCircuitOpenError(EltakoConnectionError):
+    """Exception raised when requests fail fast because the device is down."""
+
+
 class EltakoAPIError(EltakoError):
     """Exception raised when API returns an error."""
 
+    def __init__(self, message: str, status: int | None = None) -> None:
+        """Initialize the error.
+
+        Args:
+            message: Error message
+            status: HTTP status of the device's response, if it sent one
+        """
+        super().__init__(message)
+        self.status = status
+
 
 class EltakoTimeoutError(EltakoError):
     """Exception raised when request times out."""
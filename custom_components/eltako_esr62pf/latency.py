@@ -0,0 +1,60 @@
+"""Request latency tracking for Eltako ESR62PF-IP integration."""
+from __future__ import annotations
+
+from collections import deque
+import math
+from typing import Any
+
+from .const import LATENCY_WINDOW
+
+
+class LatencyTracker:
+    """Rolling window of request latencies with percentile queries."""
+
+    __slots__ = ("_samples", "_count")
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        """Initialize an empty tracker.
+
+        Args:
+            window: Number of most recent samples to keep
+        """
+        self._samples: deque[float] = deque(maxlen=window)
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._samples)
+
+    def record(self, latency: float) -> None:
+        """Record a request latency.
+
+        Args:
+            latency: Request duration in seconds
+        """
+        self._samples.append(latency)
+        self._count += 1
+
+    def percentile(self, percent: float) -> float | None:
+        """Return a latency percentile of the window (nearest rank).
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None if no samples were recorded
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return sample count and common percentiles as a dictionary."""
+        return {
+            "count": self._count,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
@@ -0,0 +1,133 @@
+"""Data models for Eltako ESR62PF-IP integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .const import RELAY_STATE_OFF, RELAY_STATE_ON
+from .exceptions import EltakoError
+
+
+@dataclass(frozen=True, slots=True)
+class RelayFunction:
+    """Relay function of a device as reported in the device list."""
+
+    identifier: str
+    type: str
+    value: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class EltakoDevice:
+    """Device from the Eltako device list.
+
+    Built once from the API response and shared by the API cache, the
+    coordinator and the entities. Only the fields the integration uses are
+    kept; the raw ``infos`` and ``settings`` arrays are dropped.
+    """
+
+    guid: str
+    name: str
+    product_guid: str = ""
+    relay: Optional[RelayFunction] = None
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> EltakoDevice:
+        """Build a device from a device list entry.
+
+        Args:
+            data: Device object from the device list response
+
+        Returns:
+            Parsed device
+        """
+        return cls(
+            guid=data.get("deviceGuid", ""),
+            name=data.get("displayName", "Unknown"),
+            product_guid=data.get("productGuid", ""),
+            relay=parse_relay_function(data.get("functions", [])),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RelayState:
+    """Coordinator data for a relay: its device record and current state.
+
+    Updates replace the record (``dataclasses.replace``) instead of
+    mutating it, so a new object always means changed data.
+    """
+
+    device: EltakoDevice
+    state: Optional[str] = None
+    available: bool = True
+
+    @property
+    def guid(self) -> str:
+        """Return the GUID of the relay's device."""
+        return self.device.guid
+
+    @property
+    def name(self) -> str:
+        """Return the name of the relay's device."""
+        return self.device.name
+
+
+@dataclass(frozen=True, slots=True)
+class RelayCommandResult:
+    """Outcome of one relay command of a bulk operation."""
+
+    guid: str
+    state: str
+    latency: float
+    error: Optional[EltakoError] = None
+
+    @property
+    def success(self) -> bool:
+        """Return True if the relay was set."""
+        return self.error is None
+
+
+@dataclass(frozen=True, slots=True)
+class BulkRelayResult:
+    """Per-relay outcomes of a bulk relay operation, keyed by GUID."""
+
+    results: dict[str, RelayCommandResult]
+
+    @property
+    def succeeded(self) -> list[str]:
+        """Return the GUIDs of the relays that were set."""
+        return [guid for guid, result in self.results.items() if result.success]
+
+    @property
+    def failed(self) -> dict[str, EltakoError]:
+        """Return the errors of the relays that could not be set."""
+        return {
+            guid: result.error
+            for guid, result in self.results.items()
+            if result.error is not None
+        }
+
+
+def parse_relay_function(functions: Any) -> Optional[RelayFunction]:
+    """Find the relay function in a device's functions array.
+
+    Args:
+        functions: Functions array from the device list
+
+    Returns:
+        Relay function with its current value ('on', 'off' or None if the
+        device reported no valid value), or None if the device has no relay
+    """
+    if not isinstance(functions, list):
+        return None
+
+    for function in functions:
+        if isinstance(function, dict) and function.get("identifier") == "relay":
+            value = function.get("value")
+            return RelayFunction(
+                identifier="relay",
+                type=function.get("type", ""),
+                value=value if value in (RELAY_STATE_ON, RELAY_STATE_OFF) else None,
+            )
+
+    return None
@@ -0,0 +1,148 @@
+"""Request prioritization for Eltako ESR62PF-IP API requests."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import logging
+import time
+from typing import Any
+
+from .const import PRIORITY_MAX_DEFERRAL
+
+_LOGGER = logging.getLogger(__name__)
+
+# Priority classes, most urgent first
+PRIORITY_INTERACTIVE = "interactive"  # Relay commands
+PRIORITY_RECONCILE = "reconcile"  # Relay state reads
+PRIORITY_METADATA = "metadata"  # Device list polls
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_RECONCILE, PRIORITY_METADATA)
+
+
+class PriorityClassStats:
+    """Queueing statistics for a single priority class."""
+
+    __slots__ = ("active", "requests", "deferred", "expired", "total_wait", "max_wait")
+
+    def __init__(self) -> None:
+        """Initialize empty class statistics."""
+        self.active = 0
+        self.requests = 0
+        self.deferred = 0
+        self.expired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, wait: float) -> None:
+        """Record the time a request waited before it was sent.
+
+        Args:
+            wait: Seconds between arrival and dispatch
+        """
+        self.requests += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    @property
+    def average_wait(self) -> float:
+        """Return the average wait time in seconds."""
+        if not self.requests:
+            return 0.0
+        return self.total_wait / self.requests
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return {
+            "active": self.active,
+            "requests": self.requests,
+            "deferred": self.deferred,
+            "expired": self.expired,
+            "average_wait": self.average_wait,
+            "max_wait": self.max_wait,
+        }
+
+
+class RequestPriorityScheduler:
+    """Defer background requests while more urgent requests are pending.
+
+    The device serves requests in arrival order, so a poll sent just
+    before a relay command delays it. A request is only sent once no
+    request of a more urgent class is queued or in flight. Requests
+    already sent are never interrupted, and a deferred request is sent
+    anyway after ``max_deferral`` seconds so polls cannot starve.
+    """
+
+    def __init__(self, max_deferral: float = PRIORITY_MAX_DEFERRAL) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_deferral: Longest time in seconds a request is deferred
+        """
+        self._max_deferral = max_deferral
+        self._stats = {priority: PriorityClassStats() for priority in PRIORITIES}
+        # Set while no request of the class is queued or in flight
+        self._idle = {priority: asyncio.Event() for priority in PRIORITIES}
+        for idle in self._idle.values():
+            idle.set()
+
+    def _busy_class(self, priority: str) -> str | None:
+        """Find a more urgent class with queued or in-flight requests.
+
+        Args:
+            priority: Class of the waiting request
+
+        Returns:
+            The most urgent busy class above priority, or None
+        """
+        for other in PRIORITIES[: PRIORITIES.index(priority)]:
+            if self._stats[other].active:
+                return other
+        return None
+
+    @asynccontextmanager
+    async def async_slot(self, priority: str) -> AsyncIterator[None]:
+        """Wait for the turn of a request and hold it while it runs.
+
+        Args:
+            priority: Class of the request, one of PRIORITIES
+
+        Yields:
+            Once the request may be sent
+        """
+        stats = self._stats[priority]
+        stats.active += 1
+        self._idle[priority].clear()
+        start = time.monotonic()
+        try:
+            if self._busy_class(priority) is not None:
+                stats.deferred += 1
+                try:
+                    async with asyncio.timeout(self._max_deferral):
+                        while (busy := self._busy_class(priority)) is not None:
+                            await self._idle[busy].wait()
+                except TimeoutError:
+                    stats.expired += 1
+                    _LOGGER.debug(
+                        "Sending %s request after deferring it for %.1fs",
+                        priority,
+                        self._max_deferral,
+                    )
+            stats.record_wait(time.monotonic() - start)
+            yield
+        finally:
+            stats.active -= 1
+            if not stats.active:
+                self._idle[priority].set()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return per-class statistics.
+
+        Returns:
+            Dictionary with the maximum deferral and the stats of each class
+        """
+        return {
+            "max_deferral": self._max_deferral,
+            "classes": {
+                priority: stats.as_dict() for priority, stats in self._stats.items()
+            },
+        }
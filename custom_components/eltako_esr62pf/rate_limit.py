@@ -0,0 +1,179 @@
+"""Request rate limiting for Eltako ESR62PF-IP API requests."""
+from __future__ import annotations
+
+import asyncio
+from email.utils import parsedate_to_datetime
+import logging
+import time
+from typing import Any, Optional
+
+from .const import DEFAULT_RATE_LIMIT, DEFAULT_RATE_LIMIT_BURST, RETRY_AFTER_MAX
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Seconds to wait (0 for dates in the past), or None if the header is
+        missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RateLimiter:
+    """Token bucket limiting the request rate to one device.
+
+    Requests spend a token each and tokens refill at ``rate`` per second
+    up to ``burst``. A request finding the bucket empty is not rejected:
+    it takes its token on credit and sleeps until the token would have
+    refilled, so waiting requests are sent in arrival order at the
+    configured rate. ``pause`` stops all requests, e.g. for a Retry-After
+    header of an overloaded device.
+    """
+
+    __slots__ = (
+        "_rate",
+        "_burst",
+        "_tokens",
+        "_updated",
+        "_paused_total",
+        "_waiting",
+        "_delayed",
+        "_total_delay",
+        "_max_delay",
+        "_pauses",
+    )
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE_LIMIT,
+        burst: int = DEFAULT_RATE_LIMIT_BURST,
+    ) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Sustained requests per second
+            burst: Requests that may be sent at once after a quiet period
+
+        Raises:
+            ValueError: If rate is not positive or burst is smaller than 1
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        # Time from which tokens refill; in the future while paused
+        self._updated = time.monotonic()
+        # Total pause time so far; waiters sleep longer when it grows
+        self._paused_total = 0.0
+        self._waiting = 0
+        self._delayed = 0
+        self._total_delay = 0.0
+        self._max_delay = 0.0
+        self._pauses = 0
+
+    def _refill(self) -> float:
+        """Add the tokens accumulated since the last update.
+
+        Returns:
+            Current monotonic time
+        """
+        now = time.monotonic()
+        if now > self._updated:
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+        return now
+
+    @property
+    def tokens(self) -> float:
+        """Return the tokens available; negative while requests wait."""
+        self._refill()
+        return self._tokens
+
+    @property
+    def paused_for(self) -> float:
+        """Return the seconds until a pause ends."""
+        return max(0.0, self._updated - time.monotonic())
+
+    async def async_acquire(self) -> None:
+        """Wait until a request may be sent."""
+        now = self._refill()
+        self._tokens -= 1
+        delay = max(0.0, self._updated - now) + max(0.0, -self._tokens) / self._rate
+        if delay <= 0:
+            return
+
+        self._delayed += 1
+        self._total_delay += delay
+        self._max_delay = max(self._max_delay, delay)
+        self._waiting += 1
+        try:
+            # A pause starting while we wait pushes our turn back as well
+            paused_total = self._paused_total
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self._paused_total - paused_total
+                paused_total = self._paused_total
+        except asyncio.CancelledError:
+            # Give the unused token back to the requests queued behind
+            self._tokens = min(self._burst, self._tokens + 1)
+            raise
+        finally:
+            self._waiting -= 1
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests, e.g. as asked by a Retry-After header.
+
+        Args:
+            seconds: Time to wait before the next request, capped at
+                RETRY_AFTER_MAX
+        """
+        now = self._refill()
+        until = now + min(seconds, RETRY_AFTER_MAX)
+        if until <= self._updated:
+            return
+
+        _LOGGER.debug("Pausing requests for %.1fs", until - now)
+        self._pauses += 1
+        self._paused_total += until - max(now, self._updated)
+        # No burst after the pause: tokens only refill once it has ended
+        self._tokens = min(self._tokens, 1.0)
+        self._updated = until
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the limiter state as a dictionary."""
+        return {
+            "rate": self._rate,
+            "burst": self._burst,
+            "tokens": round(self.tokens, 2),
+            "waiting": self._waiting,
+            "delayed": self._delayed,
+            "average_delay": self._total_delay / self._delayed if self._delayed else 0.0,
+            "max_delay": self._max_delay,
+            "pauses": self._pauses,
+            "paused_for": round(self.paused_for, 2),
+        }
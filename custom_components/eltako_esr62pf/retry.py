@@ -0,0 +1,167 @@
+"""Retry policy for Eltako ESR62PF-IP API requests."""
+from __future__ import annotations
+
+import random
+import time
+from typing import Any
+
+from .const import (
+    AUTH_RETRIES,
+    MAX_RETRIES,
+    REQUEST_DEADLINE,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_INITIAL,
+    RETRY_BACKOFF_MAX,
+    RETRY_BUDGET_CAPACITY,
+    RETRY_BUDGET_REFILL_RATE,
+    THROTTLED_RETRIES,
+    TIMEOUT_RETRIES,
+)
+
+# Retry classes with separate retry limits
+RETRY_AUTH = "auth"
+RETRY_CONNECT = "connect"
+RETRY_TIMEOUT = "timeout"
+RETRY_THROTTLED = "throttled"
+
+
+class RetryPolicy:
+    """Retry limits, deadline and backoff for a single API call.
+
+    Each call gets a total deadline covering all attempts and backoff
+    sleeps. Authentication, connection, timeout and throttling errors each
+    have their own retry limit, and backoff uses full jitter: a random
+    delay between zero and the exponential backoff for the attempt.
+    """
+
+    __slots__ = (
+        "deadline",
+        "backoff_initial",
+        "backoff_base",
+        "backoff_max",
+        "_max_retries",
+    )
+
+    def __init__(
+        self,
+        deadline: float = REQUEST_DEADLINE,
+        auth_retries: int = AUTH_RETRIES,
+        connect_retries: int = MAX_RETRIES,
+        timeout_retries: int = TIMEOUT_RETRIES,
+        throttled_retries: int = THROTTLED_RETRIES,
+        backoff_initial: float = RETRY_BACKOFF_INITIAL,
+        backoff_base: float = RETRY_BACKOFF_BASE,
+        backoff_max: float = RETRY_BACKOFF_MAX,
+    ) -> None:
+        """Initialize the retry policy.
+
+        Args:
+            deadline: Total time in seconds for all attempts of one call
+            auth_retries: Retries after a 401 response (with a fresh token)
+            connect_retries: Retries after connection errors
+            timeout_retries: Retries after request timeouts
+            throttled_retries: Retries after a 429 or 503 response asking
+                to retry later
+            backoff_initial: Backoff ceiling in seconds for the first retry
+            backoff_base: Exponential backoff multiplier
+            backoff_max: Maximum backoff ceiling in seconds
+        """
+        self.deadline = deadline
+        self.backoff_initial = backoff_initial
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._max_retries = {
+            RETRY_AUTH: auth_retries,
+            RETRY_CONNECT: connect_retries,
+            RETRY_TIMEOUT: timeout_retries,
+            RETRY_THROTTLED: throttled_retries,
+        }
+
+    def max_retries(self, kind: str) -> int:
+        """Return the retry limit for a retry class.
+
+        Args:
+            kind: Retry class (RETRY_AUTH, RETRY_CONNECT, RETRY_TIMEOUT or
+                RETRY_THROTTLED)
+
+        Returns:
+            Maximum number of retries for the class
+        """
+        return self._max_retries[kind]
+
+    def backoff(self, attempt: int) -> float:
+        """Return a full-jitter backoff delay.
+
+        Args:
+            attempt: Number of retries already made for the error class
+
+        Returns:
+            Delay in seconds before the next attempt
+        """
+        ceiling = min(
+            self.backoff_max, self.backoff_initial * self.backoff_base**attempt
+        )
+        return random.uniform(0, ceiling)
+
+
+class RetryBudget:
+    """Token bucket limiting retries against one device.
+
+    Every retry spends a token and tokens refill at a fixed rate. When a
+    device is down, the bucket empties and further calls fail after their
+    first attempt instead of multiplying the load with retries.
+    """
+
+    __slots__ = ("_capacity", "_refill_rate", "_tokens", "_updated", "_denied")
+
+    def __init__(
+        self,
+        capacity: float = RETRY_BUDGET_CAPACITY,
+        refill_rate: float = RETRY_BUDGET_REFILL_RATE,
+    ) -> None:
+        """Initialize a full retry budget.
+
+        Args:
+            capacity: Maximum number of stored retry tokens
+            refill_rate: Tokens added per second
+        """
+        self._capacity = capacity
+        self._refill_rate = refill_rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._denied = 0
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last update."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._refill_rate
+        )
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of retry tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self) -> bool:
+        """Spend a retry token if one is available.
+
+        Returns:
+            True if the retry may proceed, False if the budget is exhausted
+        """
+        self._refill()
+        if self._tokens < 1:
+            self._denied += 1
+            return False
+        self._tokens -= 1
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the budget state as a dictionary."""
+        return {
+            "tokens": round(self.tokens, 2),
+            "capacity": self._capacity,
+            "denied": self._denied,
+        }
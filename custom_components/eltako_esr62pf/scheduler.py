@@ -0,0 +1,284 @@
+"""Relay command scheduling for Eltako ESR62PF-IP integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import time
+from typing import Any, TypeVar
+
+from .const import DEFAULT_MAX_CONCURRENT_RELAY_COMMANDS
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class RelayLaneStats:
+    """Queueing statistics for a single relay command lane."""
+
+    __slots__ = (
+        "queue_depth",
+        "submitted",
+        "commands",
+        "coalesced",
+        "total_wait",
+        "max_wait",
+        "last_wait",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty lane statistics."""
+        self.queue_depth = 0
+        self.submitted = 0
+        self.commands = 0
+        self.coalesced = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+    def record_wait(self, wait: float) -> None:
+        """Record the time a command spent waiting for its turn.
+
+        Args:
+            wait: Seconds between submission and dispatch
+        """
+        self.commands += 1
+        self.total_wait += wait
+        self.last_wait = wait
+        self.max_wait = max(self.max_wait, wait)
+
+    @property
+    def average_wait(self) -> float:
+        """Return the average wait time in seconds."""
+        if not self.commands:
+            return 0.0
+        return self.total_wait / self.commands
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return {
+            "queue_depth": self.queue_depth,
+            "submitted": self.submitted,
+            "commands": self.commands,
+            "coalesced": self.coalesced,
+            "average_wait": self.average_wait,
+            "max_wait": self.max_wait,
+            "last_wait": self.last_wait,
+        }
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    """Mark a future's exception as retrieved.
+
+    Callers may have been cancelled before the shared command finished,
+    in which case nobody else would retrieve the exception.
+    """
+    if not future.cancelled():
+        future.exception()
+
+
+class _PendingCommand:
+    """Command waiting to be sent for a relay.
+
+    Later submissions for the same relay overwrite ``value`` and share
+    ``future``, so all of them complete with the newest command's outcome.
+    """
+
+    __slots__ = ("value", "send", "future", "enqueued")
+
+    def __init__(
+        self, value: Any, send: Callable[[Any], Awaitable[Any]]
+    ) -> None:
+        """Initialize the pending command."""
+        self.value = value
+        self.send = send
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.future.add_done_callback(_consume_exception)
+        self.enqueued = time.monotonic()
+
+
+class _RelayLane:
+    """Command lane for a single relay: one command in flight, one pending."""
+
+    __slots__ = ("pending", "worker", "stats")
+
+    def __init__(self) -> None:
+        """Initialize the lane."""
+        self.pending: _PendingCommand | None = None
+        self.worker: asyncio.Task | None = None
+        self.stats = RelayLaneStats()
+
+
+class RelayCommandScheduler:
+    """Schedule relay commands in per-GUID lanes.
+
+    Commands for the same relay are sent one at a time, while commands for
+    different relays run concurrently up to ``max_concurrency`` requests per
+    Eltako device. While a command for a relay is in flight, newer commands
+    for that relay collapse into a single pending command carrying the most
+    recent value (last write wins), so at most one more request is sent.
+    """
+
+    def __init__(
+        self, max_concurrency: int = DEFAULT_MAX_CONCURRENT_RELAY_COMMANDS
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrency: Maximum relay commands in flight per device
+
+        Raises:
+            ValueError: If max_concurrency is smaller than 1
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self._max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lanes: dict[str, _RelayLane] = {}
+        self._in_flight = 0
+        self._coalesced = 0
+
+    @property
+    def max_concurrency(self) -> int:
+        """Return the maximum number of concurrent relay commands."""
+        return self._max_concurrency
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of relay commands currently in flight."""
+        return self._in_flight
+
+    @property
+    def coalesced(self) -> int:
+        """Return the number of commands superseded by a newer command."""
+        return self._coalesced
+
+    def _get_lane(self, device_guid: str) -> _RelayLane:
+        """Get or create the lane for a relay.
+
+        Args:
+            device_guid: GUID of the relay
+
+        Returns:
+            Command lane for the relay
+        """
+        lane = self._lanes.get(device_guid)
+        if lane is None:
+            lane = self._lanes[device_guid] = _RelayLane()
+        return lane
+
+    async def async_submit(
+        self,
+        device_guid: str,
+        value: _T,
+        send: Callable[[_T], Awaitable[Any]],
+    ) -> Any:
+        """Submit a command for a relay.
+
+        Args:
+            device_guid: GUID of the relay the command targets
+            value: Desired value, e.g. the relay state
+            send: Coroutine function sending a value to the device
+
+        Returns:
+            Result of the request that carried the newest submitted value
+        """
+        lane = self._get_lane(device_guid)
+        lane.stats.submitted += 1
+
+        pending = lane.pending
+        if pending is None:
+            pending = lane.pending = _PendingCommand(value, send)
+        else:
+            # A command is already waiting behind the one in flight:
+            # replace its value instead of queueing another request
+            _LOGGER.debug(
+                "Coalescing relay command for %s: %s replaces %s",
+                device_guid,
+                value,
+                pending.value,
+            )
+            pending.value = value
+            pending.send = send
+            lane.stats.coalesced += 1
+            self._coalesced += 1
+
+        if lane.worker is None:
+            lane.worker = asyncio.create_task(self._async_drain(device_guid, lane))
+
+        lane.stats.queue_depth += 1
+        try:
+            # Shield so a cancelled caller does not abort a command that
+            # other callers are waiting on
+            return await asyncio.shield(pending.future)
+        finally:
+            lane.stats.queue_depth -= 1
+
+    async def _async_drain(self, device_guid: str, lane: _RelayLane) -> None:
+        """Send pending commands of a lane until it is empty.
+
+        Args:
+            device_guid: GUID of the relay
+            lane: Command lane to drain
+        """
+        try:
+            while lane.pending is not None:
+                async with self._semaphore:
+                    # Take the command only once a slot is free so it keeps
+                    # absorbing newer values while waiting
+                    command = lane.pending
+                    lane.pending = None
+
+                    wait = time.monotonic() - command.enqueued
+                    lane.stats.record_wait(wait)
+                    _LOGGER.debug(
+                        "Dispatching relay command for %s after %.3fs in queue",
+                        device_guid,
+                        wait,
+                    )
+
+                    self._in_flight += 1
+                    try:
+                        result = await command.send(command.value)
+                    except Exception as err:  # pylint: disable=broad-except
+                        command.future.set_exception(err)
+                    except BaseException:
+                        command.future.cancel()
+                        raise
+                    else:
+                        command.future.set_result(result)
+                    finally:
+                        self._in_flight -= 1
+        finally:
+            lane.worker = None
+            if lane.pending is not None:
+                # Drain was cancelled; do not leave waiters hanging
+                lane.pending.future.cancel()
+                lane.pending = None
+
+    async def async_shutdown(self) -> None:
+        """Cancel all running lane workers."""
+        workers = [lane.worker for lane in self._lanes.values() if lane.worker]
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return scheduler statistics.
+
+        Returns:
+            Dictionary with the concurrency cap, in-flight and coalesced
+            counts and per-lane stats
+        """
+        return {
+            "max_concurrency": self._max_concurrency,
+            "in_flight": self._in_flight,
+            "coalesced": self._coalesced,
+            "lanes": {
+                device_guid: lane.stats.as_dict()
+                for device_guid, lane in self._lanes.items()
+            },
+        }
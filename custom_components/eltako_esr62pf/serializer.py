@@ -0,0 +1,45 @@
+"""JSON serializers for Eltako ESR62PF-IP API requests and responses."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
+
+@dataclass(frozen=True, slots=True)
+class JSONSerializer:
+    """Pair of functions encoding request bodies and decoding responses."""
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    """Encode an object as compact UTF-8 JSON with the standard library."""
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+STDLIB_SERIALIZER = JSONSerializer(name="json", dumps=_stdlib_dumps, loads=json.loads)
+
+ORJSON_SERIALIZER: Optional[JSONSerializer] = (
+    JSONSerializer(name="orjson", dumps=orjson.dumps, loads=orjson.loads)
+    if orjson is not None
+    else None
+)
+
+
+def get_default_serializer() -> JSONSerializer:
+    """Return the fastest available serializer.
+
+    Returns:
+        orjson based serializer if orjson is installed, else the standard
+        library serializer
+    """
+    return ORJSON_SERIALIZER or STDLIB_SERIALIZER
@@ -0,0 +1,192 @@
+"""Services for Eltako ESR62PF-IP integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_STATE
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    ATTR_GUID,
+    ATTR_RELAYS,
+    DOMAIN,
+    RELAY_STATE_OFF,
+    RELAY_STATE_ON,
+    SERVICE_SET_RELAYS,
+)
+from .coordinator import EltakoDataUpdateCoordinator
+from .exceptions import EltakoError
+from .models import BulkRelayResult, RelayCommandResult
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _to_relay_state(value: bool) -> str:
+    """Convert a boolean target state to a relay state."""
+    return RELAY_STATE_ON if value else RELAY_STATE_OFF
+
+
+# States accept on/off, true/false and YAML booleans (an unquoted "on")
+RELAY_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Exclusive(ATTR_ENTITY_ID, "target"): cv.entity_id,
+            vol.Exclusive(ATTR_GUID, "target"): cv.string,
+            vol.Required(ATTR_STATE): vol.All(cv.boolean, _to_relay_state),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_ENTITY_ID, ATTR_GUID),
+)
+
+SET_RELAYS_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_RELAYS): vol.All(cv.ensure_list, [RELAY_SCHEMA])}
+)
+
+
+def _resolve_relay(
+    hass: HomeAssistant, relay: dict[str, Any]
+) -> tuple[str, str]:
+    """Find the config entry and GUID of a service call target.
+
+    Args:
+        hass: Home Assistant instance
+        relay: Validated relay entry of the service call
+
+    Returns:
+        Config entry ID of the relay's device and the relay GUID
+
+    Raises:
+        ServiceValidationError: If the target is not an Eltako relay
+    """
+    coordinators: dict[str, EltakoDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+
+    if (entity_id := relay.get(ATTR_ENTITY_ID)) is not None:
+        entity = er.async_get(hass).async_get(entity_id)
+        if (
+            entity is None
+            or entity.platform != DOMAIN
+            or entity.config_entry_id not in coordinators
+        ):
+            raise ServiceValidationError(f"{entity_id} is not an Eltako relay")
+        return entity.config_entry_id, entity.unique_id
+
+    device_guid = relay[ATTR_GUID]
+    for entry_id, coordinator in coordinators.items():
+        if device_guid in (coordinator.data or {}):
+            return entry_id, device_guid
+    raise ServiceValidationError(f"No Eltako relay with GUID {device_guid}")
+
+
+async def _async_set_relays(
+    coordinator: EltakoDataUpdateCoordinator, states: dict[str, str]
+) -> BulkRelayResult:
+    """Set the relays of one Eltako device.
+
+    A failed login fails every relay of the device instead of the whole
+    service call, so relays of other devices are still reported.
+
+    Args:
+        coordinator: Coordinator of the Eltako device
+        states: Dictionary mapping device GUIDs to relay states
+
+    Returns:
+        Per-relay outcome of the bulk operation
+    """
+    try:
+        return await coordinator.async_set_relays(states)
+    except EltakoError as err:
+        _LOGGER.error("Failed to set relays: %s", err)
+        return BulkRelayResult(
+            {
+                device_guid: RelayCommandResult(device_guid, state, 0.0, err)
+                for device_guid, state in states.items()
+            }
+        )
+
+
+async def async_handle_set_relays(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Handle the set_relays service call.
+
+    Relays are grouped by Eltako device and each group is sent as one bulk
+    operation; the groups run concurrently.
+
+    Args:
+        hass: Home Assistant instance
+        call: Service call with the relays and their target states
+
+    Returns:
+        Per-relay outcome keyed by GUID if the caller asked for a response
+
+    Raises:
+        ServiceValidationError: If a target is not an Eltako relay
+        HomeAssistantError: If a relay failed and no response was requested
+    """
+    batches: dict[str, dict[str, str]] = {}
+    for relay in call.data[ATTR_RELAYS]:
+        entry_id, device_guid = _resolve_relay(hass, relay)
+        batches.setdefault(entry_id, {})[device_guid] = relay[ATTR_STATE]
+
+    coordinators: dict[str, EltakoDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+    results = await asyncio.gather(
+        *(
+            _async_set_relays(coordinators[entry_id], states)
+            for entry_id, states in batches.items()
+        )
+    )
+
+    registry = er.async_get(hass)
+    outcomes: dict[str, Any] = {}
+    for result in results:
+        for device_guid, outcome in result.results.items():
+            outcomes[device_guid] = {
+                "entity_id": registry.async_get_entity_id(
+                    SWITCH_DOMAIN, DOMAIN, device_guid
+                ),
+                "state": outcome.state,
+                "success": outcome.success,
+                "latency": outcome.latency,
+                "error": str(outcome.error) if outcome.error else None,
+            }
+
+    if call.return_response:
+        return {ATTR_RELAYS: outcomes}
+
+    failed = [guid for guid, outcome in outcomes.items() if not outcome["success"]]
+    if failed:
+        raise HomeAssistantError(f"Failed to set relays: {', '.join(failed)}")
+    return None
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services.
+
+    Args:
+        hass: Home Assistant instance
+    """
+
+    async def handle_set_relays(call: ServiceCall) -> ServiceResponse:
+        """Handle the set_relays service call."""
+        return await async_handle_set_relays(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_RELAYS,
+        handle_set_relays,
+        schema=SET_RELAYS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
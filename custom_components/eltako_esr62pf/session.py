@@ -0,0 +1,288 @@
+"""Shared HTTPS connection pools for Eltako ESR62PF-IP integration."""
+from __future__ import annotations
+
+import ipaddress
+import logging
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    CONNECTION_KEEPALIVE_TIMEOUT,
+    CONNECTION_POOL_LIMIT_PER_HOST,
+    DATA_SESSION_POOL,
+    DEFAULT_TIMEOUT,
+    DNS_CACHE_TTL,
+)
+from .rate_limit import RateLimiter
+from .timeouts import PHASE_CONNECT, PHASE_FIRST_BYTE
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _is_ip_address(host: str) -> bool:
+    """Check if a host is a literal IP address.
+
+    Args:
+        host: Host name or IP address
+
+    Returns:
+        True if host is an IPv4 or IPv6 literal, False otherwise
+    """
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+def parse_certificate_fingerprint(value: str) -> bytes:
+    """Parse a SHA-256 certificate fingerprint.
+
+    Accepts the hex digest with or without colon or space separators, and
+    the ``sha256 Fingerprint=...`` line printed by
+    ``openssl x509 -noout -fingerprint -sha256``.
+
+    Args:
+        value: Hex encoded SHA-256 fingerprint
+
+    Returns:
+        Raw 32-byte digest
+
+    Raises:
+        ValueError: If value is not a valid SHA-256 fingerprint
+    """
+    # Drop a "sha256 Fingerprint=" style label
+    hex_digest = value.rsplit("=", 1)[-1]
+    hex_digest = hex_digest.strip().replace(":", "").replace(" ", "")
+
+    try:
+        digest = bytes.fromhex(hex_digest)
+    except ValueError as err:
+        raise ValueError("Fingerprint must be hex encoded") from err
+
+    if len(digest) != 32:
+        raise ValueError("Fingerprint must be a SHA-256 digest (32 bytes)")
+    return digest
+
+
+async def _on_request_start(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceRequestStartParams,
+) -> None:
+    """Remember when a request started."""
+    context.start = time.monotonic()
+
+
+async def _on_connection_create_end(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceConnectionCreateEndParams,
+) -> None:
+    """Record how long opening a new connection took."""
+    timing = context.trace_request_ctx
+    if isinstance(timing, dict) and hasattr(context, "start"):
+        timing[PHASE_CONNECT] = time.monotonic() - context.start
+
+
+async def _on_request_headers_sent(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceRequestHeadersSentParams,
+) -> None:
+    """Remember when the request was sent."""
+    context.sent = time.monotonic()
+
+
+async def _on_request_end(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceRequestEndParams,
+) -> None:
+    """Record how long the device took to start responding."""
+    timing = context.trace_request_ctx
+    if isinstance(timing, dict) and hasattr(context, "sent"):
+        timing[PHASE_FIRST_BYTE] = time.monotonic() - context.sent
+
+
+def create_request_timing_trace() -> aiohttp.TraceConfig:
+    """Create a trace config that measures request phases.
+
+    A dict passed as ``trace_request_ctx`` to a request receives the
+    connect latency (only when a new connection was opened) and the time
+    from sending the request to receiving the response headers.
+
+    Returns:
+        TraceConfig to pass to a ClientSession
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_request_headers_sent.append(_on_request_headers_sent)
+    trace_config.on_request_end.append(_on_request_end)
+    return trace_config
+
+
+def create_session(host: str, timeout: int = DEFAULT_TIMEOUT) -> aiohttp.ClientSession:
+    """Create a client session with a connector tuned for the Eltako gateway.
+
+    Connections are kept alive and reused between requests, so relay commands
+    do not pay for a new TCP and TLS handshake each time. DNS caching is
+    skipped for literal IP addresses, which never need resolving. Request
+    phases are traced for the adaptive timeouts.
+
+    Args:
+        host: Host name or IP address of the device
+        timeout: Default request timeout in seconds
+
+    Returns:
+        New aiohttp ClientSession
+    """
+    use_dns_cache = not _is_ip_address(host)
+    connector = aiohttp.TCPConnector(
+        limit_per_host=CONNECTION_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=CONNECTION_KEEPALIVE_TIMEOUT,
+        use_dns_cache=use_dns_cache,
+        ttl_dns_cache=DNS_CACHE_TTL if use_dns_cache else None,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        trace_configs=[create_request_timing_trace()],
+    )
+
+
+class EltakoSessionPool:
+    """Reference-counted client sessions keyed by device host and port.
+
+    Every config entry aimed at the same host:port shares one session and
+    therefore one pool of keep-alive connections. They also share one rate
+    limiter and one circuit breaker, so the device receives the configured
+    request rate in total and an outage seen by one entry fails all of them
+    fast. The settings of the entry that created them apply until the
+    last entry has released the device.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the pool registry."""
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._ref_counts: dict[str, int] = {}
+        self._rate_limiters: dict[str, RateLimiter] = {}
+        self._circuit_breakers: dict[str, CircuitBreaker] = {}
+
+    @staticmethod
+    def _key(host: str, port: int) -> str:
+        """Build the registry key for a device."""
+        return f"{host}:{port}"
+
+    def acquire(
+        self, host: str, port: int, timeout: int = DEFAULT_TIMEOUT
+    ) -> aiohttp.ClientSession:
+        """Get the shared session for a device, creating it if needed.
+
+        Args:
+            host: Host name or IP address of the device
+            port: Port number of the device
+            timeout: Default request timeout in seconds for a new session
+
+        Returns:
+            Shared aiohttp ClientSession
+        """
+        key = self._key(host, port)
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            _LOGGER.debug("Creating shared connection pool for %s", key)
+            session = self._sessions[key] = create_session(host, timeout)
+            self._ref_counts[key] = 0
+
+        self._ref_counts[key] += 1
+        return session
+
+    def rate_limiter(
+        self, host: str, port: int, rate: float, burst: int
+    ) -> RateLimiter:
+        """Get the shared rate limiter of an acquired device.
+
+        Args:
+            host: Host name or IP address of the device
+            port: Port number of the device
+            rate: Sustained requests per second for a new limiter
+            burst: Bucket capacity for a new limiter
+
+        Returns:
+            Rate limiter shared by all entries of the device
+        """
+        key = self._key(host, port)
+        limiter = self._rate_limiters.get(key)
+        if limiter is None:
+            limiter = self._rate_limiters[key] = RateLimiter(rate=rate, burst=burst)
+        return limiter
+
+    def circuit_breaker(
+        self, host: str, port: int, failure_threshold: int, recovery_timeout: float
+    ) -> CircuitBreaker:
+        """Get the shared circuit breaker of an acquired device.
+
+        Args:
+            host: Host name or IP address of the device
+            port: Port number of the device
+            failure_threshold: Failures in a row before a new breaker opens
+            recovery_timeout: Seconds a new breaker stays open before a probe
+
+        Returns:
+            Circuit breaker shared by all entries of the device
+        """
+        key = self._key(host, port)
+        breaker = self._circuit_breakers.get(key)
+        if breaker is None:
+            breaker = self._circuit_breakers[key] = CircuitBreaker(
+                failure_threshold=failure_threshold,
+                recovery_timeout=recovery_timeout,
+            )
+        return breaker
+
+    async def async_release(self, host: str, port: int) -> None:
+        """Release a reference to a device's session.
+
+        The session is closed once the last reference is released.
+
+        Args:
+            host: Host name or IP address of the device
+            port: Port number of the device
+        """
+        key = self._key(host, port)
+        if key not in self._ref_counts:
+            return
+
+        self._ref_counts[key] -= 1
+        if self._ref_counts[key] > 0:
+            return
+
+        del self._ref_counts[key]
+        self._rate_limiters.pop(key, None)
+        self._circuit_breakers.pop(key, None)
+        session = self._sessions.pop(key)
+        await session.close()
+        _LOGGER.debug("Closed shared connection pool for %s", key)
+
+
+def async_get_session_pool(hass: HomeAssistant) -> EltakoSessionPool:
+    """Get the integration-wide session pool.
+
+    Args:
+        hass: Home Assistant instance
+
+    Returns:
+        Session pool stored in hass.data
+    """
+    pool: EltakoSessionPool | None = hass.data.get(DATA_SESSION_POOL)
+    if pool is None:
+        pool = hass.data[DATA_SESSION_POOL] = EltakoSessionPool()
+    return pool
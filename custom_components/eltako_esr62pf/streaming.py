@@ -0,0 +1,137 @@
+"""Incremental JSON decoding for Eltako ESR62PF-IP integration."""
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_START = "-0123456789"
+# Number characters up to the end of the buffer: a number cut by the chunk
+# boundary, e.g. "2." or "1e", which raw_decode accepts as a shorter number
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+
+# Decoder states inside the top-level array
+_STATE_FIRST = "first"  # after "[": a value or "]"
+_STATE_VALUE = "value"  # after ",": a value
+_STATE_SEPARATOR = "separator"  # after a value: "," or "]"
+_STATE_DONE = "done"  # after "]"
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    """Return the index of the first non-whitespace character from pos."""
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+class JSONArrayStreamDecoder:
+    """Decode the elements of a top-level JSON array as bytes arrive.
+
+    Each element is decoded with the C-accelerated standard decoder once
+    it has fully arrived, and only the undecoded tail of the input is
+    buffered, so memory is bounded by the largest element rather than the
+    whole document. A document that is not an array is buffered and
+    decoded as a whole by ``close``.
+    """
+
+    __slots__ = ("_text_decoder", "_decoder", "_buffer", "_state", "is_array")
+
+    def __init__(self) -> None:
+        """Initialize the decoder."""
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = _STATE_FIRST
+        # None until the first non-whitespace character has been seen
+        self.is_array: bool | None = None
+
+    def feed(self, data: bytes) -> list[Any]:
+        """Add input and decode the array elements it completes.
+
+        Args:
+            data: Next chunk of the UTF-8 encoded document
+
+        Returns:
+            Array elements completed by this chunk, in document order
+
+        Raises:
+            ValueError: If the array is malformed
+        """
+        self._buffer += self._text_decoder.decode(data)
+
+        if self.is_array is None:
+            pos = _skip_whitespace(self._buffer, 0)
+            if pos == len(self._buffer):
+                return []
+            self.is_array = self._buffer[pos] == "["
+            if not self.is_array:
+                return []
+            self._buffer = self._buffer[pos + 1 :]
+
+        if not self.is_array:
+            return []
+        return self._decode_elements()
+
+    def _decode_elements(self) -> list[Any]:
+        """Decode all complete elements at the start of the buffer."""
+        buffer = self._buffer
+        items: list[Any] = []
+        pos = 0
+
+        while self._state != _STATE_DONE:
+            pos = _skip_whitespace(buffer, pos)
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+
+            if self._state == _STATE_SEPARATOR:
+                if char == ",":
+                    self._state = _STATE_VALUE
+                elif char == "]":
+                    self._state = _STATE_DONE
+                else:
+                    raise ValueError(f"Expecting ',' or ']' in JSON array, got {char!r}")
+                pos += 1
+                continue
+
+            if self._state == _STATE_FIRST and char == "]":
+                self._state = _STATE_DONE
+                pos += 1
+                continue
+
+            try:
+                value, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The element has not fully arrived yet
+                break
+            if end == len(buffer) or (
+                char in _NUMBER_START and _NUMBER_TAIL.match(buffer, end)
+            ):
+                # A number may continue in the next chunk
+                break
+            items.append(value)
+            self._state = _STATE_SEPARATOR
+            pos = end
+
+        self._buffer = buffer[pos:]
+        return items
+
+    def close(self) -> Any:
+        """Finish decoding after the last chunk.
+
+        Returns:
+            The decoded document if it was not an array, otherwise None
+
+        Raises:
+            ValueError: If the document is incomplete or malformed
+        """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+
+        if not self.is_array:
+            return json.loads(self._buffer)
+
+        if self._state != _STATE_DONE or self._buffer.strip(_WHITESPACE):
+            raise ValueError("Incomplete or malformed JSON array")
+        return None
@@ -1,6 +1,7 @@
 """Switch platform for Eltako ESR62PF-IP integration."""
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import datetime
 import logging
 from typing import Any
@@ -22,6 +23,7 @@ from .exceptions import (
     EltakoConnectionError,
     EltakoTimeoutError,
 )
+from .models import RelayState
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -65,7 +67,7 @@ class EltakoSwitchEntity(
         self,
         coordinator: EltakoDataUpdateCoordinator,
         device_guid: str,
-        device_data: dict[str, Any],
+        device_data: RelayState,
     ) -> None:
         """Initialize the switch entity.
 
@@ -74,12 +76,14 @@ class EltakoSwitchEntity(
             device_guid: Unique GUID of the device
             device_data: Device data from coordinator
         """
-        super().__init__(coordinator)
+        # The GUID context makes the coordinator wake this entity only for
+        # changes of its own relay
+        super().__init__(coordinator, context=device_guid)
         self._device_guid = device_guid
         self._attr_unique_id = device_guid
 
         # Generate entity name from device data
-        device_name = device_data.get("name", f"Relay {device_guid[:8]}")
+        device_name = device_data.name or f"Relay {device_guid[:8]}"
         self._attr_name = device_name
 
         # Create suggested object_id for entity registry
@@ -107,13 +111,19 @@ class EltakoSwitchEntity(
                 last_state.state,
             )
 
-            # Restore the state in coordinator data
-            if self._device_guid in self.coordinator._devices:
+            # Restore the state in coordinator data, unless the device
+            # already reported its current state
+            entry = self.coordinator._devices.get(self._device_guid)
+            if entry is not None and entry.state is None:
                 # Convert "on"/"off" state to relay state constant
                 if last_state.state == "on":
-                    self.coordinator._devices[self._device_guid]["state"] = RELAY_STATE_ON
+                    self.coordinator._devices[self._device_guid] = replace(
+                        entry, state=RELAY_STATE_ON
+                    )
                 elif last_state.state == "off":
-                    self.coordinator._devices[self._device_guid]["state"] = RELAY_STATE_OFF
+                    self.coordinator._devices[self._device_guid] = replace(
+                        entry, state=RELAY_STATE_OFF
+                    )
 
                 _LOGGER.debug(
                     "Restored state for %s to %s",
@@ -150,11 +160,10 @@ class EltakoSwitchEntity(
         if not device_data:
             return None
 
-        state = device_data.get("state")
-        if state is None:
+        if device_data.state is None:
             return None
 
-        return state == RELAY_STATE_ON
+        return device_data.state == RELAY_STATE_ON
 
     @property
     def available(self) -> bool:
@@ -175,7 +184,7 @@ class EltakoSwitchEntity(
         if not device_data:
             return False
 
-        return device_data.get("available", False)
+        return device_data.available
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -188,6 +197,7 @@ class EltakoSwitchEntity(
             "device_guid": self._device_guid,
             "connection_status": "connected" if self.available else "disconnected",
             "consecutive_failures": self.coordinator.consecutive_failures,
+            "circuit_state": self.coordinator.circuit_state,
         }
 
         # Add last updated timestamp if available
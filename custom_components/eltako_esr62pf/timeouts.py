@@ -0,0 +1,180 @@
+"""Adaptive request timeouts for Eltako ESR62PF-IP integration."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import aiohttp
+
+from .const import (
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+    ADAPTIVE_TIMEOUT_MULTIPLIER,
+    ADAPTIVE_TIMEOUT_PERCENTILE,
+    CONNECT_TIMEOUT_CEILING,
+    CONNECT_TIMEOUT_FLOOR,
+    DEFAULT_TIMEOUT,
+    FIRST_BYTE_TIMEOUT_FLOOR,
+    TOTAL_TIMEOUT_FLOOR,
+)
+from .latency import LatencyTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+# Request phases with separately learned timeouts
+PHASE_CONNECT = "connect"
+PHASE_FIRST_BYTE = "first_byte"
+PHASE_TOTAL = "total"
+
+
+class AdaptiveTimeouts:
+    """Per-endpoint request timeouts learned from observed latencies.
+
+    For every endpoint, connect, first-byte and total latencies are kept in
+    rolling windows. Once enough samples exist, each timeout is the
+    ADAPTIVE_TIMEOUT_PERCENTILE latency times ADAPTIVE_TIMEOUT_MULTIPLIER,
+    bounded by its floor and ceiling. Until then the ceiling is used, so a
+    device that has not been observed yet gets the conservative timeouts.
+
+    Only successful requests produce samples, so a timeout discards the
+    endpoint's samples: its requests fall back to the ceiling and relearn,
+    instead of timing out forever once the device's latency rises above
+    the learned timeout.
+    """
+
+    def __init__(
+        self,
+        connect_floor: float = CONNECT_TIMEOUT_FLOOR,
+        connect_ceiling: float = CONNECT_TIMEOUT_CEILING,
+        first_byte_floor: float = FIRST_BYTE_TIMEOUT_FLOOR,
+        first_byte_ceiling: float = DEFAULT_TIMEOUT,
+        total_floor: float = TOTAL_TIMEOUT_FLOOR,
+        total_ceiling: float = DEFAULT_TIMEOUT,
+        min_samples: int = ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+    ) -> None:
+        """Initialize the timeouts.
+
+        Args:
+            connect_floor: Minimum connect timeout in seconds
+            connect_ceiling: Maximum connect timeout in seconds
+            first_byte_floor: Minimum time to wait for the response in seconds
+            first_byte_ceiling: Maximum time to wait for the response in seconds
+            total_floor: Minimum total request timeout in seconds
+            total_ceiling: Maximum total request timeout in seconds
+            min_samples: Samples needed before a timeout adapts
+
+        Raises:
+            ValueError: If a floor is above its ceiling
+        """
+        self._bounds = {
+            PHASE_CONNECT: (connect_floor, connect_ceiling),
+            PHASE_FIRST_BYTE: (first_byte_floor, first_byte_ceiling),
+            PHASE_TOTAL: (total_floor, total_ceiling),
+        }
+        for phase, (floor, ceiling) in self._bounds.items():
+            if floor > ceiling:
+                raise ValueError(f"{phase} timeout floor must not exceed its ceiling")
+
+        self._min_samples = min_samples
+        self._latencies: dict[str, dict[str, LatencyTracker]] = {}
+
+    def _trackers(self, endpoint: str) -> dict[str, LatencyTracker]:
+        """Get or create the latency trackers of an endpoint.
+
+        Args:
+            endpoint: Endpoint template, e.g. ENDPOINT_RELAY
+
+        Returns:
+            Latency tracker per request phase
+        """
+        trackers = self._latencies.get(endpoint)
+        if trackers is None:
+            trackers = self._latencies[endpoint] = {
+                phase: LatencyTracker() for phase in self._bounds
+            }
+        return trackers
+
+    def record(self, endpoint: str, timing: dict[str, float]) -> None:
+        """Record the phase latencies of a successful request.
+
+        Args:
+            endpoint: Endpoint template, e.g. ENDPOINT_RELAY
+            timing: Latency in seconds per phase; phases that were not
+                observed, e.g. connect on a reused connection, are omitted
+        """
+        trackers = self._trackers(endpoint)
+        for phase, latency in timing.items():
+            if phase in trackers:
+                trackers[phase].record(latency)
+
+    def record_timeout(self, endpoint: str) -> None:
+        """Record a request that timed out.
+
+        Args:
+            endpoint: Endpoint template, e.g. ENDPOINT_RELAY
+        """
+        if self._latencies.pop(endpoint, None) is not None:
+            _LOGGER.debug(
+                "Request to %s timed out, relearning its timeouts", endpoint
+            )
+
+    def get_timeout(self, endpoint: str, phase: str) -> float:
+        """Get the current timeout of a request phase.
+
+        Args:
+            endpoint: Endpoint template, e.g. ENDPOINT_RELAY
+            phase: PHASE_CONNECT, PHASE_FIRST_BYTE or PHASE_TOTAL
+
+        Returns:
+            Timeout in seconds
+        """
+        floor, ceiling = self._bounds[phase]
+        tracker = self._latencies.get(endpoint, {}).get(phase)
+        if tracker is None or len(tracker) < self._min_samples:
+            return ceiling
+
+        latency = tracker.percentile(ADAPTIVE_TIMEOUT_PERCENTILE)
+        return min(ceiling, max(floor, latency * ADAPTIVE_TIMEOUT_MULTIPLIER))
+
+    def client_timeout(
+        self,
+        endpoint: str,
+        remaining: float | None = None,
+        learned: bool = True,
+    ) -> aiohttp.ClientTimeout:
+        """Build the aiohttp timeout for a request.
+
+        Args:
+            endpoint: Endpoint template, e.g. ENDPOINT_RELAY
+            remaining: Optional time left until the call's deadline, which
+                caps the total timeout
+            learned: Whether to use the learned timeouts; False uses the
+                ceilings, e.g. for a probe of a device that stopped answering
+
+        Returns:
+            ClientTimeout with total, sock_connect and sock_read set
+        """
+        timeouts = {
+            phase: self.get_timeout(endpoint, phase) if learned else ceiling
+            for phase, (_, ceiling) in self._bounds.items()
+        }
+        total = timeouts[PHASE_TOTAL]
+        if remaining is not None:
+            total = min(total, remaining)
+        return aiohttp.ClientTimeout(
+            total=total,
+            sock_connect=timeouts[PHASE_CONNECT],
+            sock_read=timeouts[PHASE_FIRST_BYTE],
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return current timeouts and latencies per endpoint."""
+        return {
+            endpoint: {
+                phase: {
+                    "timeout": self.get_timeout(endpoint, phase),
+                    **tracker.as_dict(),
+                }
+                for phase, tracker in trackers.items()
+            }
+            for endpoint, trackers in self._latencies.items()
+        }
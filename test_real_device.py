@@ -14,7 +14,6 @@ import argparse
 import asyncio
 import logging
 import sys
-from typing import Any
 
 # Add the custom_components path to allow importing the API client
 sys.path.insert(0, "/Users/tine2k/Documents/git/eltako62pf-hass")
@@ -27,6 +26,7 @@ from custom_components.eltako_esr62pf.exceptions import (
     EltakoConnectionError,
     EltakoTimeoutError,
 )
+from custom_components.eltako_esr62pf.models import EltakoDevice
 
 # Configure logging
 logging.basicConfig(
@@ -119,7 +119,7 @@ async def test_authentication(api: EltakoAPI, results: TestResult) -> None:
         results.add_fail(test_name, f"Unexpected error: {err}")
 
 
-async def test_get_devices(api: EltakoAPI, results: TestResult) -> list[dict[str, Any]]:
+async def test_get_devices(api: EltakoAPI, results: TestResult) -> list[EltakoDevice]:
     """Test fetching device list.
 
     Args:
@@ -136,9 +136,7 @@ async def test_get_devices(api: EltakoAPI, results: TestResult) -> list[dict[str
 
         logger.info("Found %d devices:", len(devices))
         for i, device in enumerate(devices, 1):
-            guid = device.get("guid", "N/A")
-            name = device.get("name", "Unnamed")
-            logger.info("  %d. %s (GUID: %s)", i, name, guid)
+            logger.info("  %d. %s (GUID: %s)", i, device.name, device.guid)
 
         if devices:
             results.add_pass(test_name)
@@ -183,7 +181,7 @@ async def test_device_cache(api: EltakoAPI, results: TestResult) -> None:
 
 
 async def test_relay_control(
-    api: EltakoAPI, devices: list[dict[str, Any]], results: TestResult, interactive: bool
+    api: EltakoAPI, devices: list[EltakoDevice], results: TestResult, interactive: bool
 ) -> None:
     """Test relay control (optional, requires user confirmation).
 
@@ -202,8 +200,8 @@ async def test_relay_control(
         return
 
     test_device = devices[0]
-    device_guid = test_device.get("guid")
-    device_name = test_device.get("name", "Unnamed")
+    device_guid = test_device.guid
+    device_name = test_device.name
 
     print(f"\n{'=' * 60}")
     print("INTERACTIVE RELAY CONTROL TEST")
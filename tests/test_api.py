@@ -1,31 +1,52 @@
 """Tests for Eltako API client."""
 import asyncio
+import json
+import re
 import ssl
 import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp
 import pytest
-from aioresponses import aioresponses
+from aioresponses import CallbackResult, aioresponses
+from yarl import URL
+from homeassistant.util.ssl import client_context_no_verify
 
 from custom_components.eltako_esr62pf.api import EltakoAPI
+from custom_components.eltako_esr62pf.circuit_breaker import CircuitBreaker
 from custom_components.eltako_esr62pf.const import (
     API_TOKEN_TTL,
+    CIRCUIT_STATE_CLOSED,
+    CIRCUIT_STATE_HALF_OPEN,
+    CIRCUIT_STATE_OPEN,
+    DEFAULT_MAX_CONCURRENT_RELAY_COMMANDS,
     DEFAULT_PORT,
     DEVICE_CACHE_TTL,
+    DEVICE_LIST_STREAM_THRESHOLD,
     ENDPOINT_DEVICES,
     ENDPOINT_LOGIN,
     ENDPOINT_RELAY,
+    HEDGE_MAX_DELAY,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    LATENCY_WINDOW,
     RELAY_STATE_OFF,
     RELAY_STATE_ON,
 )
 from custom_components.eltako_esr62pf.exceptions import (
     EltakoAPIError,
     EltakoAuthenticationError,
+    EltakoCircuitOpenError,
     EltakoConnectionError,
     EltakoInvalidDeviceError,
     EltakoTimeoutError,
 )
+from custom_components.eltako_esr62pf.models import EltakoDevice
+from custom_components.eltako_esr62pf.rate_limit import RateLimiter
+from custom_components.eltako_esr62pf.retry import RetryBudget, RetryPolicy
+from custom_components.eltako_esr62pf.serializer import JSONSerializer
+from custom_components.eltako_esr62pf.streaming import JSONArrayStreamDecoder
+from custom_components.eltako_esr62pf.timeouts import PHASE_TOTAL, AdaptiveTimeouts
 
 
 @pytest.fixture
@@ -92,6 +113,43 @@ class TestEltakoAPIInit:
         assert ssl_context.verify_mode == ssl.CERT_NONE
         assert ssl_context.check_hostname is False
 
+    def test_ssl_context_cached(self, api_client):
+        """Test that the SSL context is built once per client."""
+        with patch(
+            "custom_components.eltako_esr62pf.api.client_context_no_verify",
+            wraps=client_context_no_verify,
+        ) as mock_context:
+            first = api_client._get_ssl_context()
+            second = api_client._get_ssl_context()
+
+        assert first is second
+        assert mock_context.call_count == 1
+
+    def test_ssl_context_with_pinned_fingerprint(self):
+        """Test that a pinned fingerprint replaces the no-verify context."""
+        fingerprint = ":".join(["ab"] * 32)
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop",
+            verify_ssl=False,
+            cert_fingerprint=fingerprint,
+        )
+
+        ssl_context = client._get_ssl_context()
+
+        assert isinstance(ssl_context, aiohttp.Fingerprint)
+        assert ssl_context.fingerprint == bytes.fromhex("ab" * 32)
+        assert client._get_ssl_context() is ssl_context
+
+    def test_invalid_fingerprint_rejected(self):
+        """Test that an invalid fingerprint is rejected on init."""
+        with pytest.raises(ValueError):
+            EltakoAPI(
+                ip_address="192.168.1.100",
+                pop_credential="test_pop",
+                cert_fingerprint="not-a-fingerprint",
+            )
+
     def test_base_url(self, api_client):
         """Test base URL generation."""
         assert api_client.base_url == "https://192.168.1.100:443"
@@ -213,6 +271,20 @@ class TestLogin:
             with pytest.raises(EltakoConnectionError, match="Cannot reach Eltako device"):
                 await api_client.async_login()
 
+    @pytest.mark.asyncio
+    async def test_async_login_fingerprint_mismatch(self, api_client):
+        """Test login with a certificate that does not match the pin."""
+        with aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{api_client.base_url}{ENDPOINT_LOGIN}",
+                exception=aiohttp.ServerFingerprintMismatch(
+                    expected=b"a" * 32, got=b"b" * 32, host="192.168.1.100", port=443
+                ),
+            )
+
+            with pytest.raises(EltakoConnectionError, match="pinned fingerprint"):
+                await api_client.async_login()
+
     @pytest.mark.asyncio
     async def test_async_login_timeout(self, api_client):
         """Test login with timeout."""
@@ -295,6 +367,122 @@ class TestEnsureValidToken:
             assert api_client._api_key == "concurrent_token"
 
 
+class TestBackgroundTokenRefresh:
+    """Test proactive background token refresh."""
+
+    def test_invalid_refresh_fraction(self):
+        """Test that refresh fractions outside (0, 1) are rejected."""
+        for fraction in (0, 1, 1.5):
+            with pytest.raises(ValueError):
+                EltakoAPI(
+                    ip_address="192.168.1.100",
+                    pop_credential="test_pop",
+                    token_refresh_fraction=fraction,
+                )
+
+    @pytest.mark.asyncio
+    async def test_refresh_disabled_by_default(self, api_client):
+        """Test that no refresh is scheduled unless enabled."""
+        with aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{api_client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "test_key"},
+                status=200,
+            )
+            await api_client.async_login()
+
+        assert api_client._token_refresh_handle is None
+
+    @pytest.mark.asyncio
+    async def test_refresh_scheduled_before_expiry(self):
+        """Test that login schedules a refresh at a jittered TTL fraction."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop",
+            token_refresh_fraction=0.5,
+        )
+        loop = asyncio.get_running_loop()
+
+        with aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "test_key"},
+                status=200,
+            )
+            await client.async_login()
+
+        delay = client._token_refresh_handle.when() - loop.time()
+        assert API_TOKEN_TTL * 0.5 * 0.9 - 1 <= delay <= API_TOKEN_TTL * 0.5
+
+        await client.async_close()
+        assert client._token_refresh_handle is None
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_renews_token(self):
+        """Test that the background refresh replaces the API key."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop",
+            token_refresh_fraction=0.5,
+        )
+
+        with patch(
+            "custom_components.eltako_esr62pf.api.API_TOKEN_TTL", 0.02
+        ), aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "first_key"},
+                status=200,
+            )
+            mock_resp.post(
+                f"{client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "refreshed_key"},
+                status=200,
+            )
+
+            await client.async_login()
+            assert client._api_key == "first_key"
+
+            await asyncio.sleep(0.05)
+
+            assert client._api_key == "refreshed_key"
+
+        await client.async_close()
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_failure_keeps_token(self):
+        """Test that a failed refresh leaves the current key for lazy refresh."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop",
+            token_refresh_fraction=0.5,
+        )
+
+        with patch(
+            "custom_components.eltako_esr62pf.api.API_TOKEN_TTL", 0.02
+        ), aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "first_key"},
+                status=200,
+            )
+            mock_resp.post(
+                f"{client.base_url}{ENDPOINT_LOGIN}",
+                exception=asyncio.TimeoutError(),
+            )
+
+            await client.async_login()
+            timestamp = client._token_timestamp
+
+            await asyncio.sleep(0.05)
+
+            assert client._api_key == "first_key"
+            assert client._token_timestamp == timestamp
+            assert client._token_refresh_task.done()
+
+        await client.async_close()
+
+
 class TestMakeRequest:
     """Test generic API request functionality."""
 
@@ -351,6 +539,69 @@ class TestMakeRequest:
             assert result == {"result": "success"}
             assert api_client._api_key == "new_token_after_401"
 
+    @pytest.mark.asyncio
+    async def test_make_request_concurrent_401_single_login(self, api_client):
+        """Test that concurrent 401 responses trigger only one login."""
+        api_client._api_key = "expired_token"
+        api_client._token_timestamp = time.time()
+
+        with aioresponses() as mock_resp:
+            for _ in range(3):
+                mock_resp.get(f"{api_client.base_url}/test", status=401)
+            mock_resp.post(
+                f"{api_client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "new_token"},
+                status=200,
+            )
+            for _ in range(3):
+                mock_resp.get(
+                    f"{api_client.base_url}/test",
+                    payload={"result": "success"},
+                    status=200,
+                )
+
+            results = await asyncio.gather(
+                *(api_client._make_request("GET", "/test") for _ in range(3))
+            )
+
+            login_calls = mock_resp.requests[
+                ("POST", URL(f"{api_client.base_url}{ENDPOINT_LOGIN}"))
+            ]
+
+        assert results == [{"result": "success"}] * 3
+        assert len(login_calls) == 1
+        assert api_client._api_key == "new_token"
+        assert api_client.get_stats()["auth"] == {"logins": 1, "logins_avoided": 2}
+
+    @pytest.mark.asyncio
+    async def test_make_request_401_with_stale_token_reuses_new_token(
+        self, api_client
+    ):
+        """Test that a 401 for an already replaced token skips the login."""
+        api_client._api_key = "new_token"
+        api_client._token_timestamp = time.time()
+
+        # The request was sent with a token that has since been replaced
+        await api_client._async_login_once("old_token")
+
+        assert api_client._api_key == "new_token"
+        assert api_client.get_stats()["auth"]["logins_avoided"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_login_failure_shared(self, api_client):
+        """Test that waiters share the outcome of a failed login."""
+        with aioresponses() as mock_resp:
+            mock_resp.post(f"{api_client.base_url}{ENDPOINT_LOGIN}", status=401)
+
+            results = await asyncio.gather(
+                api_client._ensure_valid_token(),
+                api_client._ensure_valid_token(),
+                return_exceptions=True,
+            )
+
+        assert all(isinstance(result, EltakoAuthenticationError) for result in results)
+        assert api_client._login_task is None
+
     @pytest.mark.asyncio
     async def test_make_request_204_no_content(self, api_client):
         """Test handling of 204 No Content response."""
@@ -396,9 +647,14 @@ class TestMakeRequest:
                 status=200,
             )
 
-            start_time = time.time()
-            result = await api_client._make_request("GET", "/test")
-            elapsed = time.time() - start_time
+            # Pin the full-jitter backoff to its ceiling
+            with patch(
+                "custom_components.eltako_esr62pf.retry.random.uniform",
+                side_effect=lambda low, high: high,
+            ):
+                start_time = time.time()
+                result = await api_client._make_request("GET", "/test")
+                elapsed = time.time() - start_time
 
             assert result == {"result": "success"}
             # Should have waited: 2^0 + 2^1 = 1 + 2 = 3 seconds
@@ -447,6 +703,95 @@ class TestMakeRequest:
 
             assert result == {"result": "success"}
 
+    @pytest.mark.asyncio
+    async def test_make_request_server_disconnect_retry(self, api_client):
+        """Test that a kept-alive connection closed by the device is retried."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(
+                f"{api_client.base_url}/test",
+                exception=aiohttp.ServerDisconnectedError(),
+            )
+            mock_resp.get(
+                f"{api_client.base_url}/test",
+                payload={"result": "success"},
+                status=200,
+            )
+
+            with patch(
+                "custom_components.eltako_esr62pf.retry.random.uniform",
+                return_value=0,
+            ):
+                result = await api_client._make_request("GET", "/test")
+
+        assert result == {"result": "success"}
+        assert api_client.get_stats()["retries"]["connect"] == 1
+
+    @pytest.mark.asyncio
+    async def test_make_request_deadline_stops_retries(self):
+        """Test that no retry is made when its backoff would pass the deadline."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            retry_policy=RetryPolicy(deadline=0.5, backoff_initial=1, backoff_max=1),
+        )
+        client._api_key = "valid_token"
+        client._token_timestamp = time.time()
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(
+                f"{client.base_url}/test",
+                exception=asyncio.TimeoutError(),
+            )
+
+            with patch(
+                "custom_components.eltako_esr62pf.retry.random.uniform",
+                side_effect=lambda low, high: high,
+            ):
+                with pytest.raises(EltakoTimeoutError):
+                    await client._make_request("GET", "/test")
+
+            assert len(mock_resp.requests[("GET", URL(f"{client.base_url}/test"))]) == 1
+
+        retries = client.get_stats()["retries"]
+        assert retries["timeout"] == 0
+        assert retries["deadline_exceeded"] == 1
+        await client.async_close()
+
+    @pytest.mark.asyncio
+    async def test_make_request_retry_budget_exhausted(self, api_client):
+        """Test that an empty retry budget fails calls after one attempt."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+        api_client._retry_budget = RetryBudget(capacity=1, refill_rate=0)
+
+        with aioresponses() as mock_resp:
+            for _ in range(3):
+                mock_resp.get(
+                    f"{api_client.base_url}/test",
+                    exception=aiohttp.ClientConnectorError(
+                        connection_key=MagicMock(),
+                        os_error=OSError("Connection refused"),
+                    ),
+                )
+
+            with patch(
+                "custom_components.eltako_esr62pf.retry.random.uniform",
+                return_value=0,
+            ):
+                with pytest.raises(EltakoConnectionError):
+                    await api_client._make_request("GET", "/test")
+                with pytest.raises(EltakoConnectionError):
+                    await api_client._make_request("GET", "/test")
+
+        retries = api_client.get_stats()["retries"]
+        # One retry for the first call, none for the second
+        assert retries["connect"] == 1
+        assert retries["budget"]["denied"] == 2
+
     @pytest.mark.asyncio
     async def test_make_request_api_error(self, api_client):
         """Test handling of API errors."""
@@ -464,100 +809,612 @@ class TestMakeRequest:
                 await api_client._make_request("GET", "/test")
 
 
-class TestContextManager:
-    """Test async context manager functionality."""
+class TestCircuitBreaker:
+    """Test failing fast while the device is unreachable."""
 
-    @pytest.mark.asyncio
-    async def test_context_manager(self):
-        """Test using API client as context manager."""
-        async with EltakoAPI(
-            ip_address="192.168.1.100",
-            pop_credential="test_pop",
-        ) as client:
-            assert client is not None
-            assert isinstance(client, EltakoAPI)
+    @staticmethod
+    def _connection_refused():
+        """Build a connection refused error."""
+        return aiohttp.ClientConnectorError(
+            connection_key=MagicMock(),
+            os_error=OSError("Connection refused"),
+        )
 
     @pytest.mark.asyncio
-    async def test_context_manager_closes_session(self):
-        """Test that context manager closes session on exit."""
+    async def test_open_circuit_fails_fast(self):
+        """Test that an open breaker rejects requests without network I/O."""
         client = EltakoAPI(
             ip_address="192.168.1.100",
-            pop_credential="test_pop",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            retry_policy=RetryPolicy(connect_retries=0),
+            circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=30),
         )
+        client._api_key = "valid_token"
+        client._token_timestamp = time.time()
+        url = f"{client.base_url}/test"
 
-        async with client:
-            # Create session
-            await client._get_session()
-            assert client._session is not None
+        with aioresponses() as mock_resp:
+            for _ in range(2):
+                mock_resp.get(url, exception=self._connection_refused())
+                with pytest.raises(EltakoConnectionError):
+                    await client._make_request("GET", "/test")
 
-        # Session should be closed
-        assert client._session is None
+            assert client.circuit_state == CIRCUIT_STATE_OPEN
 
+            with pytest.raises(EltakoCircuitOpenError):
+                await client._make_request("GET", "/test")
+            with pytest.raises(EltakoCircuitOpenError):
+                await client.async_set_relay("device-1", RELAY_STATE_ON)
 
-class TestSessionManagement:
-    """Test session management."""
+            assert len(mock_resp.requests[("GET", URL(url))]) == 2
+            assert all(method == "GET" for method, _ in mock_resp.requests)
 
-    @pytest.mark.asyncio
-    async def test_get_session_creates_session(self, api_client):
-        """Test that get_session creates a session if needed."""
-        assert api_client._session is None
-        session = await api_client._get_session()
-        assert session is not None
-        assert isinstance(session, aiohttp.ClientSession)
+        assert client.get_stats()["circuit_breaker"]["rejected"] == 2
+        await client.async_close()
 
     @pytest.mark.asyncio
-    async def test_get_session_reuses_session(self, api_client):
-        """Test that get_session reuses existing session."""
-        session1 = await api_client._get_session()
-        session2 = await api_client._get_session()
-        assert session1 is session2
+    async def test_half_open_probe_closes_circuit(self):
+        """Test that a successful probe after the recovery timeout closes the breaker."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            retry_policy=RetryPolicy(connect_retries=0),
+            circuit_breaker=breaker,
+        )
+        client._api_key = "valid_token"
+        client._token_timestamp = time.time()
+        url = f"{client.base_url}/test"
 
-    @pytest.mark.asyncio
-    async def test_async_close(self, api_client):
-        """Test closing the API client."""
-        await api_client._get_session()
-        assert api_client._session is not None
+        with aioresponses() as mock_resp:
+            mock_resp.get(url, exception=self._connection_refused())
+            with pytest.raises(EltakoConnectionError):
+                await client._make_request("GET", "/test")
+            assert client.circuit_state == CIRCUIT_STATE_OPEN
 
-        await api_client.async_close()
+            await asyncio.sleep(0.06)
+            assert client.circuit_state == CIRCUIT_STATE_HALF_OPEN
 
-        assert api_client._session is None
+            mock_resp.get(url, payload={"result": "success"}, status=200)
+            assert await client._make_request("GET", "/test") == {"result": "success"}
+
+        assert client.circuit_state == CIRCUIT_STATE_CLOSED
+        await client.async_close()
 
     @pytest.mark.asyncio
-    async def test_external_session_not_closed(self):
-        """Test that externally provided session is not closed."""
-        external_session = aiohttp.ClientSession()
-        client = EltakoAPI(
-            ip_address="192.168.1.100",
-            pop_credential="test_pop",
-            session=external_session,
+    async def test_half_open_probe_is_not_retried(self, api_client):
+        """Test that the probe request makes a single attempt."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+        api_client._circuit_breaker = CircuitBreaker(
+            failure_threshold=1, recovery_timeout=0
         )
+        api_client._circuit_breaker.record_failure()
+        url = f"{api_client.base_url}/test"
 
-        await client.async_close()
+        with aioresponses() as mock_resp:
+            for _ in range(4):
+                mock_resp.get(url, exception=self._connection_refused())
 
-        # External session should still be open
-        assert not external_session.closed
-        await external_session.close()
+            with pytest.raises(EltakoConnectionError):
+                await api_client._make_request("GET", "/test")
 
+            assert len(mock_resp.requests[("GET", URL(url))]) == 1
 
-class TestCredentialSecurity:
-    """Test that credentials are not logged."""
+        assert api_client.get_stats()["retries"]["connect"] == 0
 
     @pytest.mark.asyncio
-    async def test_no_credentials_in_logs(self, api_client, caplog):
-        """Test that credentials are not logged."""
+    async def test_client_error_does_not_open_circuit(self, api_client):
+        """Test that 4xx responses from a reachable device are not failures."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+        api_client._circuit_breaker = CircuitBreaker(failure_threshold=1)
+
         with aioresponses() as mock_resp:
-            mock_resp.post(
-                f"{api_client.base_url}{ENDPOINT_LOGIN}",
-                payload={"apiKey": "test_key"},
-                status=200,
-            )
+            mock_resp.get(f"{api_client.base_url}/test", status=404, body="Error")
 
-            await api_client.async_login()
+            with pytest.raises(EltakoAPIError):
+                await api_client._make_request("GET", "/test")
 
-            # Check that sensitive data is not in logs
-            log_output = caplog.text
-            assert "test_pop_credential" not in log_output
-            assert "test_key" not in log_output
+        assert api_client.circuit_state == CIRCUIT_STATE_CLOSED
+
+    @pytest.mark.asyncio
+    async def test_server_error_opens_circuit(self, api_client):
+        """Test that 5xx responses count as device failures."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+        api_client._circuit_breaker = CircuitBreaker(failure_threshold=1)
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(f"{api_client.base_url}/test", status=500, body="Error")
+
+            with pytest.raises(EltakoAPIError) as err:
+                await api_client._make_request("GET", "/test")
+
+        assert err.value.status == 500
+        assert api_client.circuit_state == CIRCUIT_STATE_OPEN
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_mismatch_does_not_open_circuit(self, api_client):
+        """Test that a pinned certificate mismatch is not a device failure."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+        api_client._circuit_breaker = CircuitBreaker(failure_threshold=1)
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(
+                f"{api_client.base_url}/test",
+                exception=aiohttp.ServerFingerprintMismatch(
+                    expected=b"a" * 32, got=b"b" * 32, host="192.168.1.100", port=443
+                ),
+            )
+
+            with pytest.raises(EltakoConnectionError):
+                await api_client._make_request("GET", "/test")
+
+        assert api_client.circuit_state == CIRCUIT_STATE_CLOSED
+        assert api_client.get_stats()["circuit_breaker"]["consecutive_failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_local_deadline_does_not_open_circuit(self, api_client):
+        """Test that a deadline expiring in a local queue is not a device failure."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+        api_client._circuit_breaker = CircuitBreaker(failure_threshold=1)
+        api_client._retry_policy = RetryPolicy(deadline=0.01)
+
+        async def slow_acquire(_limiter):
+            await asyncio.sleep(0.02)
+
+        with patch.object(
+            RateLimiter, "async_acquire", autospec=True, side_effect=slow_acquire
+        ):
+            with pytest.raises(EltakoTimeoutError):
+                await api_client._make_request("GET", "/test")
+
+        assert api_client.circuit_state == CIRCUIT_STATE_CLOSED
+
+
+class TestRelayHedging:
+    """Test hedging of slow relay commands."""
+
+    @staticmethod
+    def _make_request_with_latencies(*latencies):
+        """Build a _make_request replacement answering after the given delays."""
+        calls = []
+
+        async def make_request(
+            method, endpoint, dispatched=None, request_timing=None, **kwargs
+        ):
+            latency = latencies[len(calls)]
+            calls.append((method, endpoint))
+            if dispatched is not None:
+                dispatched.set()
+            await asyncio.sleep(latency)
+            if request_timing is not None:
+                request_timing[PHASE_TOTAL] = latency
+            return {"latency": latency}
+
+        return make_request, calls
+
+    @pytest.mark.asyncio
+    async def test_hedging_disabled_by_default(self, api_client):
+        """Test that slow relay commands are not hedged unless enabled."""
+        make_request, calls = self._make_request_with_latencies(0.05)
+
+        with patch.object(api_client, "_make_request", side_effect=make_request), \
+                patch.object(api_client, "_hedge_delay", return_value=0.01):
+            await api_client.async_set_relay("device-1", RELAY_STATE_ON)
+
+        assert len(calls) == 1
+        assert api_client.get_stats()["hedging"]["hedged"] == 0
+        assert api_client.get_stats()["relay_latency"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_command_hedged_and_hedge_wins(self):
+        """Test that a hedge request is sent and the faster answer wins."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            hedge_relay_commands=True,
+        )
+        make_request, calls = self._make_request_with_latencies(10, 0.01)
+
+        with patch.object(client, "_make_request", side_effect=make_request), \
+                patch.object(client, "_hedge_delay", return_value=0.02):
+            start = time.monotonic()
+            await client.async_set_relay("device-1", RELAY_STATE_ON)
+            elapsed = time.monotonic() - start
+
+        assert len(calls) == 2
+        assert calls[0] == calls[1]
+        assert elapsed < 1
+        hedging = client.get_stats()["hedging"]
+        assert hedging["hedged"] == 1
+        assert hedging["hedge_wins"] == 1
+        assert hedging["hedge_rate"] == 1.0
+        await client.async_close()
+
+    @pytest.mark.asyncio
+    async def test_fast_command_not_hedged(self):
+        """Test that a command answered within the hedge delay is sent once."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            hedge_relay_commands=True,
+        )
+        make_request, calls = self._make_request_with_latencies(0.01)
+
+        with patch.object(client, "_make_request", side_effect=make_request), \
+                patch.object(client, "_hedge_delay", return_value=0.5):
+            await client.async_set_relay("device-1", RELAY_STATE_ON)
+
+        assert len(calls) == 1
+        assert client.get_stats()["hedging"]["hedged"] == 0
+        await client.async_close()
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_waits_for_primary(self):
+        """Test that the primary request can still win if the hedge fails."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            hedge_relay_commands=True,
+        )
+        calls = 0
+
+        async def make_request(
+            method, endpoint, dispatched=None, request_timing=None, **kwargs
+        ):
+            nonlocal calls
+            calls += 1
+            dispatched.set()
+            if calls == 2:
+                raise EltakoConnectionError("hedge failed")
+            await asyncio.sleep(0.05)
+            request_timing[PHASE_TOTAL] = 0.05
+            return {}
+
+        with patch.object(client, "_make_request", side_effect=make_request), \
+                patch.object(client, "_hedge_delay", return_value=0.01):
+            await client.async_set_relay("device-1", RELAY_STATE_ON)
+
+        hedging = client.get_stats()["hedging"]
+        assert hedging["hedged"] == 1
+        assert hedging["hedge_wins"] == 0
+        await client.async_close()
+
+    @pytest.mark.asyncio
+    async def test_queued_command_not_hedged(self):
+        """Test that the hedge delay starts once the command is dispatched."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            hedge_relay_commands=True,
+        )
+        calls = 0
+
+        async def make_request(
+            method, endpoint, dispatched=None, request_timing=None, **kwargs
+        ):
+            nonlocal calls
+            calls += 1
+            # Waiting in the local queues before the request is sent
+            await asyncio.sleep(0.05)
+            dispatched.set()
+            await asyncio.sleep(0.01)
+            request_timing[PHASE_TOTAL] = 0.01
+            return {}
+
+        with patch.object(client, "_make_request", side_effect=make_request), \
+                patch.object(client, "_hedge_delay", return_value=0.02):
+            await client.async_set_relay("device-1", RELAY_STATE_ON)
+
+        assert calls == 1
+        assert client.get_stats()["hedging"]["hedged"] == 0
+        await client.async_close()
+
+    @pytest.mark.asyncio
+    async def test_latency_excludes_queue_wait(self, api_client):
+        """Test that the recorded relay latency starts at dispatch."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+        url = f"{api_client.base_url}{ENDPOINT_RELAY.format(device_guid='device-1')}"
+
+        async def slow_acquire(_limiter):
+            await asyncio.sleep(0.1)
+
+        with aioresponses() as mock_resp, patch.object(
+            RateLimiter, "async_acquire", autospec=True, side_effect=slow_acquire
+        ):
+            mock_resp.put(url, status=200, payload={})
+            await api_client.async_set_relay("device-1", RELAY_STATE_ON)
+
+        assert api_client._relay_latency.percentile(50) < 0.1
+
+    def test_hedge_delay_follows_latency_percentile(self, api_client):
+        """Test that the hedge delay adapts to recent relay latencies."""
+        assert api_client._hedge_delay() == HEDGE_MAX_DELAY
+
+        for _ in range(HEDGE_MIN_SAMPLES):
+            api_client._relay_latency.record(0.2)
+        assert api_client._hedge_delay() == 0.2
+
+        # Fast commands push the old samples out of the window
+        for _ in range(LATENCY_WINDOW):
+            api_client._relay_latency.record(0.001)
+        assert api_client._hedge_delay() == HEDGE_MIN_DELAY
+
+
+class TestAdaptiveTimeouts:
+    """Test per-endpoint timeouts in API requests."""
+
+    def test_endpoint_template(self, api_client):
+        """Test that relay paths map to the relay endpoint template."""
+        relay = ENDPOINT_RELAY.format(device_guid="device-1")
+
+        assert api_client._endpoint_template(relay) == ENDPOINT_RELAY
+        assert api_client._endpoint_template(ENDPOINT_DEVICES) == ENDPOINT_DEVICES
+
+    @pytest.mark.asyncio
+    async def test_requests_use_learned_timeouts(self):
+        """Test that requests record latency and use the learned timeout."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            adaptive_timeouts=AdaptiveTimeouts(total_floor=0.5, min_samples=2),
+        )
+        client._api_key = "valid_token"
+        client._token_timestamp = time.time()
+        url = f"{client.base_url}{ENDPOINT_RELAY.format(device_guid='device-1')}"
+
+        with aioresponses() as mock_resp:
+            for _ in range(3):
+                mock_resp.put(url, status=200, payload={})
+            for _ in range(3):
+                await client.async_set_relay("device-1", RELAY_STATE_ON)
+
+            requests = mock_resp.requests[("PUT", URL(url))]
+            # Cold start uses the client's timeout as ceiling
+            assert requests[0].kwargs["timeout"].total == 10
+            assert requests[2].kwargs["timeout"].total == 0.5
+
+        stats = client.get_stats()["timeouts"][ENDPOINT_RELAY]
+        assert stats["total"]["count"] == 3
+        assert ENDPOINT_DEVICES not in client.get_stats()["timeouts"]
+        await client.async_close()
+
+    @pytest.mark.asyncio
+    async def test_recovers_when_latency_rises(self):
+        """Test that a timeout after a latency step falls back to the ceiling."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            adaptive_timeouts=AdaptiveTimeouts(total_floor=0.5, min_samples=2),
+        )
+        client._api_key = "valid_token"
+        client._token_timestamp = time.time()
+        url = f"{client.base_url}{ENDPOINT_RELAY.format(device_guid='device-1')}"
+
+        with aioresponses() as mock_resp:
+            for _ in range(2):
+                mock_resp.put(url, status=200, payload={})
+            # The device became slower than the learned timeout
+            mock_resp.put(url, exception=asyncio.TimeoutError())
+            for _ in range(2):
+                mock_resp.put(url, status=200, payload={})
+
+            for _ in range(2):
+                await client.async_set_relay("device-1", RELAY_STATE_ON)
+            await client.async_set_relay("device-1", RELAY_STATE_OFF)
+            await client.async_set_relay("device-1", RELAY_STATE_ON)
+
+            timeouts = [
+                request.kwargs["timeout"].total
+                for request in mock_resp.requests[("PUT", URL(url))]
+            ]
+
+        # The learned timeout expired; the retry and later commands use the
+        # ceiling until enough new samples are collected
+        assert timeouts == [10, 10, 0.5, 10, 10]
+        await client.async_close()
+
+    @pytest.mark.asyncio
+    async def test_circuit_probe_uses_ceiling(self):
+        """Test that the half-open probe ignores the learned timeouts."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            adaptive_timeouts=AdaptiveTimeouts(total_floor=0.5, min_samples=1),
+            circuit_breaker=CircuitBreaker(failure_threshold=1, recovery_timeout=0),
+        )
+        client._api_key = "valid_token"
+        client._token_timestamp = time.time()
+        client._adaptive_timeouts.record("/test", {"total": 0.01})
+        client._circuit_breaker.record_failure()
+        url = f"{client.base_url}/test"
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(url, status=200, payload={})
+            mock_resp.get(url, status=200, payload={})
+            await client._make_request("GET", "/test")
+            await client._make_request("GET", "/test")
+
+            timeouts = [
+                request.kwargs["timeout"].total
+                for request in mock_resp.requests[("GET", URL(url))]
+            ]
+
+        assert timeouts[0] == 10
+        assert timeouts[1] == 0.5
+        await client.async_close()
+
+
+class TestRequestTemplates:
+    """Test prebuilt request URLs, bodies and headers."""
+
+    def test_relay_request_built_once(self, api_client):
+        """Test that a relay command's path and body are cached per state."""
+        endpoint, body = api_client._relay_request("device-1", RELAY_STATE_ON)
+
+        assert endpoint == ENDPOINT_RELAY.format(device_guid="device-1")
+        assert json.loads(body) == {
+            "type": "enumeration",
+            "identifier": "relay",
+            "value": RELAY_STATE_ON,
+        }
+        assert api_client._relay_request("device-1", RELAY_STATE_ON)[1] is body
+        assert api_client._relay_request("device-1", RELAY_STATE_OFF)[1] != body
+        assert api_client.get_stats()["request_templates"]["relay_requests"] == 2
+
+    def test_endpoint_info_cached(self, api_client):
+        """Test that URLs and endpoint templates are built once per path."""
+        endpoint = ENDPOINT_RELAY.format(device_guid="device-1")
+
+        url, template = api_client._endpoint_info(endpoint)
+
+        assert url == URL(f"{api_client.base_url}{endpoint}")
+        assert template == ENDPOINT_RELAY
+        assert api_client._endpoint_info(endpoint)[0] is url
+
+    def test_headers_rebuilt_on_token_change(self, api_client):
+        """Test that header mappings are shared until the API key changes."""
+        headers = api_client._request_headers("key-1", False)
+        json_headers = api_client._request_headers("key-1", True)
+
+        assert headers == {"Authorization": "key-1"}
+        assert json_headers == {
+            "Authorization": "key-1",
+            "Content-Type": "application/json",
+        }
+        assert api_client._request_headers("key-1", False) is headers
+
+        assert api_client._request_headers("key-2", False) == {"Authorization": "key-2"}
+        assert api_client.get_stats()["request_templates"]["header_builds"] == 2
+
+    @pytest.mark.asyncio
+    async def test_relay_commands_reuse_prebuilt_request(self, api_client):
+        """Test that repeated commands send the same body and headers objects."""
+        api_client._api_key = "test_key"
+        api_client._token_timestamp = time.time()
+        url = f"{api_client.base_url}{ENDPOINT_RELAY.format(device_guid='device-1')}"
+
+        with aioresponses() as mock_resp:
+            mock_resp.put(url, status=204, repeat=True)
+
+            await api_client.async_set_relay("device-1", RELAY_STATE_ON)
+            await api_client.async_set_relay("device-1", RELAY_STATE_ON)
+
+            first, second = mock_resp.requests[("PUT", URL(url))]
+
+        assert first.kwargs["data"] is second.kwargs["data"]
+        assert first.kwargs["headers"] is second.kwargs["headers"]
+        assert first.kwargs["headers"]["Content-Type"] == "application/json"
+
+
+class TestContextManager:
+    """Test async context manager functionality."""
+
+    @pytest.mark.asyncio
+    async def test_context_manager(self):
+        """Test using API client as context manager."""
+        async with EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop",
+        ) as client:
+            assert client is not None
+            assert isinstance(client, EltakoAPI)
+
+    @pytest.mark.asyncio
+    async def test_context_manager_closes_session(self):
+        """Test that context manager closes session on exit."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop",
+        )
+
+        async with client:
+            # Create session
+            await client._get_session()
+            assert client._session is not None
+
+        # Session should be closed
+        assert client._session is None
+
+
+class TestSessionManagement:
+    """Test session management."""
+
+    @pytest.mark.asyncio
+    async def test_get_session_creates_session(self, api_client):
+        """Test that get_session creates a session if needed."""
+        assert api_client._session is None
+        session = await api_client._get_session()
+        assert session is not None
+        assert isinstance(session, aiohttp.ClientSession)
+
+    @pytest.mark.asyncio
+    async def test_get_session_reuses_session(self, api_client):
+        """Test that get_session reuses existing session."""
+        session1 = await api_client._get_session()
+        session2 = await api_client._get_session()
+        assert session1 is session2
+
+    @pytest.mark.asyncio
+    async def test_async_close(self, api_client):
+        """Test closing the API client."""
+        await api_client._get_session()
+        assert api_client._session is not None
+
+        await api_client.async_close()
+
+        assert api_client._session is None
+
+    @pytest.mark.asyncio
+    async def test_external_session_not_closed(self):
+        """Test that externally provided session is not closed."""
+        external_session = aiohttp.ClientSession()
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop",
+            session=external_session,
+        )
+
+        await client.async_close()
+
+        # External session should still be open
+        assert not external_session.closed
+        await external_session.close()
+
+
+class TestCredentialSecurity:
+    """Test that credentials are not logged."""
+
+    @pytest.mark.asyncio
+    async def test_no_credentials_in_logs(self, api_client, caplog):
+        """Test that credentials are not logged."""
+        with aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{api_client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "test_key"},
+                status=200,
+            )
+
+            await api_client.async_login()
+
+            # Check that sensitive data is not in logs
+            log_output = caplog.text
+            assert "test_pop_credential" not in log_output
+            assert "test_key" not in log_output
 
 
 class TestDeviceDiscovery:
@@ -589,8 +1446,116 @@ class TestDeviceDiscovery:
             devices = await api_client.async_get_devices()
 
             assert len(devices) == 2
-            assert devices[0]["guid"] == "device-1"
-            assert devices[1]["guid"] == "device-2"
+            assert devices[0].guid == "device-1"
+            assert devices[1].guid == "device-2"
+
+    @pytest.mark.asyncio
+    async def test_async_get_devices_parses_relay_state(self, api_client):
+        """Test that the relay value is parsed from the functions array."""
+        devices_response = [
+            {"deviceGuid": "device-1", "displayName": "Relay 1", "functions": [{"identifier": "relay", "type": "enumeration", "value": "on"}]},
+            {"deviceGuid": "device-2", "displayName": "Relay 2", "functions": [{"identifier": "relay", "type": "enumeration"}]},
+            {"deviceGuid": "device-3", "displayName": "Sensor", "functions": [{"identifier": "temperature", "type": "number"}]},
+        ]
+
+        with aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{api_client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "test_key"},
+                status=200,
+            )
+            mock_resp.get(
+                f"{api_client.base_url}{ENDPOINT_DEVICES}",
+                payload=devices_response,
+                status=200,
+            )
+
+            devices = await api_client.async_get_devices()
+
+        assert devices[0].relay.value == RELAY_STATE_ON
+        assert devices[1].relay.value is None
+        assert devices[2].relay is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("threshold", [DEVICE_LIST_STREAM_THRESHOLD, 10])
+    async def test_async_get_devices_malformed_json(self, api_client, threshold):
+        """Test that a truncated device list is rejected."""
+        with aioresponses() as mock_resp, patch(
+            "custom_components.eltako_esr62pf.api.DEVICE_LIST_STREAM_THRESHOLD",
+            threshold,
+        ):
+            mock_resp.post(
+                f"{api_client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "test_key"},
+                status=200,
+            )
+            mock_resp.get(
+                f"{api_client.base_url}{ENDPOINT_DEVICES}",
+                body='[{"deviceGuid": "device-1", "displayName": "Rel',
+                status=200,
+            )
+
+            with pytest.raises(EltakoAPIError, match="Invalid devices response format"):
+                await api_client.async_get_devices()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("threshold", [DEVICE_LIST_STREAM_THRESHOLD, 10])
+    async def test_async_get_devices_whole_or_streamed(self, api_client, threshold):
+        """Test that small lists are decoded whole and large ones streamed."""
+        devices_response = [
+            {"deviceGuid": f"device-{index}", "displayName": f"Relay {index}", "functions": [{"identifier": "relay", "type": "enumeration", "value": "on"}], "infos": [], "settings": []}
+            for index in range(3)
+        ]
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+        loads = MagicMock(side_effect=json.loads)
+        api_client._serializer = JSONSerializer("spy", json.dumps, loads)
+
+        with aioresponses() as mock_resp, patch(
+            "custom_components.eltako_esr62pf.api.DEVICE_LIST_STREAM_THRESHOLD",
+            threshold,
+        ), patch(
+            "custom_components.eltako_esr62pf.api.JSONArrayStreamDecoder",
+            wraps=JSONArrayStreamDecoder,
+        ) as decoder:
+            mock_resp.get(
+                f"{api_client.base_url}{ENDPOINT_DEVICES}",
+                payload=devices_response,
+                status=200,
+            )
+
+            devices = await api_client.async_get_devices()
+
+        assert [device.guid for device in devices] == [
+            "device-0",
+            "device-1",
+            "device-2",
+        ]
+        assert all(device.relay.value == RELAY_STATE_ON for device in devices)
+        streamed = threshold < DEVICE_LIST_STREAM_THRESHOLD
+        assert decoder.called == streamed
+        assert loads.called != streamed
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("threshold", [DEVICE_LIST_STREAM_THRESHOLD, 10])
+    async def test_async_get_devices_wrapped_list(self, api_client, threshold):
+        """Test the fallback for a list wrapped in a "devices" key."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+
+        with aioresponses() as mock_resp, patch(
+            "custom_components.eltako_esr62pf.api.DEVICE_LIST_STREAM_THRESHOLD",
+            threshold,
+        ):
+            mock_resp.get(
+                f"{api_client.base_url}{ENDPOINT_DEVICES}",
+                payload={"devices": [{"deviceGuid": "device-1", "displayName": "Relay 1"}]},
+                status=200,
+            )
+
+            devices = await api_client.async_get_devices()
+
+        assert [device.guid for device in devices] == ["device-1"]
 
     @pytest.mark.asyncio
     async def test_async_get_devices_caches_result(self, api_client):
@@ -623,7 +1588,7 @@ class TestDeviceDiscovery:
 
     @pytest.mark.asyncio
     async def test_async_get_devices_cache_expiry(self, api_client):
-        """Test that device cache expires after TTL."""
+        """Test that an expired cache is served stale and refreshed in the background."""
         # Mock responses match real API format
         devices_response1 = [{"deviceGuid": "device-1", "displayName": "Device 1", "productGuid": "prod-1", "functions": [{"identifier": "relay", "type": "enumeration"}], "infos": [], "settings": []}]
         devices_response2 = [{"deviceGuid": "device-2", "displayName": "Device 2", "productGuid": "prod-2", "functions": [{"identifier": "relay", "type": "enumeration"}], "infos": [], "settings": []}]
@@ -644,21 +1609,185 @@ class TestDeviceDiscovery:
 
             # First call
             devices1 = await api_client.async_get_devices()
-            assert devices1[0]["guid"] == "device-1"
+            assert devices1[0].guid == "device-1"
 
             # Simulate cache expiry
             api_client._devices_cache_timestamp = time.time() - (DEVICE_CACHE_TTL + 1)
 
-            # Mock second devices call
-            mock_resp.get(
-                f"{api_client.base_url}{ENDPOINT_DEVICES}",
-                payload=devices_response2,
-                status=200,
+            # Mock second devices call
+            mock_resp.get(
+                f"{api_client.base_url}{ENDPOINT_DEVICES}",
+                payload=devices_response2,
+                status=200,
+            )
+
+            # Second call returns the stale list and refreshes it once
+            stale = await api_client.async_get_devices()
+            assert stale is devices1
+            assert api_client._device_refresh_task is not None
+            await api_client._device_refresh_task
+
+            # Third call sees the refreshed list
+            devices2 = await api_client.async_get_devices()
+            assert devices2[0].guid == "device-2"
+
+        stats = api_client.get_stats()["device_cache"]
+        assert stats["stale_hits"] == 1
+        assert stats["background_refreshes"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_get_devices_stale_refreshed_once(self, api_client):
+        """Test that concurrent stale callers start a single background refresh."""
+        api_client._devices_cache = []
+        api_client._devices_cache_timestamp = time.time() - (DEVICE_CACHE_TTL + 1)
+        listener = MagicMock()
+        api_client.add_devices_listener(listener)
+
+        with patch.object(
+            api_client, "_async_fetch_devices", AsyncMock(return_value=[])
+        ) as mock_fetch:
+            results = await asyncio.gather(
+                *(api_client.async_get_devices() for _ in range(5))
+            )
+            await api_client._device_refresh_task
+
+        assert results == [[]] * 5
+        mock_fetch.assert_awaited_once()
+        listener.assert_called_once_with()
+
+    @pytest.mark.asyncio
+    async def test_async_get_devices_background_failure_keeps_cache(self, api_client):
+        """Test that a failed background refresh keeps serving the stale list."""
+        cached = [EltakoDevice("device-1", "Relay 1")]
+        api_client._devices_cache = cached
+        api_client._devices_cache_timestamp = time.time() - (DEVICE_CACHE_TTL + 1)
+        listener = MagicMock()
+        api_client.add_devices_listener(listener)
+
+        with patch.object(
+            api_client,
+            "_async_fetch_devices",
+            AsyncMock(side_effect=EltakoConnectionError("offline")),
+        ):
+            for _ in range(2):
+                assert await api_client.async_get_devices() is cached
+                await api_client._device_refresh_task
+
+        assert api_client.get_stats()["device_cache"]["background_failures"] == 2
+        listener.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_get_devices_beyond_max_stale_fetches(self):
+        """Test that a list older than the staleness bound is fetched in the foreground."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            device_cache_ttl=10,
+            device_cache_max_stale=30,
+        )
+        client._devices_cache = [EltakoDevice("device-1", "Relay 1")]
+        client._devices_cache_timestamp = time.time() - 31
+        fresh = [EltakoDevice("device-2", "Relay 2")]
+
+        with patch.object(
+            client, "_async_fetch_devices", AsyncMock(return_value=fresh)
+        ):
+            assert await client.async_get_devices() is fresh
+
+        assert client._device_refresh_task is None
+
+    @pytest.mark.asyncio
+    async def test_async_get_devices_concurrent_callers_share_request(self, api_client):
+        """Test that concurrent device list callers share one GET."""
+        api_client._api_key = "test_key"
+        api_client._token_timestamp = time.time()
+        devices_url = f"{api_client.base_url}{ENDPOINT_DEVICES}"
+        devices_response = [{"deviceGuid": "device-1", "displayName": "Device 1", "functions": [{"identifier": "relay", "type": "enumeration"}]}]
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(devices_url, payload=devices_response, status=200)
+
+            results = await asyncio.gather(
+                api_client.async_get_devices(),
+                api_client.async_get_devices(force_refresh=True),
+                api_client.async_get_devices(),
+            )
+
+            assert len(mock_resp.requests[("GET", URL(devices_url))]) == 1
+
+        assert results[0] is results[1] is results[2]
+        assert results[0][0].guid == "device-1"
+        assert api_client.get_stats()["device_cache"]["requests_coalesced"] == 2
+        assert api_client._device_fetch_task is None
+
+    @pytest.mark.asyncio
+    async def test_async_get_devices_concurrent_callers_share_error(self, api_client):
+        """Test that a failed shared request raises in every caller."""
+        fetch = AsyncMock(side_effect=EltakoConnectionError("offline"))
+
+        with patch.object(api_client, "_async_fetch_devices", fetch):
+            results = await asyncio.gather(
+                *(api_client.async_get_devices() for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        fetch.assert_awaited_once()
+        assert all(isinstance(result, EltakoConnectionError) for result in results)
+        assert api_client._device_fetch_task is None
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_shares_foreground_request(self, api_client):
+        """Test that the background refresh joins a forced refresh in flight."""
+        api_client._devices_cache = []
+        api_client._devices_cache_timestamp = time.time() - (DEVICE_CACHE_TTL + 1)
+        fresh = [EltakoDevice("device-1", "Relay 1")]
+
+        with patch.object(
+            api_client, "_async_fetch_devices", AsyncMock(return_value=fresh)
+        ) as fetch:
+            forced, stale = await asyncio.gather(
+                api_client.async_get_devices(force_refresh=True),
+                api_client.async_get_devices(),
             )
+            await api_client._device_refresh_task
 
-            # Second call fetches fresh data
-            devices2 = await api_client.async_get_devices()
-            assert devices2[0]["guid"] == "device-2"
+        fetch.assert_awaited_once()
+        assert forced is fresh
+        assert stale == []
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_abort_shared_request(self, api_client):
+        """Test that cancelling one caller leaves the shared request running."""
+        release = asyncio.Event()
+        fresh = [EltakoDevice("device-1", "Relay 1")]
+
+        async def slow_fetch():
+            await release.wait()
+            return fresh
+
+        with patch.object(api_client, "_async_fetch_devices", side_effect=slow_fetch):
+            first = asyncio.create_task(api_client.async_get_devices())
+            second = asyncio.create_task(api_client.async_get_devices())
+            await asyncio.sleep(0)
+            first.cancel()
+            release.set()
+
+            assert await second is fresh
+            with pytest.raises(asyncio.CancelledError):
+                await first
+
+    def test_invalid_device_cache_bounds(self):
+        """Test that max staleness below the TTL is rejected."""
+        with pytest.raises(ValueError):
+            EltakoAPI(
+                ip_address="192.168.1.100",
+                pop_credential="test_pop_credential",
+                device_cache_ttl=60,
+                device_cache_max_stale=30,
+            )
 
     @pytest.mark.asyncio
     async def test_async_get_devices_force_refresh(self, api_client):
@@ -683,7 +1812,7 @@ class TestDeviceDiscovery:
 
             # First call
             devices1 = await api_client.async_get_devices()
-            assert devices1[0]["guid"] == "device-1"
+            assert devices1[0].guid == "device-1"
 
             # Mock second devices call
             mock_resp.get(
@@ -694,7 +1823,7 @@ class TestDeviceDiscovery:
 
             # Force refresh bypasses cache
             devices2 = await api_client.async_get_devices(force_refresh=True)
-            assert devices2[0]["guid"] == "device-2"
+            assert devices2[0].guid == "device-2"
 
     @pytest.mark.asyncio
     async def test_async_get_devices_empty_list(self, api_client):
@@ -896,6 +2025,57 @@ class TestRelayControl:
 
             # Both commands should complete successfully
 
+    @pytest.mark.asyncio
+    async def test_async_set_relay_reports_lane_stats(self, api_client):
+        """Test that relay commands are tracked in per-relay lanes."""
+        api_client._api_key = "test_key"
+        api_client._token_timestamp = time.time()
+
+        with aioresponses() as mock_resp:
+            for device_guid in ("device-1", "device-2"):
+                endpoint = ENDPOINT_RELAY.format(device_guid=device_guid)
+                mock_resp.put(f"{api_client.base_url}{endpoint}", status=204)
+
+            await asyncio.gather(
+                api_client.async_set_relay("device-1", RELAY_STATE_ON),
+                api_client.async_set_relay("device-2", RELAY_STATE_ON),
+            )
+
+        stats = api_client.get_stats()["relay_scheduler"]
+        assert stats["in_flight"] == 0
+        assert stats["lanes"]["device-1"]["commands"] == 1
+        assert stats["lanes"]["device-2"]["commands"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_set_relay_coalesces_rapid_toggles(self, api_client):
+        """Test that rapid toggles for one relay collapse to the newest state."""
+        device_guid = "device-flapping"
+        api_client._api_key = "test_key"
+        api_client._token_timestamp = time.time()
+        endpoint = ENDPOINT_RELAY.format(device_guid=device_guid)
+        url = f"{api_client.base_url}{endpoint}"
+
+        with aioresponses() as mock_resp:
+            mock_resp.put(url, status=204, repeat=True)
+
+            await asyncio.gather(
+                api_client.async_set_relay(device_guid, RELAY_STATE_ON),
+                api_client.async_set_relay(device_guid, RELAY_STATE_OFF),
+                api_client.async_set_relay(device_guid, RELAY_STATE_ON),
+            )
+
+            sent = [
+                json.loads(call.kwargs["data"])["value"]
+                for (method, request_url), calls in mock_resp.requests.items()
+                for call in calls
+                if method == "PUT"
+            ]
+
+        assert sent == [RELAY_STATE_ON]
+        stats = api_client.get_stats()["relay_scheduler"]
+        assert stats["coalesced"] == 2
+        assert stats["lanes"][device_guid]["commands"] == 1
+
     @pytest.mark.asyncio
     async def test_async_set_relay_api_error(self, api_client):
         """Test handling of API error during relay control."""
@@ -967,3 +2147,488 @@ class TestRelayControl:
                 EltakoConnectionError, match="Cannot reach Eltako device"
             ):
                 await api_client.async_set_relay(device_guid, RELAY_STATE_ON)
+
+
+class TestRelayStateReads:
+    """Test reading relay states from the device."""
+
+    @pytest.mark.asyncio
+    async def test_async_get_relay_state(self, api_client):
+        """Test reading the state of a single relay."""
+        device_guid = "test-device-123"
+
+        with aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{api_client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "test_key"},
+                status=200,
+            )
+            endpoint = ENDPOINT_RELAY.format(device_guid=device_guid)
+            mock_resp.get(
+                f"{api_client.base_url}{endpoint}",
+                payload={"type": "enumeration", "identifier": "relay", "value": "on"},
+                status=200,
+            )
+
+            assert await api_client.async_get_relay_state(device_guid) == RELAY_STATE_ON
+
+    @pytest.mark.asyncio
+    async def test_async_get_relay_state_unexpected_value(self, api_client):
+        """Test that an unknown relay value is reported as None."""
+        device_guid = "test-device-123"
+
+        with aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{api_client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "test_key"},
+                status=200,
+            )
+            endpoint = ENDPOINT_RELAY.format(device_guid=device_guid)
+            mock_resp.get(
+                f"{api_client.base_url}{endpoint}",
+                payload={"identifier": "relay", "value": "blinking"},
+                status=200,
+            )
+
+            assert await api_client.async_get_relay_state(device_guid) is None
+
+    @pytest.mark.asyncio
+    async def test_async_get_relay_state_invalid_guid(self, api_client):
+        """Test that an empty GUID is rejected."""
+        with pytest.raises(EltakoInvalidDeviceError):
+            await api_client.async_get_relay_state("")
+
+    @pytest.mark.asyncio
+    async def test_async_get_relay_states_partial_failure(self, api_client):
+        """Test that a failed read leaves that relay out of the result."""
+        with aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{api_client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "test_key"},
+                status=200,
+            )
+            mock_resp.get(
+                f"{api_client.base_url}{ENDPOINT_RELAY.format(device_guid='device-1')}",
+                payload={"identifier": "relay", "value": "off"},
+                status=200,
+            )
+            mock_resp.get(
+                f"{api_client.base_url}{ENDPOINT_RELAY.format(device_guid='device-2')}",
+                status=404,
+            )
+
+            states = await api_client.async_get_relay_states(["device-1", "device-2"])
+
+        assert states == {"device-1": RELAY_STATE_OFF}
+
+    @pytest.mark.asyncio
+    async def test_async_get_relay_states_all_failed(self, api_client):
+        """Test that the first error is raised when every read fails."""
+        with patch.object(
+            api_client,
+            "async_get_relay_state",
+            AsyncMock(side_effect=EltakoAPIError("boom")),
+        ):
+            with pytest.raises(EltakoAPIError):
+                await api_client.async_get_relay_states(["device-1", "device-2"])
+
+    @pytest.mark.asyncio
+    async def test_async_get_relay_states_concurrency_cap(self):
+        """Test that no more than the configured reads are in flight."""
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            max_concurrent_state_reads=3,
+        )
+        active = 0
+        max_active = 0
+
+        async def read_state(device_guid):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return RELAY_STATE_ON
+
+        guids = [f"device-{i}" for i in range(10)]
+        with patch.object(client, "async_get_relay_state", side_effect=read_state):
+            states = await client.async_get_relay_states(guids)
+
+        assert states == dict.fromkeys(guids, RELAY_STATE_ON)
+        assert max_active == 3
+
+
+class TestBulkRelayCommands:
+    """Test setting several relays in one operation."""
+
+    @pytest.mark.asyncio
+    async def test_async_set_relays(self, api_client):
+        """Test that all relays are set after a single login."""
+        states = {"relay-1": RELAY_STATE_ON, "relay-2": RELAY_STATE_OFF}
+        login_url = f"{api_client.base_url}{ENDPOINT_LOGIN}"
+
+        with aioresponses() as mock_resp:
+            mock_resp.post(login_url, payload={"apiKey": "test_key"}, status=200)
+            for device_guid in states:
+                endpoint = ENDPOINT_RELAY.format(device_guid=device_guid)
+                mock_resp.put(f"{api_client.base_url}{endpoint}", status=200)
+
+            result = await api_client.async_set_relays(states)
+
+            assert len(mock_resp.requests[("POST", URL(login_url))]) == 1
+            for device_guid, state in states.items():
+                endpoint = ENDPOINT_RELAY.format(device_guid=device_guid)
+                call = mock_resp.requests[("PUT", URL(f"{api_client.base_url}{endpoint}"))][0]
+                assert json.loads(call.kwargs["data"])["value"] == state
+
+        assert result.succeeded == ["relay-1", "relay-2"]
+        assert result.failed == {}
+        assert result.results["relay-1"].state == RELAY_STATE_ON
+        assert result.results["relay-1"].latency >= 0
+
+    @pytest.mark.asyncio
+    async def test_async_set_relays_failure_does_not_abort_others(self, api_client):
+        """Test that a failing relay is reported while the others are set."""
+        api_client._api_key = "test_key"
+        api_client._token_timestamp = time.time()
+
+        with aioresponses() as mock_resp:
+            for device_guid, status in (("relay-1", 200), ("relay-2", 400), ("relay-3", 200)):
+                endpoint = ENDPOINT_RELAY.format(device_guid=device_guid)
+                mock_resp.put(f"{api_client.base_url}{endpoint}", status=status)
+
+            result = await api_client.async_set_relays(
+                {
+                    "relay-1": RELAY_STATE_ON,
+                    "relay-2": RELAY_STATE_ON,
+                    "relay-3": RELAY_STATE_OFF,
+                }
+            )
+
+        assert result.succeeded == ["relay-1", "relay-3"]
+        assert list(result.failed) == ["relay-2"]
+        assert isinstance(result.failed["relay-2"], EltakoAPIError)
+        assert not result.results["relay-2"].success
+
+        stats = api_client.get_stats()["bulk_relay"]
+        assert stats == {"operations": 1, "commands": 3, "failures": 1}
+
+    @pytest.mark.asyncio
+    async def test_async_set_relays_unexpected_error_does_not_abort_others(
+        self, api_client
+    ):
+        """Test that a non-Eltako exception of one relay is reported as its error."""
+        api_client._api_key = "test_key"
+        api_client._token_timestamp = time.time()
+
+        async def send_relay_command(device_guid, state):
+            if device_guid == "relay-2":
+                raise ValueError("Expecting value: line 1 column 1 (char 0)")
+
+        with patch.object(
+            api_client, "_send_relay_command", side_effect=send_relay_command
+        ):
+            result = await api_client.async_set_relays(
+                {
+                    "relay-1": RELAY_STATE_ON,
+                    "relay-2": RELAY_STATE_ON,
+                    "relay-3": RELAY_STATE_OFF,
+                }
+            )
+
+        assert result.succeeded == ["relay-1", "relay-3"]
+        error = result.failed["relay-2"]
+        assert isinstance(error, EltakoAPIError)
+        assert isinstance(error.__cause__, ValueError)
+        assert api_client.get_stats()["bulk_relay"]["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_set_relays_invalid_entries(self, api_client):
+        """Test that invalid entries are reported without any request."""
+        with patch.object(api_client, "_make_request", AsyncMock()) as mock_request:
+            result = await api_client.async_set_relays(
+                {"": RELAY_STATE_ON, "relay-1": "dimmed"}
+            )
+
+        mock_request.assert_not_called()
+        assert result.succeeded == []
+        assert isinstance(result.failed[""], EltakoInvalidDeviceError)
+        assert isinstance(result.failed["relay-1"], EltakoAPIError)
+        assert result.results["relay-1"].latency == 0.0
+
+    @pytest.mark.asyncio
+    async def test_async_set_relays_login_failure(self, api_client):
+        """Test that a failed login fails the whole batch."""
+        with patch.object(
+            api_client,
+            "async_login",
+            AsyncMock(side_effect=EltakoAuthenticationError("denied")),
+        ):
+            with pytest.raises(EltakoAuthenticationError):
+                await api_client.async_set_relays({"relay-1": RELAY_STATE_ON})
+
+
+class TestRequestPriority:
+    """Test that relay commands preempt background requests."""
+
+    @pytest.mark.asyncio
+    async def test_poll_waits_for_relay_command(self, api_client):
+        """Test that a device list poll is sent after a pending relay command."""
+        release = asyncio.Event()
+        sent = []
+
+        async def make_request(method, endpoint, *args, request_timing=None, **kwargs):
+            sent.append(method)
+            if method == "PUT":
+                await release.wait()
+                request_timing[PHASE_TOTAL] = 0.01
+                return {}
+            return []
+
+        with patch.object(
+            api_client, "_make_request_with_retries", side_effect=make_request
+        ):
+            command = asyncio.create_task(
+                api_client.async_set_relay("device-1", RELAY_STATE_ON)
+            )
+            for _ in range(5):
+                await asyncio.sleep(0)
+            poll = asyncio.create_task(api_client.async_get_devices(force_refresh=True))
+            for _ in range(5):
+                await asyncio.sleep(0)
+            assert sent == ["PUT"]
+
+            release.set()
+            await asyncio.gather(command, poll)
+
+        assert sent == ["PUT", "GET"]
+        classes = api_client.get_stats()["request_priority"]["classes"]
+        assert classes["metadata"]["deferred"] == 1
+        assert classes["interactive"]["deferred"] == 0
+
+
+class TestRateLimiting:
+    """Test the request rate limiter and Retry-After handling."""
+
+    @pytest.mark.asyncio
+    async def test_every_attempt_is_rate_limited(self, api_client):
+        """Test that login and request attempts each take a token."""
+        with aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{api_client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "test_key"},
+                status=200,
+            )
+            mock_resp.get(f"{api_client.base_url}/test", payload={}, status=200)
+
+            with patch.object(
+                RateLimiter, "async_acquire", autospec=True
+            ) as mock_acquire:
+                await api_client._make_request("GET", "/test")
+
+        assert mock_acquire.await_count == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status", [429, 503])
+    async def test_retry_after_is_honored(self, api_client, status):
+        """Test that a throttled request pauses the limiter and is retried."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(
+                f"{api_client.base_url}/test",
+                status=status,
+                headers={"Retry-After": "2"},
+            )
+            mock_resp.get(
+                f"{api_client.base_url}/test", payload={"result": "ok"}, status=200
+            )
+
+            with patch.object(RateLimiter, "pause", autospec=True) as mock_pause:
+                result = await api_client._make_request("GET", "/test")
+
+        assert result == {"result": "ok"}
+        mock_pause.assert_called_once_with(api_client._rate_limiter, 2.0)
+        assert api_client.get_stats()["retries"]["throttled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_after_beyond_deadline_fails(self, api_client):
+        """Test that a Retry-After past the request deadline is not waited for."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(
+                f"{api_client.base_url}/test",
+                status=503,
+                headers={"Retry-After": "120"},
+            )
+
+            with patch.object(RateLimiter, "pause", autospec=True) as mock_pause:
+                with pytest.raises(EltakoAPIError):
+                    await api_client._make_request("GET", "/test")
+
+        mock_pause.assert_called_once_with(api_client._rate_limiter, 120.0)
+        assert api_client.get_stats()["retries"]["throttled"] == 0
+
+    @pytest.mark.asyncio
+    async def test_503_without_retry_after(self, api_client):
+        """Test that a plain 503 is an API error and does not pause."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(f"{api_client.base_url}/test", status=503)
+
+            with pytest.raises(EltakoAPIError):
+                await api_client._make_request("GET", "/test")
+
+        assert api_client.get_stats()["rate_limiter"]["pauses"] == 0
+
+    @pytest.mark.asyncio
+    async def test_throttled_login_pauses(self, api_client):
+        """Test that a throttled login pauses later requests."""
+        with aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{api_client.base_url}{ENDPOINT_LOGIN}",
+                status=429,
+                headers={"Retry-After": "5"},
+            )
+
+            with pytest.raises(EltakoAPIError):
+                await api_client.async_login()
+
+        stats = api_client.get_stats()["rate_limiter"]
+        assert stats["pauses"] == 1
+        assert 4 < stats["paused_for"] <= 5
+
+
+class TestAdaptiveConcurrency:
+    """Test the adaptive concurrency limit in the request path."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_lowers_limit(self, api_client):
+        """Test that a timed out attempt halves the exposed limit."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+        initial = api_client.get_stats()["concurrency"]["limit"]
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(
+                f"{api_client.base_url}/test",
+                exception=asyncio.TimeoutError(),
+            )
+            mock_resp.get(
+                f"{api_client.base_url}/test", payload={"result": "ok"}, status=200
+            )
+
+            await api_client._make_request("GET", "/test")
+
+        stats = api_client.get_stats()["concurrency"]
+        assert stats["limit"] == initial // 2
+        assert stats["overloads"] == 1
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_throttled_response_lowers_limit(self, api_client):
+        """Test that a 429 response counts as overload."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+        initial = api_client.get_stats()["concurrency"]["limit"]
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(
+                f"{api_client.base_url}/test",
+                status=429,
+                headers={"Retry-After": "0"},
+            )
+            mock_resp.get(
+                f"{api_client.base_url}/test", payload={"result": "ok"}, status=200
+            )
+
+            await api_client._make_request("GET", "/test")
+
+        assert api_client.get_stats()["concurrency"]["limit"] == initial // 2
+
+    @pytest.mark.asyncio
+    async def test_relogin_does_not_hold_slot(self, api_client):
+        """Test that the login after a 401 runs with the slot released."""
+        api_client._api_key = "expired_token"
+        api_client._token_timestamp = time.time()
+        in_flight = []
+        real_login = api_client.async_login
+
+        async def login():
+            in_flight.append(api_client._concurrency_limiter.in_flight)
+            return await real_login()
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(f"{api_client.base_url}/test", status=401)
+            mock_resp.post(
+                f"{api_client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "new_key"},
+                status=200,
+            )
+            mock_resp.get(
+                f"{api_client.base_url}/test", payload={"result": "ok"}, status=200
+            )
+
+            with patch.object(api_client, "async_login", side_effect=login):
+                result = await api_client._make_request("GET", "/test")
+
+        assert result == {"result": "ok"}
+        assert in_flight == [0]
+        assert api_client.get_stats()["concurrency"]["overloads"] == 0
+
+    @pytest.mark.asyncio
+    async def test_bulk_relay_commands_not_throttled_initially(self, api_client):
+        """Test that a full batch of relay commands is in flight before any feedback."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+        count = DEFAULT_MAX_CONCURRENT_RELAY_COMMANDS
+        release = asyncio.Event()
+        in_flight = []
+
+        async def slow_command(url, **kwargs):
+            in_flight.append(api_client._concurrency_limiter.in_flight)
+            if len(in_flight) == count:
+                release.set()
+            await release.wait()
+            return CallbackResult(payload={})
+
+        with aioresponses() as mock_resp:
+            mock_resp.put(
+                re.compile(r".*/functions/relay$"), callback=slow_command, repeat=True
+            )
+            result = await asyncio.wait_for(
+                api_client.async_set_relays(
+                    {f"relay-{index}": RELAY_STATE_ON for index in range(count)}
+                ),
+                timeout=5,
+            )
+
+        assert not result.failed
+        assert max(in_flight) == count
+        assert api_client.get_stats()["concurrency"]["waits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_relay_reads_and_commands_have_separate_baselines(self, api_client):
+        """Test that latency baselines are kept per method and endpoint."""
+        api_client._api_key = "valid_token"
+        api_client._token_timestamp = time.time()
+        endpoint = ENDPOINT_RELAY.format(device_guid="relay-1")
+
+        with aioresponses() as mock_resp:
+            mock_resp.get(f"{api_client.base_url}{endpoint}", payload={"value": "on"})
+            mock_resp.put(f"{api_client.base_url}{endpoint}", payload={})
+
+            await api_client._make_request("GET", endpoint)
+            await api_client._make_request("PUT", endpoint, data=b"{}")
+
+        assert set(api_client._concurrency_limiter._latencies) == {
+            f"GET {ENDPOINT_RELAY}",
+            f"PUT {ENDPOINT_RELAY}",
+        }
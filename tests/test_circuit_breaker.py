@@ -0,0 +1,113 @@
+"""Tests for the Eltako circuit breaker."""
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.eltako_esr62pf.circuit_breaker import CircuitBreaker
+from custom_components.eltako_esr62pf.const import (
+    CIRCUIT_STATE_CLOSED,
+    CIRCUIT_STATE_HALF_OPEN,
+    CIRCUIT_STATE_OPEN,
+)
+
+
+@pytest.fixture
+def mock_monotonic():
+    """Control the clock seen by the circuit breaker."""
+    with patch(
+        "custom_components.eltako_esr62pf.circuit_breaker.time.monotonic",
+        return_value=1000.0,
+    ) as monotonic:
+        yield monotonic
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+
+    def test_invalid_thresholds(self):
+        """Test that invalid thresholds are rejected."""
+        with pytest.raises(ValueError):
+            CircuitBreaker(failure_threshold=0)
+        with pytest.raises(ValueError):
+            CircuitBreaker(recovery_timeout=-1)
+
+    def test_opens_after_threshold(self, mock_monotonic):
+        """Test that consecutive failures open the breaker."""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30)
+
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_STATE_CLOSED
+        assert breaker.allow_request() is True
+
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_STATE_OPEN
+        assert breaker.is_open is True
+        assert breaker.allow_request() is False
+        assert breaker.retry_in == 30
+
+    def test_success_resets_failures(self, mock_monotonic):
+        """Test that a success in between keeps the breaker closed."""
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CIRCUIT_STATE_CLOSED
+
+    def test_half_open_allows_single_probe(self, mock_monotonic):
+        """Test that only one probe is let through after the recovery timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        breaker.record_failure()
+
+        mock_monotonic.return_value = 1030.0
+        assert breaker.state == CIRCUIT_STATE_HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+
+        breaker.record_success()
+        assert breaker.state == CIRCUIT_STATE_CLOSED
+        assert breaker.allow_request() is True
+
+    def test_failed_probe_reopens(self, mock_monotonic):
+        """Test that a failed probe opens the breaker for another timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        breaker.record_failure()
+
+        mock_monotonic.return_value = 1030.0
+        assert breaker.allow_request() is True
+        breaker.record_failure()
+
+        assert breaker.state == CIRCUIT_STATE_OPEN
+        assert breaker.retry_in == 30
+        assert breaker.as_dict()["times_opened"] == 2
+
+    def test_released_probe_can_be_retaken(self, mock_monotonic):
+        """Test that a cancelled probe frees the slot for the next request."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        breaker.record_failure()
+
+        mock_monotonic.return_value = 1030.0
+        assert breaker.allow_request() is True
+        breaker.release_probe()
+
+        assert breaker.state == CIRCUIT_STATE_HALF_OPEN
+        assert breaker.allow_request() is True
+
+    def test_as_dict(self, mock_monotonic):
+        """Test that the breaker state is reported as a dictionary."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        breaker.record_failure()
+        breaker.allow_request()
+
+        mock_monotonic.return_value = 1010.0
+        assert breaker.as_dict() == {
+            "state": CIRCUIT_STATE_OPEN,
+            "consecutive_failures": 1,
+            "failure_threshold": 1,
+            "recovery_timeout": 30,
+            "retry_in": 20.0,
+            "times_opened": 1,
+            "rejected": 1,
+        }
@@ -0,0 +1,293 @@
+"""Tests for Eltako adaptive concurrency limiting."""
+import asyncio
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+
+from custom_components.eltako_esr62pf.concurrency import AdaptiveConcurrencyLimiter
+from custom_components.eltako_esr62pf.const import CONCURRENCY_MIN_SAMPLES
+
+
+async def _settle():
+    """Let freshly created tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _run_concurrently(limiter, count, key="/test"):
+    """Complete count requests that are all in flight at the same time."""
+    release = asyncio.Event()
+
+    async def request():
+        async with limiter.async_slot(key):
+            await release.wait()
+
+    tasks = [asyncio.create_task(request()) for _ in range(count)]
+    await _settle()
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test the AIMD concurrency limit."""
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"min_limit": 0},
+            {"initial_limit": 2, "min_limit": 3},
+            {"initial_limit": 8, "max_limit": 4},
+            {"decrease_factor": 0},
+            {"decrease_factor": 1},
+        ],
+    )
+    def test_invalid_arguments(self, kwargs):
+        """Test that inconsistent limits are rejected."""
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(**kwargs)
+
+    @pytest.mark.asyncio
+    async def test_requests_beyond_limit_wait_in_order(self):
+        """Test that requests beyond the limit wait for a free slot."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+        releases = [asyncio.Event() for _ in range(4)]
+        order = []
+
+        async def request(index):
+            async with limiter.async_slot("/test"):
+                order.append(index)
+                await releases[index].wait()
+
+        tasks = [asyncio.create_task(request(index)) for index in range(4)]
+        await _settle()
+
+        assert order == [0, 1]
+        assert limiter.in_flight == 2
+        assert limiter.as_dict()["waiting"] == 2
+
+        releases[1].set()
+        await _settle()
+        assert order == [0, 1, 2]
+
+        for release in releases:
+            release.set()
+        await asyncio.gather(*tasks)
+
+        assert order == [0, 1, 2, 3]
+        assert limiter.in_flight == 0
+        assert limiter.as_dict()["waits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_limit_grows_when_fully_used(self):
+        """Test additive increase after a window of saturated successes."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+
+        await _run_concurrently(limiter, 2)
+
+        assert limiter.limit == 3
+        assert limiter.as_dict()["increases"] == 1
+
+    @pytest.mark.asyncio
+    async def test_default_limit_starts_at_maximum_and_recovers(self):
+        """Test that the default limit backs off from its maximum and grows back."""
+        limiter = AdaptiveConcurrencyLimiter()
+        maximum = limiter.as_dict()["max_limit"]
+        assert limiter.limit == maximum
+
+        async with limiter.async_slot("/test") as slot:
+            slot.mark_overloaded()
+        assert limiter.limit == maximum // 2
+
+        await _run_concurrently(limiter, maximum // 2)
+        assert limiter.limit == maximum // 2 + 1
+
+    @pytest.mark.asyncio
+    async def test_limit_does_not_grow_when_unused(self):
+        """Test that sequential requests do not raise an unused limit."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+
+        for _ in range(10):
+            async with limiter.async_slot("/test"):
+                pass
+
+        assert limiter.limit == 2
+
+    @pytest.mark.asyncio
+    async def test_limit_capped_at_maximum(self):
+        """Test that the limit never exceeds max_limit."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+
+        for _ in range(3):
+            await _run_concurrently(limiter, 4)
+
+        assert limiter.limit == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error",
+        [
+            asyncio.TimeoutError(),
+            aiohttp.ServerDisconnectedError(),
+        ],
+    )
+    async def test_overload_error_halves_limit(self, error):
+        """Test multiplicative decrease on timeouts and dropped connections."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+
+        with pytest.raises(type(error)):
+            async with limiter.async_slot("/test"):
+                raise error
+
+        assert limiter.limit == 4
+        assert limiter.in_flight == 0
+        assert limiter.as_dict()["decreases"] == 1
+
+    @pytest.mark.asyncio
+    async def test_marked_slot_halves_limit(self):
+        """Test that a request rejected as overloaded decreases the limit."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+
+        async with limiter.async_slot("/test") as slot:
+            slot.mark_overloaded()
+
+        assert limiter.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_other_errors_do_not_decrease(self):
+        """Test that errors unrelated to load keep the limit."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+
+        with pytest.raises(ValueError):
+            async with limiter.async_slot("/test"):
+                raise ValueError
+
+        assert limiter.limit == 8
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_one_decrease_per_overload_episode(self):
+        """Test that concurrent timeouts halve the limit only once."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+        release = asyncio.Event()
+
+        async def request():
+            async with limiter.async_slot("/test"):
+                await release.wait()
+                raise asyncio.TimeoutError
+
+        tasks = [asyncio.create_task(request()) for _ in range(4)]
+        await _settle()
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(result, asyncio.TimeoutError) for result in results)
+        assert limiter.limit == 4
+        stats = limiter.as_dict()
+        assert stats["overloads"] == 4
+        assert stats["decreases"] == 1
+
+    @pytest.mark.asyncio
+    async def test_limit_floor(self):
+        """Test that the limit never drops below min_limit."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1)
+
+        for _ in range(3):
+            async with limiter.async_slot("/test") as slot:
+                slot.mark_overloaded()
+
+        assert limiter.limit == 1
+        assert limiter.as_dict()["decreases"] == 1
+
+    @pytest.mark.asyncio
+    async def test_latency_spike_decreases_limit(self):
+        """Test that a request far slower than its endpoint's baseline counts as overload."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, latency_tolerance=3)
+        now = 0.0
+
+        with patch(
+            "custom_components.eltako_esr62pf.concurrency.time.monotonic",
+            lambda: now,
+        ):
+            for _ in range(CONCURRENCY_MIN_SAMPLES):
+                async with limiter.async_slot("/test"):
+                    now += 0.1
+            # Slow on another endpoint does not compare to this baseline
+            async with limiter.async_slot("/other"):
+                now += 1.0
+            assert limiter.limit == 8
+
+            async with limiter.async_slot("/test"):
+                now += 1.0
+
+        assert limiter.limit == 4
+        assert limiter.as_dict()["latency_spikes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_jitter_on_fast_responses_is_ignored(self):
+        """Test that a spike must also exceed the baseline by a minimum time."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, latency_tolerance=3)
+        now = 0.0
+
+        with patch(
+            "custom_components.eltako_esr62pf.concurrency.time.monotonic",
+            lambda: now,
+        ):
+            for _ in range(CONCURRENCY_MIN_SAMPLES):
+                async with limiter.async_slot("/test"):
+                    now += 0.01
+            async with limiter.async_slot("/test"):
+                now += 0.2
+
+        assert limiter.limit == 8
+        assert limiter.as_dict()["latency_spikes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_decrease_holds_back_waiters(self):
+        """Test that a lowered limit is enforced once requests finish."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+        release = asyncio.Event()
+        started = []
+
+        async def request(index):
+            async with limiter.async_slot("/test"):
+                started.append(index)
+                await release.wait()
+
+        async with limiter.async_slot("/test") as slot:
+            slot.mark_overloaded()
+        assert limiter.limit == 1
+
+        tasks = [asyncio.create_task(request(index)) for index in range(2)]
+        await _settle()
+        assert started == [0]
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert started == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_queue(self):
+        """Test that a cancelled waiting request does not take a slot."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        release = asyncio.Event()
+
+        async def request():
+            async with limiter.async_slot("/test"):
+                await release.wait()
+
+        holder = asyncio.create_task(request())
+        await _settle()
+        waiter = asyncio.create_task(request())
+        await _settle()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter.as_dict()["waiting"] == 0
+        release.set()
+        await holder
+        assert limiter.in_flight == 0
+
+        async with limiter.async_slot("/test"):
+            assert limiter.in_flight == 1
@@ -1,6 +1,7 @@
 """Tests for comprehensive error handling and recovery."""
 import asyncio
 from datetime import timedelta
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp
@@ -11,8 +12,10 @@ from homeassistant.helpers.update_coordinator import UpdateFailed
 
 from custom_components.eltako_esr62pf.api import EltakoAPI
 from custom_components.eltako_esr62pf.const import (
+    DEFAULT_CIRCUIT_RECOVERY_TIMEOUT,
     ENDPOINT_DEVICES,
     ENDPOINT_LOGIN,
+    ENDPOINT_RELAY,
     ERROR_MSG_AUTHENTICATION,
     ERROR_MSG_CONNECTION,
     ERROR_MSG_TIMEOUT,
@@ -20,6 +23,7 @@ from custom_components.eltako_esr62pf.const import (
     NOTIFICATION_ID_PREFIX,
 )
 from custom_components.eltako_esr62pf.coordinator import EltakoDataUpdateCoordinator
+from custom_components.eltako_esr62pf.models import EltakoDevice, RelayState
 from custom_components.eltako_esr62pf.exceptions import (
     EltakoAuthenticationError,
     EltakoConnectionError,
@@ -74,9 +78,14 @@ class TestExponentialBackoff:
             )
 
             import time
-            start = time.time()
-            result = await api_client._make_request("GET", "/api/v0/devices")
-            elapsed = time.time() - start
+            # Pin the full-jitter backoff to its ceiling
+            with patch(
+                "custom_components.eltako_esr62pf.retry.random.uniform",
+                side_effect=lambda low, high: high,
+            ):
+                start = time.time()
+                result = await api_client._make_request("GET", "/api/v0/devices")
+                elapsed = time.time() - start
 
             # Should wait 2^0 + 2^1 = 3 seconds
             assert elapsed >= 3.0
@@ -101,9 +110,14 @@ class TestExponentialBackoff:
             )
 
             import time
-            start = time.time()
-            result = await api_client._make_request("GET", "/api/v0/devices")
-            elapsed = time.time() - start
+            # Pin the full-jitter backoff to its ceiling
+            with patch(
+                "custom_components.eltako_esr62pf.retry.random.uniform",
+                side_effect=lambda low, high: high,
+            ):
+                start = time.time()
+                result = await api_client._make_request("GET", "/api/v0/devices")
+                elapsed = time.time() - start
 
             # Should wait 2^0 = 1 second
             assert elapsed >= 1.0
@@ -223,7 +237,12 @@ class TestCoordinatorErrorHandling:
                 status=200,
             )
 
-            await coordinator._async_update_data()
+            # Let the circuit breaker's recovery timeout pass so it probes
+            with patch(
+                "custom_components.eltako_esr62pf.circuit_breaker.time.monotonic",
+                return_value=time.monotonic() + DEFAULT_CIRCUIT_RECOVERY_TIMEOUT,
+            ):
+                await coordinator._async_update_data()
 
             # Notification should be cleared
             assert coordinator._notification_shown is False
@@ -234,8 +253,8 @@ class TestCoordinatorErrorHandling:
         """Test that devices are marked unavailable on connection failure."""
         # Setup initial devices
         coordinator._devices = {
-            "device-1": {"state": "on", "available": True, "name": "Device 1", "guid": "device-1"},
-            "device-2": {"state": "off", "available": True, "name": "Device 2", "guid": "device-2"},
+            "device-1": RelayState(EltakoDevice("device-1", "Device 1"), state="on"),
+            "device-2": RelayState(EltakoDevice("device-2", "Device 2"), state="off"),
         }
 
         with aioresponses() as mock_resp:
@@ -259,15 +278,17 @@ class TestCoordinatorErrorHandling:
                 await coordinator._async_update_data()
 
             # All devices should be marked unavailable
-            assert coordinator._devices["device-1"]["available"] is False
-            assert coordinator._devices["device-2"]["available"] is False
+            assert coordinator._devices["device-1"].available is False
+            assert coordinator._devices["device-2"].available is False
 
     @pytest.mark.asyncio
     async def test_devices_marked_available_on_recovery(self, hass, coordinator):
         """Test that devices are marked available on recovery."""
         # Setup initial unavailable devices
         coordinator._devices = {
-            "device-1": {"state": "on", "available": False, "name": "Device 1", "guid": "device-1"},
+            "device-1": RelayState(
+                EltakoDevice("device-1", "Device 1"), state="on", available=False
+            ),
         }
         coordinator._consecutive_failures = 2
 
@@ -286,11 +307,16 @@ class TestCoordinatorErrorHandling:
                 ],
                 status=200,
             )
+            mock_resp.get(
+                f"{coordinator.api.base_url}{ENDPOINT_RELAY.format(device_guid='device-1')}",
+                payload={"type": "enumeration", "identifier": "relay", "value": "on"},
+                status=200,
+            )
 
             await coordinator._async_update_data()
 
             # Device should be marked available
-            assert coordinator._devices["device-1"]["available"] is True
+            assert coordinator._devices["device-1"].available is True
             assert coordinator.consecutive_failures == 0
 
 
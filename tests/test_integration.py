@@ -1,8 +1,13 @@
 """Integration tests for Eltako ESR62PF-IP Home Assistant integration."""
+import asyncio
+import copy
+from dataclasses import replace
 from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from aioresponses import CallbackResult, aioresponses
 import pytest
+from yarl import URL
 
 from homeassistant import config_entries
 from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
@@ -17,47 +22,89 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import entity_registry as er
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
 
+from custom_components.eltako_esr62pf.api import EltakoAPI
 from custom_components.eltako_esr62pf.const import (
+    CONF_CERT_FINGERPRINT,
+    CONF_CIRCUIT_FAILURE_THRESHOLD,
+    CONF_CIRCUIT_RECOVERY_TIMEOUT,
+    CONF_DEVICE_CACHE_MAX_STALE,
+    CONF_DEVICE_CACHE_TTL,
     CONF_POLL_INTERVAL,
     CONF_POP_CREDENTIAL,
+    CONF_PROACTIVE_TOKEN_REFRESH,
+    CONF_RATE_LIMIT,
+    CONF_RATE_LIMIT_BURST,
+    DATA_SESSION_POOL,
     DEFAULT_PORT,
+    DEFAULT_TOKEN_REFRESH_FRACTION,
+    DEVICE_CACHE_TTL,
     DOMAIN,
+    ENDPOINT_DEVICES,
+    ENDPOINT_LOGIN,
     RELAY_STATE_OFF,
     RELAY_STATE_ON,
+    SERVICE_SET_RELAYS,
+)
+from custom_components.eltako_esr62pf.coordinator import EltakoDataUpdateCoordinator
+from custom_components.eltako_esr62pf.diagnostics import (
+    async_get_config_entry_diagnostics,
 )
 from custom_components.eltako_esr62pf.exceptions import (
     EltakoAuthenticationError,
     EltakoConnectionError,
     EltakoTimeoutError,
 )
+from custom_components.eltako_esr62pf.models import (
+    BulkRelayResult,
+    EltakoDevice,
+    RelayCommandResult,
+    RelayFunction,
+)
+from custom_components.eltako_esr62pf.switch import EltakoSwitchEntity
 
 
 # Test fixtures and helpers
 
+def make_devices(raw_devices: list[dict]) -> list[EltakoDevice]:
+    """Parse raw device list entries the way the API client does."""
+    return [EltakoDevice.from_json(device) for device in raw_devices]
+
+
 @pytest.fixture
 def mock_device_data():
     """Return mock device data from API."""
-    return [
+    return make_devices([
         {
-            "guid": "device-guid-1",
-            "name": "Living Room Light",
+            "deviceGuid": "device-guid-1",
+            "displayName": "Living Room Light",
             "functions": [{"identifier": "relay", "type": "enumeration"}],
         },
         {
-            "guid": "device-guid-2",
-            "name": "Kitchen Switch",
+            "deviceGuid": "device-guid-2",
+            "displayName": "Kitchen Switch",
             "functions": [{"identifier": "relay", "type": "enumeration"}],
         },
         {
-            "guid": "device-guid-3",
-            "name": "Bedroom Fan",
+            "deviceGuid": "device-guid-3",
+            "displayName": "Bedroom Fan",
             "functions": [{"identifier": "relay", "type": "enumeration"}],
         },
-    ]
+    ])
+
+
+async def bulk_success(states: dict[str, str]) -> BulkRelayResult:
+    """Report every relay of a bulk operation as set."""
+    return BulkRelayResult(
+        {
+            device_guid: RelayCommandResult(device_guid, state, 0.01)
+            for device_guid, state in states.items()
+        }
+    )
 
 
 @pytest.fixture
@@ -67,9 +114,14 @@ def mock_api():
     api.async_login = AsyncMock(return_value="test_api_key")
     api.async_get_devices = AsyncMock()
     api.async_set_relay = AsyncMock()
+    api.async_set_relays = AsyncMock(side_effect=bulk_success)
+    api.async_get_relay_states = AsyncMock(return_value={})
     api.async_close = AsyncMock()
+    api.get_stats = MagicMock(return_value={"relay_scheduler": {"lanes": {}}})
+    api.add_devices_listener = MagicMock()
     api._ip_address = "192.168.1.100"
     api._port = 443
+    api.circuit_state = "closed"
     return api
 
 
@@ -283,6 +335,191 @@ async def test_options_flow_disable_polling(hass: HomeAssistant, mock_api, mock_
     assert coordinator.update_interval is None
 
 
+async def test_options_flow_certificate_fingerprint(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test pinning a certificate fingerprint through the options flow."""
+    entry = await setup_integration(hass, mock_api, mock_device_data)
+    fingerprint = ":".join(["AB"] * 32)
+
+    with patch(
+        "custom_components.eltako_esr62pf.EltakoAPI",
+        return_value=mock_api,
+    ) as mock_api_class:
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                CONF_POP_CREDENTIAL: "test_pop",
+                "enable_polling": False,
+                CONF_CERT_FINGERPRINT: "invalid",
+            },
+        )
+        assert result["type"] == "form"
+        assert result["errors"][CONF_CERT_FINGERPRINT] == "invalid_fingerprint"
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                CONF_POP_CREDENTIAL: "test_pop",
+                "enable_polling": False,
+                CONF_CERT_FINGERPRINT: fingerprint,
+            },
+        )
+        assert result["type"] == "create_entry"
+        await hass.async_block_till_done()
+
+    assert entry.options[CONF_CERT_FINGERPRINT] == fingerprint
+    assert mock_api_class.call_args.kwargs["cert_fingerprint"] == fingerprint
+
+
+async def test_options_flow_circuit_breaker_thresholds(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test configuring the circuit breaker through the options flow."""
+    entry = await setup_integration(hass, mock_api, mock_device_data)
+
+    with patch(
+        "custom_components.eltako_esr62pf.EltakoAPI",
+        return_value=mock_api,
+    ) as mock_api_class:
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                CONF_POP_CREDENTIAL: "test_pop",
+                "enable_polling": False,
+                CONF_CIRCUIT_FAILURE_THRESHOLD: 5,
+                CONF_CIRCUIT_RECOVERY_TIMEOUT: 60,
+            },
+        )
+        assert result["type"] == "create_entry"
+        await hass.async_block_till_done()
+
+    assert entry.options[CONF_CIRCUIT_FAILURE_THRESHOLD] == 5
+    assert entry.options[CONF_CIRCUIT_RECOVERY_TIMEOUT] == 60
+    breaker = mock_api_class.call_args.kwargs["circuit_breaker"]
+    assert breaker.as_dict()["failure_threshold"] == 5
+    assert breaker.as_dict()["recovery_timeout"] == 60
+
+
+async def test_options_flow_rate_limit(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test configuring the rate limiter through the options flow."""
+    entry = await setup_integration(hass, mock_api, mock_device_data)
+
+    with patch(
+        "custom_components.eltako_esr62pf.EltakoAPI",
+        return_value=mock_api,
+    ) as mock_api_class:
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                CONF_POP_CREDENTIAL: "test_pop",
+                "enable_polling": False,
+                CONF_RATE_LIMIT: 4,
+                CONF_RATE_LIMIT_BURST: 8,
+            },
+        )
+        assert result["type"] == "create_entry"
+        await hass.async_block_till_done()
+
+    assert entry.options[CONF_RATE_LIMIT] == 4
+    assert entry.options[CONF_RATE_LIMIT_BURST] == 8
+    limiter = mock_api_class.call_args.kwargs["rate_limiter"]
+    assert limiter.as_dict()["rate"] == 4
+    assert limiter.as_dict()["burst"] == 8
+
+
+async def test_options_flow_proactive_token_refresh(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that the background token refresh is off unless enabled."""
+    entry = await setup_integration(hass, mock_api, mock_device_data)
+
+    with patch(
+        "custom_components.eltako_esr62pf.EltakoAPI",
+        return_value=mock_api,
+    ) as mock_api_class:
+        await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        assert mock_api_class.call_args.kwargs["token_refresh_fraction"] is None
+
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                CONF_POP_CREDENTIAL: "test_pop",
+                "enable_polling": False,
+                CONF_PROACTIVE_TOKEN_REFRESH: True,
+            },
+        )
+        assert result["type"] == "create_entry"
+        await hass.async_block_till_done()
+
+    assert entry.options[CONF_PROACTIVE_TOKEN_REFRESH] is True
+    assert (
+        mock_api_class.call_args.kwargs["token_refresh_fraction"]
+        == DEFAULT_TOKEN_REFRESH_FRACTION
+    )
+
+
+async def test_options_flow_device_cache(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test configuring the device list cache through the options flow."""
+    entry = await setup_integration(hass, mock_api, mock_device_data)
+
+    with patch(
+        "custom_components.eltako_esr62pf.EltakoAPI",
+        return_value=mock_api,
+    ) as mock_api_class:
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                CONF_POP_CREDENTIAL: "test_pop",
+                "enable_polling": False,
+                CONF_DEVICE_CACHE_TTL: 120,
+                CONF_DEVICE_CACHE_MAX_STALE: 60,
+            },
+        )
+        assert result["type"] == "form"
+        assert result["errors"] == {
+            CONF_DEVICE_CACHE_MAX_STALE: "invalid_device_cache_max_stale"
+        }
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                CONF_POP_CREDENTIAL: "test_pop",
+                "enable_polling": False,
+                CONF_DEVICE_CACHE_TTL: 120,
+                CONF_DEVICE_CACHE_MAX_STALE: 1200,
+            },
+        )
+        assert result["type"] == "create_entry"
+        await hass.async_block_till_done()
+
+    assert entry.options[CONF_DEVICE_CACHE_TTL] == 120
+    assert entry.options[CONF_DEVICE_CACHE_MAX_STALE] == 1200
+    assert mock_api_class.call_args.kwargs["device_cache_ttl"] == 120
+    assert mock_api_class.call_args.kwargs["device_cache_max_stale"] == 1200
+
+
+async def test_switch_reports_circuit_state(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that the circuit breaker state is exposed as a switch attribute."""
+    await setup_integration(hass, mock_api, mock_device_data)
+
+    entity_id = await get_entity_id(hass, "device-guid-1")
+    state = hass.states.get(entity_id)
+    assert state.attributes["circuit_state"] == "closed"
+
+
 # Entity Creation and Registration Tests
 
 async def test_entity_creation_all_devices(hass: HomeAssistant, mock_api, mock_device_data):
@@ -298,12 +535,12 @@ async def test_entity_creation_all_devices(hass: HomeAssistant, mock_api, mock_d
 
     # Verify entity attributes for each device
     for device in mock_device_data:
-        entity_id = await get_entity_id(hass, device["guid"])
+        entity_id = await get_entity_id(hass, device.guid)
         assert entity_id is not None
 
         # Get entity from registry
         entity = entity_registry.async_get(entity_id)
-        assert entity.unique_id == device["guid"]
+        assert entity.unique_id == device.guid
         assert entity.platform == DOMAIN
         assert entity.domain == SWITCH_DOMAIN
 
@@ -486,8 +723,8 @@ async def test_polling_enabled_periodic_updates(hass: HomeAssistant, mock_api, m
     await coordinator.async_refresh()
     await hass.async_block_till_done()
 
-    # Verify API was called
-    mock_api.async_get_devices.assert_called()
+    # Verify polls read the live device list
+    mock_api.async_get_devices.assert_awaited_once_with(force_refresh=True)
 
 
 async def test_polling_disabled_no_background_updates(hass: HomeAssistant, mock_api, mock_device_data):
@@ -508,6 +745,139 @@ async def test_polling_disabled_no_background_updates(hass: HomeAssistant, mock_
     mock_api.async_get_devices.assert_not_called()
 
 
+async def test_first_refresh_reads_cached_device_list(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that setup checks the relays through the device list cache."""
+    entry = await setup_integration(hass, mock_api, mock_device_data, poll_interval=10)
+
+    assert entry.state == config_entries.ConfigEntryState.LOADED
+    mock_api.async_get_devices.assert_awaited_with(force_refresh=False)
+
+
+async def test_requested_refresh_keeps_commanded_states(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that a cached device list updates relays but not commanded states."""
+    devices = copy.deepcopy(mock_device_data)
+    devices[0] = replace(devices[0], relay=RelayFunction("relay", "enumeration", RELAY_STATE_OFF))
+    entry = await setup_integration(hass, mock_api, devices, poll_interval=None)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    entity_id = await get_entity_id(hass, "device-guid-1")
+
+    await hass.services.async_call(
+        SWITCH_DOMAIN,
+        SERVICE_TURN_ON,
+        {"entity_id": entity_id},
+        blocking=True,
+    )
+
+    # The cached list still reports the relay as it was before the command
+    devices[1] = replace(devices[1], name="Kitchen Switch (renamed)")
+    mock_api.async_get_devices.return_value = list(devices)
+    mock_api.async_get_devices.reset_mock()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    mock_api.async_get_devices.assert_awaited_once_with(force_refresh=False)
+    assert coordinator.data["device-guid-2"].name == "Kitchen Switch (renamed)"
+    assert coordinator.data["device-guid-1"].state == RELAY_STATE_ON
+    assert hass.states.get(entity_id).state == STATE_ON
+
+
+async def test_background_device_refresh_updates_devices(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that a device list refreshed in the background reaches the entities."""
+    entry = await setup_integration(hass, mock_api, mock_device_data, poll_interval=None)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    listener = mock_api.add_devices_listener.call_args.args[0]
+
+    devices = copy.deepcopy(mock_device_data)
+    devices[1] = replace(devices[1], name="Kitchen Switch (renamed)")
+    mock_api.async_get_devices.return_value = devices
+    mock_api.async_get_devices.reset_mock()
+    listener()
+    await hass.async_block_till_done()
+
+    mock_api.async_get_devices.assert_awaited_once_with(force_refresh=False)
+    assert coordinator.data["device-guid-2"].name == "Kitchen Switch (renamed)"
+
+
+async def test_background_device_refresh_ignored_while_polling(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that polls, not background refreshes, update a polling coordinator."""
+    await setup_integration(hass, mock_api, mock_device_data, poll_interval=10)
+    listener = mock_api.add_devices_listener.call_args.args[0]
+
+    mock_api.async_get_devices.reset_mock()
+    listener()
+    await hass.async_block_till_done()
+
+    mock_api.async_get_devices.assert_not_called()
+
+
+async def test_poll_joins_background_device_refresh(hass: HomeAssistant):
+    """Test that a poll during a background device list refresh shares its request."""
+    api = EltakoAPI(ip_address="192.168.1.100", pop_credential="test_pop", verify_ssl=False)
+    coordinator = EltakoDataUpdateCoordinator(
+        hass=hass, api=api, update_interval=timedelta(seconds=30)
+    )
+    devices_url = f"{api.base_url}{ENDPOINT_DEVICES}"
+
+    def device_list(state: str) -> list[dict]:
+        return [
+            {
+                "deviceGuid": "device-guid-1",
+                "displayName": "Living Room Light",
+                "functions": [
+                    {"identifier": "relay", "type": "enumeration", "value": state}
+                ],
+            }
+        ]
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_device_list(url, **kwargs):
+        started.set()
+        await release.wait()
+        return CallbackResult(payload=device_list(RELAY_STATE_ON))
+
+    with aioresponses() as mock_resp:
+        mock_resp.post(f"{api.base_url}{ENDPOINT_LOGIN}", payload={"apiKey": "key"})
+        mock_resp.get(devices_url, payload=device_list(RELAY_STATE_OFF))
+        mock_resp.get(devices_url, callback=slow_device_list)
+        mock_resp.get(devices_url, payload=device_list(RELAY_STATE_OFF))
+
+        await coordinator.async_refresh()
+        assert coordinator.data["device-guid-1"].state == RELAY_STATE_OFF
+
+        # A cached read of the stale list starts the background refresh
+        api._devices_cache_timestamp -= DEVICE_CACHE_TTL + 1
+        await api.async_get_devices()
+        await started.wait()
+
+        # The poll arrives while the refresh request is in flight
+        poll = asyncio.create_task(coordinator.async_refresh())
+        for _ in range(10):
+            await asyncio.sleep(0)
+        release.set()
+        await poll
+        await api._device_refresh_task
+
+        requests = mock_resp.requests[("GET", URL(devices_url))]
+
+    await api.async_close()
+
+    assert len(requests) == 2
+    stats = api.get_stats()["device_cache"]
+    assert stats["background_refreshes"] == 1
+    assert stats["requests_coalesced"] == 1
+    assert coordinator.data["device-guid-1"].state == RELAY_STATE_ON
+
+
 # Network Error and Recovery Tests
 
 async def test_network_error_handling(hass: HomeAssistant, mock_api, mock_device_data):
@@ -532,7 +902,7 @@ async def test_network_error_handling(hass: HomeAssistant, mock_api, mock_device
     coordinator = hass.data[DOMAIN][entry.entry_id]
     device_data = coordinator.data.get("device-guid-1")
     assert device_data is not None
-    assert device_data["available"] is False
+    assert device_data.available is False
 
 
 async def test_network_error_recovery(hass: HomeAssistant, mock_api, mock_device_data):
@@ -584,7 +954,7 @@ async def test_timeout_error_handling(hass: HomeAssistant, mock_api, mock_device
     # Verify error was handled
     coordinator = hass.data[DOMAIN][entry.entry_id]
     device_data = coordinator.data.get("device-guid-1")
-    assert device_data["available"] is False
+    assert device_data.available is False
 
 
 # Re-authentication Tests
@@ -693,34 +1063,69 @@ async def test_integration_unload(hass: HomeAssistant, mock_api, mock_device_dat
     assert entry.entry_id not in hass.data.get(DOMAIN, {})
 
 
+async def test_integration_shares_connection_pool(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that setup acquires a shared session which unload closes."""
+    entry = await setup_integration(hass, mock_api, mock_device_data)
+
+    pool = hass.data[DATA_SESSION_POOL]
+    session = pool.acquire("192.168.1.100", DEFAULT_PORT)
+    await pool.async_release("192.168.1.100", DEFAULT_PORT)
+    assert not session.closed
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert session.closed
+
+
+
+async def test_failed_platform_setup_releases_session(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that a failure after the first refresh still releases the pool."""
+    with patch.object(
+        hass.config_entries,
+        "async_forward_entry_setups",
+        side_effect=RuntimeError("platform failed"),
+    ):
+        entry = await setup_integration(hass, mock_api, mock_device_data)
+
+    assert entry.state == config_entries.ConfigEntryState.SETUP_ERROR
+    mock_api.async_close.assert_awaited()
+    assert entry.entry_id not in hass.data.get(DOMAIN, {})
+    assert not hass.data[DATA_SESSION_POOL]._sessions
+
+
 # Device Filtering Tests
 
 
 async def test_devices_without_relay_function_filtered_out(hass: HomeAssistant, mock_api):
     """Test that devices without relay functions are not added as entities."""
     # Create device data with mixed relay and non-relay devices
-    mixed_device_data = [
+    mixed_device_data = make_devices([
         {
-            "guid": "relay-device-1",
-            "name": "Relay Switch",
+            "deviceGuid": "relay-device-1",
+            "displayName": "Relay Switch",
             "functions": [{"identifier": "relay", "type": "enumeration"}],
         },
         {
-            "guid": "sensor-device-1",
-            "name": "Temperature Sensor",
+            "deviceGuid": "sensor-device-1",
+            "displayName": "Temperature Sensor",
             "functions": [{"identifier": "temperature", "type": "value"}],
         },
         {
-            "guid": "relay-device-2",
-            "name": "Another Relay",
+            "deviceGuid": "relay-device-2",
+            "displayName": "Another Relay",
             "functions": [{"identifier": "relay", "type": "enumeration"}],
         },
         {
-            "guid": "empty-functions-device",
-            "name": "Device Without Functions",
+            "deviceGuid": "empty-functions-device",
+            "displayName": "Device Without Functions",
             "functions": [],
         },
-    ]
+    ])
 
     # Setup integration with mixed devices
     entry = await setup_integration(hass, mock_api, mixed_device_data)
@@ -743,18 +1148,18 @@ async def test_devices_without_relay_function_filtered_out(hass: HomeAssistant,
 async def test_all_devices_without_relay_functions(hass: HomeAssistant, mock_api):
     """Test handling when no devices have relay functions."""
     # Create device data with only non-relay devices
-    non_relay_devices = [
+    non_relay_devices = make_devices([
         {
-            "guid": "sensor-device-1",
-            "name": "Temperature Sensor",
+            "deviceGuid": "sensor-device-1",
+            "displayName": "Temperature Sensor",
             "functions": [{"identifier": "temperature", "type": "value"}],
         },
         {
-            "guid": "sensor-device-2",
-            "name": "Humidity Sensor",
+            "deviceGuid": "sensor-device-2",
+            "displayName": "Humidity Sensor",
             "functions": [{"identifier": "humidity", "type": "value"}],
         },
-    ]
+    ])
 
     # Setup integration with non-relay devices
     entry = await setup_integration(hass, mock_api, non_relay_devices)
@@ -769,17 +1174,17 @@ async def test_all_devices_without_relay_functions(hass: HomeAssistant, mock_api
 async def test_device_with_multiple_functions_including_relay(hass: HomeAssistant, mock_api):
     """Test that devices with multiple functions including relay are added."""
     # Create device with multiple functions including relay
-    multi_function_devices = [
+    multi_function_devices = make_devices([
         {
-            "guid": "multi-device-1",
-            "name": "Multi-Function Device",
+            "deviceGuid": "multi-device-1",
+            "displayName": "Multi-Function Device",
             "functions": [
                 {"identifier": "temperature", "type": "value"},
                 {"identifier": "relay", "type": "enumeration"},
                 {"identifier": "power", "type": "value"},
             ],
         },
-    ]
+    ])
 
     # Setup integration
     entry = await setup_integration(hass, mock_api, multi_function_devices)
@@ -795,18 +1200,18 @@ async def test_device_with_multiple_functions_including_relay(hass: HomeAssistan
 async def test_device_with_missing_functions_key(hass: HomeAssistant, mock_api):
     """Test that devices missing the functions key are filtered out."""
     # Create device data with missing functions key
-    devices_missing_functions = [
+    devices_missing_functions = make_devices([
         {
-            "guid": "relay-device-1",
-            "name": "Relay Switch",
+            "deviceGuid": "relay-device-1",
+            "displayName": "Relay Switch",
             "functions": [{"identifier": "relay", "type": "enumeration"}],
         },
         {
-            "guid": "device-no-functions-key",
-            "name": "Device Without Functions Key",
+            "deviceGuid": "device-no-functions-key",
+            "displayName": "Device Without Functions Key",
             # No functions key at all
         },
-    ]
+    ])
 
     # Setup integration
     entry = await setup_integration(hass, mock_api, devices_missing_functions)
@@ -817,3 +1222,294 @@ async def test_device_with_missing_functions_key(hass: HomeAssistant, mock_api):
 
     assert len(entities) == 1
     assert entities[0].unique_id == "relay-device-1"
+
+
+async def test_quiet_poll_skips_entity_updates(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that a poll returning an unchanged device list writes no state."""
+    entry = await setup_integration(hass, mock_api, mock_device_data)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    previous_data = coordinator.data
+
+    with patch.object(
+        EltakoSwitchEntity, "async_write_ha_state", autospec=True
+    ) as mock_write:
+        # A fresh but identical device list from the API
+        mock_api.async_get_devices.return_value = copy.deepcopy(mock_device_data)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert coordinator.data is previous_data
+    mock_write.assert_not_called()
+
+
+async def test_changed_device_updates_only_its_entity(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that only the entity of a changed device writes its state."""
+    entry = await setup_integration(hass, mock_api, mock_device_data)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    devices = copy.deepcopy(mock_device_data)
+    devices[1] = replace(devices[1], name="Kitchen Switch (renamed)")
+    mock_api.async_get_devices.return_value = devices
+
+    with patch.object(
+        EltakoSwitchEntity, "async_write_ha_state", autospec=True
+    ) as mock_write:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    written = [call.args[0]._device_guid for call in mock_write.call_args_list]
+    assert written == ["device-guid-2"]
+    assert coordinator.data["device-guid-2"].name == "Kitchen Switch (renamed)"
+
+
+async def test_poll_reflects_wall_switch_changes(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that a relay switched at the wall updates only its entity."""
+    mock_api.async_get_relay_states.return_value = {
+        "device-guid-1": RELAY_STATE_OFF,
+        "device-guid-2": RELAY_STATE_OFF,
+    }
+    entry = await setup_integration(hass, mock_api, mock_device_data, poll_interval=30)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    guids = list(coordinator.data)
+    assert coordinator.data["device-guid-2"].state == RELAY_STATE_OFF
+
+    mock_api.async_get_devices.return_value = copy.deepcopy(mock_device_data)
+    mock_api.async_get_relay_states.return_value = {
+        "device-guid-1": RELAY_STATE_OFF,
+        "device-guid-2": RELAY_STATE_ON,
+    }
+
+    with patch.object(
+        EltakoSwitchEntity, "async_write_ha_state", autospec=True
+    ) as mock_write:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    mock_api.async_get_relay_states.assert_awaited_with(guids)
+    written = [call.args[0]._device_guid for call in mock_write.call_args_list]
+    assert written == ["device-guid-2"]
+    assert coordinator.data["device-guid-2"].state == RELAY_STATE_ON
+
+
+async def test_poll_uses_relay_states_from_device_list(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that reported relay states need no per-relay reads."""
+    devices = copy.deepcopy(mock_device_data)
+    devices[0] = replace(devices[0], relay=RelayFunction("relay", "enumeration", RELAY_STATE_ON))
+    devices[1] = replace(devices[1], relay=RelayFunction("relay", "enumeration", RELAY_STATE_OFF))
+    mock_api.async_get_relay_states.return_value = {"device-guid-3": RELAY_STATE_OFF}
+
+    entry = await setup_integration(hass, mock_api, devices, poll_interval=30)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    mock_api.async_get_relay_states.reset_mock()
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    mock_api.async_get_devices.assert_awaited_with(force_refresh=True)
+    mock_api.async_get_relay_states.assert_awaited_once_with(["device-guid-3"])
+    assert coordinator.data["device-guid-1"].state == RELAY_STATE_ON
+    assert coordinator.data["device-guid-2"].state == RELAY_STATE_OFF
+    assert coordinator.data["device-guid-3"].state == RELAY_STATE_OFF
+
+
+async def test_device_state_change_wakes_only_its_entity(
+    hass: HomeAssistant, mock_api
+):
+    """Test that a scene over many relays costs one write per relay."""
+    devices = make_devices(
+        {
+            "deviceGuid": f"device-guid-{index}",
+            "displayName": f"Relay {index}",
+            "functions": [{"identifier": "relay", "type": "enumeration"}],
+        }
+        for index in range(30)
+    )
+    entry = await setup_integration(hass, mock_api, devices)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    generic_listener = MagicMock()
+    coordinator.async_add_listener(generic_listener)
+
+    with patch.object(
+        EltakoSwitchEntity, "async_write_ha_state", autospec=True
+    ) as mock_write:
+        for device in devices:
+            await coordinator.async_set_device_state(device.guid, RELAY_STATE_ON)
+
+    assert mock_write.call_count == 30
+    written = [call.args[0]._device_guid for call in mock_write.call_args_list]
+    assert written == [device.guid for device in devices]
+    # Listeners without a device context still see every change
+    assert generic_listener.call_count == 30
+
+
+async def test_device_list_diff(hass: HomeAssistant, mock_api, mock_device_data):
+    """Test added, removed and changed devices in the device list diff."""
+    entry = await setup_integration(hass, mock_api, mock_device_data)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator._devices["device-guid-1"] = replace(
+        coordinator._devices["device-guid-1"], state=RELAY_STATE_ON
+    )
+
+    devices = copy.deepcopy(mock_device_data)
+    devices[0] = replace(devices[0], name="Living Room Lamp")
+    del devices[2]
+    devices.extend(
+        make_devices(
+            [
+                {
+                    "deviceGuid": "device-guid-4",
+                    "displayName": "Garage Door",
+                    "functions": [{"identifier": "relay", "type": "enumeration"}],
+                }
+            ]
+        )
+    )
+
+    device_data, diff = coordinator._diff_devices(devices)
+
+    assert diff.added == {"device-guid-4"}
+    assert diff.removed == {"device-guid-3"}
+    assert diff.changed == {"device-guid-1"}
+    # Relay state survives a changed record
+    assert device_data["device-guid-1"].state == RELAY_STATE_ON
+    assert device_data["device-guid-1"].name == "Living Room Lamp"
+    assert device_data["device-guid-2"] is coordinator._devices["device-guid-2"]
+
+
+async def test_config_entry_diagnostics(hass: HomeAssistant, mock_api, mock_device_data):
+    """Test diagnostics redact credentials and include API statistics."""
+    entry = await setup_integration(hass, mock_api, mock_device_data)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"][CONF_POP_CREDENTIAL] == "**REDACTED**"
+    assert diagnostics["coordinator"]["device_count"] == 3
+    assert diagnostics["coordinator"]["circuit_state"] == "closed"
+    assert diagnostics["api"] == {"relay_scheduler": {"lanes": {}}}
+
+
+# Bulk Relay Service Tests
+
+async def test_set_relays_service(hass: HomeAssistant, mock_api, mock_device_data):
+    """Test that set_relays sends one bulk operation and one listener update."""
+    entry = await setup_integration(hass, mock_api, mock_device_data)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    generic_listener = MagicMock()
+    coordinator.async_add_listener(generic_listener)
+    entity_id_1 = await get_entity_id(hass, "device-guid-1")
+    entity_id_2 = await get_entity_id(hass, "device-guid-2")
+
+    with patch.object(
+        EltakoSwitchEntity, "async_write_ha_state", autospec=True
+    ) as mock_write:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_RELAYS,
+            {
+                "relays": [
+                    {"entity_id": entity_id_1, "state": "on"},
+                    {"entity_id": entity_id_2, "state": True},
+                    {"guid": "device-guid-3", "state": "off"},
+                ]
+            },
+            blocking=True,
+        )
+
+    mock_api.async_set_relays.assert_awaited_once_with(
+        {
+            "device-guid-1": RELAY_STATE_ON,
+            "device-guid-2": RELAY_STATE_ON,
+            "device-guid-3": RELAY_STATE_OFF,
+        }
+    )
+    mock_api.async_set_relay.assert_not_called()
+    assert mock_write.call_count == 3
+    generic_listener.assert_called_once()
+    assert coordinator.data["device-guid-1"].state == RELAY_STATE_ON
+    assert coordinator.data["device-guid-3"].state == RELAY_STATE_OFF
+
+
+async def test_set_relays_service_response(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test per-relay outcomes and that a failed relay becomes unavailable."""
+    await setup_integration(hass, mock_api, mock_device_data)
+    entity_id_1 = await get_entity_id(hass, "device-guid-1")
+    entity_id_2 = await get_entity_id(hass, "device-guid-2")
+    error = EltakoTimeoutError("Device not responding")
+    mock_api.async_set_relays.side_effect = None
+    mock_api.async_set_relays.return_value = BulkRelayResult(
+        {
+            "device-guid-1": RelayCommandResult("device-guid-1", RELAY_STATE_ON, 0.02),
+            "device-guid-2": RelayCommandResult(
+                "device-guid-2", RELAY_STATE_ON, 5.0, error
+            ),
+        }
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_RELAYS,
+        {
+            "relays": [
+                {"entity_id": entity_id_1, "state": "on"},
+                {"entity_id": entity_id_2, "state": "on"},
+            ]
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["relays"]["device-guid-1"] == {
+        "entity_id": entity_id_1,
+        "state": RELAY_STATE_ON,
+        "success": True,
+        "latency": 0.02,
+        "error": None,
+    }
+    assert response["relays"]["device-guid-2"]["success"] is False
+    assert response["relays"]["device-guid-2"]["error"] == "Device not responding"
+    assert hass.states.get(entity_id_1).state == STATE_ON
+    assert hass.states.get(entity_id_2).state == STATE_UNAVAILABLE
+
+
+async def test_set_relays_service_failure_raises(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that failed relays raise when no response is requested."""
+    await setup_integration(hass, mock_api, mock_device_data)
+    mock_api.async_set_relays.side_effect = EltakoAuthenticationError("denied")
+
+    with pytest.raises(HomeAssistantError, match="device-guid-1"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_RELAYS,
+            {"relays": [{"guid": "device-guid-1", "state": "on"}]},
+            blocking=True,
+        )
+
+
+async def test_set_relays_service_unknown_target(
+    hass: HomeAssistant, mock_api, mock_device_data
+):
+    """Test that unknown entities and GUIDs are rejected before sending."""
+    await setup_integration(hass, mock_api, mock_device_data)
+
+    for relay in (
+        {"entity_id": "switch.not_eltako", "state": "on"},
+        {"guid": "unknown-guid", "state": "on"},
+    ):
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN, SERVICE_SET_RELAYS, {"relays": [relay]}, blocking=True
+            )
+
+    mock_api.async_set_relays.assert_not_called()
@@ -0,0 +1,34 @@
+"""Tests for Eltako request latency tracking."""
+from custom_components.eltako_esr62pf.latency import LatencyTracker
+
+
+class TestLatencyTracker:
+    """Test the rolling latency window."""
+
+    def test_empty_tracker(self):
+        """Test that an empty tracker has no percentiles."""
+        tracker = LatencyTracker()
+
+        assert len(tracker) == 0
+        assert tracker.percentile(95) is None
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles over the window."""
+        tracker = LatencyTracker()
+        for latency in range(1, 101):
+            tracker.record(latency / 100)
+
+        assert tracker.percentile(50) == 0.5
+        assert tracker.percentile(95) == 0.95
+        assert tracker.percentile(100) == 1.0
+        assert tracker.percentile(0) == 0.01
+
+    def test_window_drops_old_samples(self):
+        """Test that only the most recent samples are kept."""
+        tracker = LatencyTracker(window=3)
+        for latency in (10.0, 0.1, 0.2, 0.3):
+            tracker.record(latency)
+
+        assert len(tracker) == 3
+        assert tracker.percentile(100) == 0.3
+        assert tracker.as_dict()["count"] == 4
@@ -0,0 +1,136 @@
+"""Tests for Eltako data models."""
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
+from custom_components.eltako_esr62pf.const import RELAY_STATE_OFF, RELAY_STATE_ON
+from custom_components.eltako_esr62pf.exceptions import EltakoTimeoutError
+from custom_components.eltako_esr62pf.models import (
+    BulkRelayResult,
+    EltakoDevice,
+    RelayCommandResult,
+    RelayFunction,
+    RelayState,
+    parse_relay_function,
+)
+
+
+class TestParseRelayFunction:
+    """Test extracting the relay function from a functions array."""
+
+    def test_relay_with_value(self):
+        """Test that the relay value is parsed."""
+        functions = [
+            {"identifier": "brightness", "type": "number", "value": 40},
+            {"identifier": "relay", "type": "enumeration", "value": "on"},
+        ]
+
+        assert parse_relay_function(functions) == RelayFunction(
+            identifier="relay", type="enumeration", value=RELAY_STATE_ON
+        )
+
+    def test_relay_without_value(self):
+        """Test that a relay without a reported value has value None."""
+        relay = parse_relay_function([{"identifier": "relay", "type": "enumeration"}])
+
+        assert relay is not None
+        assert relay.value is None
+
+    def test_relay_with_unknown_value(self):
+        """Test that an unknown relay value is dropped."""
+        relay = parse_relay_function(
+            [{"identifier": "relay", "type": "enumeration", "value": "blinking"}]
+        )
+
+        assert relay is not None
+        assert relay.value is None
+
+    def test_no_relay_function(self):
+        """Test devices without a relay function."""
+        assert parse_relay_function([{"identifier": "sensor"}]) is None
+        assert parse_relay_function([]) is None
+        assert parse_relay_function(None) is None
+        assert parse_relay_function(["relay"]) is None
+
+
+class TestEltakoDevice:
+    """Test device records parsed from the device list."""
+
+    def test_from_json(self):
+        """Test parsing a device list entry."""
+        device = EltakoDevice.from_json(
+            {
+                "deviceGuid": "device-1",
+                "displayName": "Relay 1",
+                "productGuid": "prod-1",
+                "functions": [{"identifier": "relay", "type": "enumeration", "value": "on"}],
+                "infos": [{"identifier": "firmware", "value": "1.0"}],
+                "settings": [{"identifier": "mode", "value": "auto"}],
+            }
+        )
+
+        assert device == EltakoDevice(
+            guid="device-1",
+            name="Relay 1",
+            product_guid="prod-1",
+            relay=RelayFunction("relay", "enumeration", RELAY_STATE_ON),
+        )
+
+    def test_from_json_defaults(self):
+        """Test parsing an entry with missing fields."""
+        device = EltakoDevice.from_json({})
+
+        assert device.guid == ""
+        assert device.name == "Unknown"
+        assert device.relay is None
+
+    def test_records_are_frozen_and_slotted(self):
+        """Test that records cannot be modified and have no instance dict."""
+        device = EltakoDevice("device-1", "Relay 1")
+
+        with pytest.raises(FrozenInstanceError):
+            device.name = "Renamed"
+        assert not hasattr(device, "__dict__")
+        assert not hasattr(RelayState(device), "__dict__")
+
+
+class TestRelayState:
+    """Test coordinator relay state records."""
+
+    def test_delegates_to_device(self):
+        """Test that GUID and name come from the device record."""
+        entry = RelayState(EltakoDevice("device-1", "Relay 1"))
+
+        assert entry.guid == "device-1"
+        assert entry.name == "Relay 1"
+        assert entry.state is None
+        assert entry.available is True
+
+    def test_replace_shares_device(self):
+        """Test that a state update shares the device record."""
+        entry = RelayState(EltakoDevice("device-1", "Relay 1"))
+
+        updated = replace(entry, state=RELAY_STATE_ON)
+
+        assert updated is not entry
+        assert updated.device is entry.device
+        assert updated.state == RELAY_STATE_ON
+
+
+class TestBulkRelayResult:
+    """Test aggregated bulk relay outcomes."""
+
+    def test_succeeded_and_failed(self):
+        """Test that outcomes are split by success."""
+        error = EltakoTimeoutError("timeout")
+        result = BulkRelayResult(
+            {
+                "relay-1": RelayCommandResult("relay-1", RELAY_STATE_ON, 0.1),
+                "relay-2": RelayCommandResult("relay-2", RELAY_STATE_OFF, 5.0, error),
+            }
+        )
+
+        assert result.succeeded == ["relay-1"]
+        assert result.failed == {"relay-2": error}
+        assert result.results["relay-1"].success
+        assert not result.results["relay-2"].success
@@ -0,0 +1,172 @@
+"""Tests for Eltako request prioritization."""
+import asyncio
+
+import pytest
+
+from custom_components.eltako_esr62pf.priority import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_METADATA,
+    PRIORITY_RECONCILE,
+    RequestPriorityScheduler,
+)
+
+
+async def _settle():
+    """Let freshly created tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestRequestPriorityScheduler:
+    """Test deferral of background requests."""
+
+    @pytest.mark.asyncio
+    async def test_idle_scheduler_sends_immediately(self):
+        """Test that no class waits while nothing else is pending."""
+        scheduler = RequestPriorityScheduler()
+
+        for priority in (PRIORITY_METADATA, PRIORITY_RECONCILE, PRIORITY_INTERACTIVE):
+            async with scheduler.async_slot(priority):
+                pass
+
+        classes = scheduler.get_stats()["classes"]
+        assert all(stats["deferred"] == 0 for stats in classes.values())
+        assert all(stats["requests"] == 1 for stats in classes.values())
+
+    @pytest.mark.asyncio
+    async def test_background_waits_for_interactive(self):
+        """Test that a poll is sent only after the pending command."""
+        scheduler = RequestPriorityScheduler()
+        release = asyncio.Event()
+        order = []
+
+        async def command():
+            async with scheduler.async_slot(PRIORITY_INTERACTIVE):
+                await release.wait()
+                order.append("command")
+
+        async def poll():
+            async with scheduler.async_slot(PRIORITY_METADATA):
+                order.append("poll")
+
+        command_task = asyncio.create_task(command())
+        await _settle()
+        poll_task = asyncio.create_task(poll())
+        await _settle()
+        assert order == []
+
+        release.set()
+        await asyncio.gather(command_task, poll_task)
+
+        assert order == ["command", "poll"]
+        stats = scheduler.get_stats()["classes"][PRIORITY_METADATA]
+        assert stats["deferred"] == 1
+        assert stats["max_wait"] > 0
+        assert stats["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_interactive_never_waits_for_background(self):
+        """Test that a command is sent while a poll is in flight."""
+        scheduler = RequestPriorityScheduler()
+        release = asyncio.Event()
+
+        async def poll():
+            async with scheduler.async_slot(PRIORITY_METADATA):
+                await release.wait()
+
+        poll_task = asyncio.create_task(poll())
+        await _settle()
+
+        async with scheduler.async_slot(PRIORITY_INTERACTIVE):
+            pass
+
+        release.set()
+        await poll_task
+        assert scheduler.get_stats()["classes"][PRIORITY_INTERACTIVE]["deferred"] == 0
+
+    @pytest.mark.asyncio
+    async def test_metadata_waits_for_reconcile(self):
+        """Test that polls also yield to relay state reads."""
+        scheduler = RequestPriorityScheduler()
+        release = asyncio.Event()
+        order = []
+
+        async def read():
+            async with scheduler.async_slot(PRIORITY_RECONCILE):
+                await release.wait()
+                order.append("read")
+
+        async def poll():
+            async with scheduler.async_slot(PRIORITY_METADATA):
+                order.append("poll")
+
+        tasks = [asyncio.create_task(read())]
+        await _settle()
+        tasks.append(asyncio.create_task(poll()))
+        await _settle()
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert order == ["read", "poll"]
+
+    @pytest.mark.asyncio
+    async def test_same_class_runs_concurrently(self):
+        """Test that requests of one class do not defer each other."""
+        scheduler = RequestPriorityScheduler()
+        active = 0
+        max_active = 0
+
+        async def read():
+            nonlocal active, max_active
+            async with scheduler.async_slot(PRIORITY_RECONCILE):
+                active += 1
+                max_active = max(max_active, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(read() for _ in range(4)))
+
+        assert max_active == 4
+
+    @pytest.mark.asyncio
+    async def test_deferral_is_bounded(self):
+        """Test that a poll is sent after the maximum deferral."""
+        scheduler = RequestPriorityScheduler(max_deferral=0.01)
+        release = asyncio.Event()
+
+        async def command():
+            async with scheduler.async_slot(PRIORITY_INTERACTIVE):
+                await release.wait()
+
+        command_task = asyncio.create_task(command())
+        await _settle()
+
+        async with scheduler.async_slot(PRIORITY_METADATA):
+            assert not command_task.done()
+
+        release.set()
+        await command_task
+        stats = scheduler.get_stats()["classes"][PRIORITY_METADATA]
+        assert stats["expired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_class(self):
+        """Test that a cancelled deferred request no longer blocks others."""
+        scheduler = RequestPriorityScheduler()
+        release = asyncio.Event()
+
+        async def hold(priority):
+            async with scheduler.async_slot(priority):
+                await release.wait()
+
+        command_task = asyncio.create_task(hold(PRIORITY_INTERACTIVE))
+        await _settle()
+        read_task = asyncio.create_task(hold(PRIORITY_RECONCILE))
+        await _settle()
+        read_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await read_task
+
+        assert scheduler.get_stats()["classes"][PRIORITY_RECONCILE]["active"] == 0
+        release.set()
+        await command_task
@@ -0,0 +1,170 @@
+"""Tests for Eltako request rate limiting."""
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+import time
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.eltako_esr62pf.const import RETRY_AFTER_MAX
+from custom_components.eltako_esr62pf.rate_limit import RateLimiter, parse_retry_after
+
+
+class TestParseRetryAfter:
+    """Test parsing Retry-After headers."""
+
+    def test_delay_seconds(self):
+        """Test a delay in seconds."""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(" 0 ") == 0.0
+
+    def test_http_date(self):
+        """Test an HTTP date in the future and in the past."""
+        future = datetime.now(timezone.utc) + timedelta(seconds=30)
+        past = datetime.now(timezone.utc) - timedelta(seconds=30)
+
+        assert 25 < parse_retry_after(format_datetime(future, usegmt=True)) <= 30
+        assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+    @pytest.mark.parametrize("value", [None, "", "soon", "-1", "1.5"])
+    def test_invalid(self, value):
+        """Test that missing or invalid headers are ignored."""
+        assert parse_retry_after(value) is None
+
+
+class FakeClock:
+    """Monotonic clock that only moves when a test advances it.
+
+    Sleeps are recorded without advancing the clock, so the delays of
+    concurrent requests are all computed at the same instant.
+    """
+
+    def __init__(self):
+        """Start the clock at zero."""
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        """Return the current fake time."""
+        return self.now
+
+    async def sleep(self, delay):
+        """Record the delay instead of sleeping."""
+        self.sleeps.append(delay)
+
+
+@pytest.fixture
+def clock():
+    """Patch the limiter's clock and sleep."""
+    fake = FakeClock()
+    with patch(
+        "custom_components.eltako_esr62pf.rate_limit.time.monotonic", fake.monotonic
+    ), patch(
+        "custom_components.eltako_esr62pf.rate_limit.asyncio.sleep", fake.sleep
+    ):
+        yield fake
+
+
+class TestRateLimiter:
+    """Test the token bucket."""
+
+    def test_invalid_arguments(self):
+        """Test that a non-positive rate or burst is rejected."""
+        with pytest.raises(ValueError):
+            RateLimiter(rate=0)
+        with pytest.raises(ValueError):
+            RateLimiter(burst=0)
+
+    @pytest.mark.asyncio
+    async def test_burst_is_not_delayed(self, clock):
+        """Test that requests up to the burst size are sent at once."""
+        limiter = RateLimiter(rate=2, burst=3)
+
+        for _ in range(3):
+            await limiter.async_acquire()
+
+        assert clock.sleeps == []
+        assert limiter.as_dict()["delayed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_requests_beyond_burst_are_queued(self, clock):
+        """Test that excess requests wait in turn at the configured rate."""
+        limiter = RateLimiter(rate=2, burst=1)
+
+        await limiter.async_acquire()
+        waiters = [asyncio.create_task(limiter.async_acquire()) for _ in range(3)]
+        await asyncio.gather(*waiters)
+
+        # Each queued request is half a second behind the one before it
+        assert clock.sleeps == [0.5, 1.0, 1.5]
+        stats = limiter.as_dict()
+        assert stats["delayed"] == 3
+        assert stats["max_delay"] == 1.5
+        assert stats["waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_tokens_refill(self, clock):
+        """Test that tokens come back over time up to the burst size."""
+        limiter = RateLimiter(rate=2, burst=2)
+        await limiter.async_acquire()
+        await limiter.async_acquire()
+        assert limiter.tokens == 0
+
+        clock.now += 10
+        assert limiter.tokens == 2
+
+    @pytest.mark.asyncio
+    async def test_pause_holds_back_requests(self, clock):
+        """Test that a pause delays the next request and prevents a burst."""
+        limiter = RateLimiter(rate=2, burst=5)
+
+        limiter.pause(3)
+        await limiter.async_acquire()
+        await limiter.async_acquire()
+
+        assert clock.sleeps == [3.0, 3.5]
+        stats = limiter.as_dict()
+        assert stats["pauses"] == 1
+        assert stats["paused_for"] == 3.0
+
+        clock.now += 4
+        assert limiter.as_dict()["paused_for"] == 0
+
+    @pytest.mark.asyncio
+    async def test_pause_extends_queued_requests(self):
+        """Test that requests already waiting also wait for a new pause."""
+        limiter = RateLimiter(rate=50, burst=1)
+        await limiter.async_acquire()
+
+        waiter = asyncio.create_task(limiter.async_acquire())
+        await asyncio.sleep(0)
+        limiter.pause(0.1)
+        start = time.monotonic()
+        await waiter
+
+        assert time.monotonic() - start >= 0.1
+
+    def test_pause_is_capped(self, clock):
+        """Test that an excessive Retry-After is capped."""
+        limiter = RateLimiter()
+
+        limiter.pause(3600)
+
+        assert limiter.paused_for == RETRY_AFTER_MAX
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_returns_token(self):
+        """Test that a cancelled request frees its turn."""
+        limiter = RateLimiter(rate=1, burst=1)
+        await limiter.async_acquire()
+
+        waiter = asyncio.create_task(limiter.async_acquire())
+        await asyncio.sleep(0)
+        assert limiter.tokens < 0
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter.tokens >= 0
+        assert limiter.as_dict()["waiting"] == 0
@@ -0,0 +1,82 @@
+"""Tests for Eltako retry policy and retry budget."""
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.eltako_esr62pf.retry import (
+    RETRY_AUTH,
+    RETRY_CONNECT,
+    RETRY_TIMEOUT,
+    RetryBudget,
+    RetryPolicy,
+)
+
+
+class TestRetryPolicy:
+    """Test retry limits and backoff."""
+
+    def test_max_retries_per_class(self):
+        """Test that each retry class has its own limit."""
+        policy = RetryPolicy(auth_retries=1, connect_retries=3, timeout_retries=2)
+
+        assert policy.max_retries(RETRY_AUTH) == 1
+        assert policy.max_retries(RETRY_CONNECT) == 3
+        assert policy.max_retries(RETRY_TIMEOUT) == 2
+
+    @pytest.mark.parametrize("attempt", range(6))
+    def test_backoff_within_jitter_bounds(self, attempt):
+        """Test that the jittered backoff stays below its ceiling."""
+        policy = RetryPolicy(backoff_initial=1, backoff_base=2, backoff_max=8)
+        ceiling = min(8, 2**attempt)
+
+        for _ in range(50):
+            assert 0 <= policy.backoff(attempt) <= ceiling
+
+    def test_backoff_ceiling_capped(self):
+        """Test that the backoff ceiling grows exponentially up to the cap."""
+        policy = RetryPolicy(backoff_initial=1, backoff_base=2, backoff_max=8)
+
+        with patch(
+            "custom_components.eltako_esr62pf.retry.random.uniform",
+            side_effect=lambda low, high: high,
+        ):
+            assert [policy.backoff(attempt) for attempt in range(6)] == [
+                1,
+                2,
+                4,
+                8,
+                8,
+                8,
+            ]
+
+
+class TestRetryBudget:
+    """Test the retry token bucket."""
+
+    def test_budget_exhausted(self):
+        """Test that retries are denied once the tokens are spent."""
+        budget = RetryBudget(capacity=2, refill_rate=0)
+
+        assert budget.try_acquire() is True
+        assert budget.try_acquire() is True
+        assert budget.try_acquire() is False
+        assert budget.as_dict() == {"tokens": 0, "capacity": 2, "denied": 1}
+
+    def test_budget_refills_over_time(self):
+        """Test that tokens refill at the configured rate."""
+        with patch(
+            "custom_components.eltako_esr62pf.retry.time.monotonic",
+            return_value=100.0,
+        ) as mock_monotonic:
+            budget = RetryBudget(capacity=2, refill_rate=0.5)
+            assert budget.try_acquire() is True
+            assert budget.try_acquire() is True
+            assert budget.try_acquire() is False
+
+            mock_monotonic.return_value = 102.0
+            assert budget.tokens == pytest.approx(1.0)
+            assert budget.try_acquire() is True
+
+            # Refill never exceeds the capacity
+            mock_monotonic.return_value = 1000.0
+            assert budget.tokens == 2
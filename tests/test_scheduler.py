@@ -0,0 +1,210 @@
+"""Tests for Eltako relay command scheduling."""
+import asyncio
+
+import pytest
+
+from custom_components.eltako_esr62pf.scheduler import RelayCommandScheduler
+
+
+async def _settle():
+    """Let freshly created tasks and lane workers run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestRelayCommandScheduler:
+    """Test per-GUID relay command lanes."""
+
+    def test_invalid_max_concurrency(self):
+        """Test that a concurrency cap below 1 is rejected."""
+        with pytest.raises(ValueError):
+            RelayCommandScheduler(max_concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_same_relay_commands_never_overlap(self):
+        """Test that commands for one relay are sent one at a time."""
+        scheduler = RelayCommandScheduler(max_concurrency=4)
+        sent = []
+        active = 0
+        max_active = 0
+
+        async def send(value):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            sent.append(value)
+            active -= 1
+            return value
+
+        assert await scheduler.async_submit("device-1", "on", send) == "on"
+        assert await scheduler.async_submit("device-1", "off", send) == "off"
+
+        assert sent == ["on", "off"]
+        assert max_active == 1
+
+    @pytest.mark.asyncio
+    async def test_different_relays_run_concurrently(self):
+        """Test that commands for different relays overlap."""
+        scheduler = RelayCommandScheduler(max_concurrency=16)
+        active = 0
+        max_active = 0
+
+        async def send(value):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await asyncio.gather(
+            *(scheduler.async_submit(f"device-{i}", "on", send) for i in range(16))
+        )
+
+        assert max_active == 16
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_respected(self):
+        """Test that the device-wide cap limits concurrent commands."""
+        scheduler = RelayCommandScheduler(max_concurrency=3)
+        active = 0
+        max_active = 0
+
+        async def send(value):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await asyncio.gather(
+            *(scheduler.async_submit(f"device-{i}", "on", send) for i in range(10))
+        )
+
+        assert max_active == 3
+        assert scheduler.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_rapid_commands_coalesce_to_newest(self):
+        """Test that commands queued behind an in-flight one collapse."""
+        scheduler = RelayCommandScheduler(max_concurrency=4)
+        release = asyncio.Event()
+        sent = []
+
+        async def send(value):
+            sent.append(value)
+            await release.wait()
+            return value
+
+        first = asyncio.create_task(scheduler.async_submit("device-1", "on", send))
+        await _settle()
+        assert sent == ["on"]
+
+        # on/off/on while the first request is in flight
+        queued = [
+            asyncio.create_task(scheduler.async_submit("device-1", value, send))
+            for value in ("off", "on", "off")
+        ]
+        await _settle()
+        release.set()
+
+        assert await first == "on"
+        assert await asyncio.gather(*queued) == ["off", "off", "off"]
+        assert sent == ["on", "off"]
+
+        lane = scheduler.get_stats()["lanes"]["device-1"]
+        assert lane["submitted"] == 4
+        assert lane["commands"] == 2
+        assert lane["coalesced"] == 2
+        assert scheduler.coalesced == 2
+
+    @pytest.mark.asyncio
+    async def test_coalesced_callers_share_failure(self):
+        """Test that superseded callers receive the newest command's error."""
+        scheduler = RelayCommandScheduler(max_concurrency=1)
+        release = asyncio.Event()
+
+        async def send(value):
+            await release.wait()
+            if value == "off":
+                raise RuntimeError("boom")
+            return value
+
+        first = asyncio.create_task(scheduler.async_submit("device-1", "on", send))
+        await _settle()
+        queued = [
+            asyncio.create_task(scheduler.async_submit("device-1", value, send))
+            for value in ("on", "off")
+        ]
+        await _settle()
+        release.set()
+
+        assert await first == "on"
+        results = await asyncio.gather(*queued, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_lane_stats(self):
+        """Test that queue depth and wait times are reported per lane."""
+        scheduler = RelayCommandScheduler(max_concurrency=1)
+        release = asyncio.Event()
+
+        async def send(value):
+            await release.wait()
+
+        first = asyncio.create_task(scheduler.async_submit("device-1", "on", send))
+        second = asyncio.create_task(scheduler.async_submit("device-2", "on", send))
+        await _settle()
+
+        stats = scheduler.get_stats()
+        assert stats["max_concurrency"] == 1
+        assert stats["in_flight"] == 1
+        assert stats["lanes"]["device-1"]["queue_depth"] == 1
+        assert stats["lanes"]["device-2"]["queue_depth"] == 1
+
+        await asyncio.sleep(0.02)
+        release.set()
+        await asyncio.gather(first, second)
+
+        lane = scheduler.get_stats()["lanes"]["device-2"]
+        assert lane["queue_depth"] == 0
+        assert lane["commands"] == 1
+        assert lane["max_wait"] >= 0.02
+        assert lane["average_wait"] > 0
+
+    @pytest.mark.asyncio
+    async def test_failed_command_releases_lane(self):
+        """Test that a failing command does not block later commands."""
+        scheduler = RelayCommandScheduler(max_concurrency=1)
+
+        async def failing_send(value):
+            raise RuntimeError("boom")
+
+        async def succeeding_send(value):
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            await scheduler.async_submit("device-1", "on", failing_send)
+
+        assert await scheduler.async_submit("device-1", "on", succeeding_send) == "ok"
+        assert scheduler.get_stats()["lanes"]["device-1"]["queue_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_waiters(self):
+        """Test that shutdown cancels in-flight and pending commands."""
+        scheduler = RelayCommandScheduler(max_concurrency=1)
+
+        async def send(value):
+            await asyncio.Event().wait()
+
+        first = asyncio.create_task(scheduler.async_submit("device-1", "on", send))
+        await _settle()
+        second = asyncio.create_task(scheduler.async_submit("device-1", "off", send))
+        await _settle()
+
+        await scheduler.async_shutdown()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        with pytest.raises(asyncio.CancelledError):
+            await second
@@ -0,0 +1,101 @@
+"""Tests for Eltako JSON serializers."""
+import json
+from unittest.mock import patch
+
+import pytest
+from aioresponses import aioresponses
+
+from custom_components.eltako_esr62pf import serializer as serializer_module
+from custom_components.eltako_esr62pf.api import EltakoAPI
+from custom_components.eltako_esr62pf.const import (
+    ENDPOINT_LOGIN,
+    ENDPOINT_RELAY,
+    RELAY_STATE_ON,
+)
+from custom_components.eltako_esr62pf.serializer import (
+    ORJSON_SERIALIZER,
+    STDLIB_SERIALIZER,
+    JSONSerializer,
+    get_default_serializer,
+)
+
+SERIALIZERS = [STDLIB_SERIALIZER] + ([ORJSON_SERIALIZER] if ORJSON_SERIALIZER else [])
+
+
+class TestSerializers:
+    """Test the available serializers."""
+
+    @pytest.mark.parametrize("serializer", SERIALIZERS, ids=lambda s: s.name)
+    def test_round_trip(self, serializer):
+        """Test that encoded payloads decode to the same data."""
+        payload = {"type": "enumeration", "identifier": "relay", "value": "on", "ä": [1, None]}
+
+        body = serializer.dumps(payload)
+
+        assert isinstance(body, bytes)
+        assert json.loads(body) == payload
+        assert serializer.loads(body) == payload
+
+    def test_default_prefers_orjson(self):
+        """Test that orjson is used when it is installed."""
+        expected = ORJSON_SERIALIZER or STDLIB_SERIALIZER
+
+        assert get_default_serializer() is expected
+
+    def test_default_falls_back_to_stdlib(self):
+        """Test the standard library fallback without orjson."""
+        with patch.object(serializer_module, "ORJSON_SERIALIZER", None):
+            assert serializer_module.get_default_serializer() is STDLIB_SERIALIZER
+
+
+class TestAPISerializer:
+    """Test that the API client uses its serializer consistently."""
+
+    @pytest.mark.asyncio
+    async def test_custom_serializer_used_for_requests_and_responses(self):
+        """Test login and relay bodies and responses go through the serializer."""
+        encoded = []
+        decoded = []
+
+        def dumps(obj):
+            encoded.append(obj)
+            return json.dumps(obj).encode()
+
+        def loads(body):
+            decoded.append(body)
+            return json.loads(body)
+
+        client = EltakoAPI(
+            ip_address="192.168.1.100",
+            pop_credential="test_pop_credential",
+            verify_ssl=False,
+            serializer=JSONSerializer(name="recording", dumps=dumps, loads=loads),
+        )
+        endpoint = ENDPOINT_RELAY.format(device_guid="device-1")
+
+        with aioresponses() as mock_resp:
+            mock_resp.post(
+                f"{client.base_url}{ENDPOINT_LOGIN}",
+                payload={"apiKey": "test_key"},
+                status=200,
+            )
+            mock_resp.put(
+                f"{client.base_url}{endpoint}",
+                payload={"value": RELAY_STATE_ON},
+                status=202,
+            )
+
+            await client.async_set_relay("device-1", RELAY_STATE_ON)
+
+        await client.async_close()
+
+        # The relay body is encoded before the lazy login
+        assert len(encoded) == 2
+        assert {"user": "admin", "password": "test_pop_credential"} in encoded
+        assert {
+            "type": "enumeration",
+            "identifier": "relay",
+            "value": RELAY_STATE_ON,
+        } in encoded
+        assert len(decoded) == 2
+        assert client.get_stats()["serializer"] == "recording"
@@ -0,0 +1,209 @@
+"""Tests for Eltako shared connection pools."""
+import asyncio
+
+import pytest
+
+from custom_components.eltako_esr62pf.const import (
+    CONNECTION_KEEPALIVE_TIMEOUT,
+    CONNECTION_POOL_LIMIT_PER_HOST,
+)
+from custom_components.eltako_esr62pf.session import (
+    EltakoSessionPool,
+    create_request_timing_trace,
+    create_session,
+    parse_certificate_fingerprint,
+)
+from custom_components.eltako_esr62pf.timeouts import PHASE_CONNECT, PHASE_FIRST_BYTE
+
+
+class TestParseCertificateFingerprint:
+    """Test certificate fingerprint parsing."""
+
+    def test_plain_hex(self):
+        """Test a fingerprint without separators."""
+        assert parse_certificate_fingerprint("ab" * 32) == bytes.fromhex("ab" * 32)
+
+    def test_openssl_format(self):
+        """Test the colon separated format printed by openssl."""
+        value = "sha256 Fingerprint=" + ":".join(["AB"] * 32)
+        assert parse_certificate_fingerprint(value) == bytes.fromhex("ab" * 32)
+        assert parse_certificate_fingerprint(
+            " " + ":".join(["AB"] * 32) + " "
+        ) == bytes.fromhex("ab" * 32)
+
+    def test_prefixed_fingerprint(self):
+        """Test a fingerprint with a sha256= prefix."""
+        assert parse_certificate_fingerprint(
+            "SHA256=" + ":".join(["01"] * 32)
+        ) == bytes.fromhex("01" * 32)
+
+    @pytest.mark.parametrize("value", ["zz" * 32, "ab" * 20, ""])
+    def test_invalid_fingerprints(self, value):
+        """Test that non-hex and non-SHA-256 values are rejected."""
+        with pytest.raises(ValueError):
+            parse_certificate_fingerprint(value)
+
+
+class TestCreateSession:
+    """Test the tuned session factory."""
+
+    @pytest.mark.asyncio
+    async def test_connector_settings(self):
+        """Test that the connector keeps connections alive per host."""
+        session = create_session("192.168.1.100", timeout=5)
+        try:
+            connector = session.connector
+            assert connector.limit_per_host == CONNECTION_POOL_LIMIT_PER_HOST
+            assert connector._keepalive_timeout == CONNECTION_KEEPALIVE_TIMEOUT
+            assert session.timeout.total == 5
+        finally:
+            await session.close()
+
+    @pytest.mark.asyncio
+    async def test_dns_cache_bypassed_for_ip_literals(self):
+        """Test that DNS caching is only used for host names."""
+        ip_session = create_session("192.168.1.100")
+        ipv6_session = create_session("fe80::1")
+        host_session = create_session("eltako.local")
+        try:
+            assert ip_session.connector.use_dns_cache is False
+            assert ipv6_session.connector.use_dns_cache is False
+            assert host_session.connector.use_dns_cache is True
+        finally:
+            await ip_session.close()
+            await ipv6_session.close()
+            await host_session.close()
+
+
+class TestRequestTimingTrace:
+    """Test request phase tracing of created sessions."""
+
+    @staticmethod
+    async def _fire(signal, context):
+        """Invoke the callbacks of a trace signal."""
+        for callback in signal:
+            await callback(None, context, None)
+
+    @pytest.mark.asyncio
+    async def test_trace_records_request_phases(self):
+        """Test that connect and first-byte latencies are measured."""
+        trace_config = create_request_timing_trace()
+        timing = {}
+        context = trace_config.trace_config_ctx(trace_request_ctx=timing)
+
+        await self._fire(trace_config.on_request_start, context)
+        await self._fire(trace_config.on_connection_create_end, context)
+        await self._fire(trace_config.on_request_headers_sent, context)
+        await asyncio.sleep(0.01)
+        await self._fire(trace_config.on_request_end, context)
+
+        assert timing[PHASE_CONNECT] >= 0
+        assert timing[PHASE_FIRST_BYTE] >= 0.01
+
+    @pytest.mark.asyncio
+    async def test_reused_connection_has_no_connect_phase(self):
+        """Test that no connect latency is recorded for pooled connections."""
+        trace_config = create_request_timing_trace()
+        timing = {}
+        context = trace_config.trace_config_ctx(trace_request_ctx=timing)
+
+        await self._fire(trace_config.on_request_start, context)
+        await self._fire(trace_config.on_request_headers_sent, context)
+        await self._fire(trace_config.on_request_end, context)
+
+        assert PHASE_CONNECT not in timing
+        assert PHASE_FIRST_BYTE in timing
+
+    @pytest.mark.asyncio
+    async def test_session_traces_requests(self):
+        """Test that created sessions carry the timing trace."""
+        session = create_session("192.168.1.100")
+        try:
+            assert len(session.trace_configs) == 1
+        finally:
+            await session.close()
+
+
+class TestEltakoSessionPool:
+    """Test the reference-counted session pool."""
+
+    @pytest.mark.asyncio
+    async def test_same_host_shares_session(self):
+        """Test that entries for the same host:port share one session."""
+        pool = EltakoSessionPool()
+
+        session1 = pool.acquire("192.168.1.100", 443)
+        session2 = pool.acquire("192.168.1.100", 443)
+        other = pool.acquire("192.168.1.100", 8443)
+
+        assert session1 is session2
+        assert other is not session1
+
+        await pool.async_release("192.168.1.100", 443)
+        await pool.async_release("192.168.1.100", 443)
+        await pool.async_release("192.168.1.100", 8443)
+
+    @pytest.mark.asyncio
+    async def test_session_closed_after_last_release(self):
+        """Test that the session is closed once nobody uses it."""
+        pool = EltakoSessionPool()
+
+        session = pool.acquire("192.168.1.100", 443)
+        pool.acquire("192.168.1.100", 443)
+
+        await pool.async_release("192.168.1.100", 443)
+        assert not session.closed
+
+        await pool.async_release("192.168.1.100", 443)
+        assert session.closed
+
+        # Releasing an unknown key is a no-op
+        await pool.async_release("192.168.1.100", 443)
+
+    @pytest.mark.asyncio
+    async def test_same_host_shares_rate_limiter_and_circuit_breaker(self):
+        """Test that entries for the same host:port share their request budget."""
+        pool = EltakoSessionPool()
+        pool.acquire("192.168.1.100", 443)
+        pool.acquire("192.168.1.100", 443)
+        pool.acquire("192.168.1.100", 8443)
+
+        limiter = pool.rate_limiter("192.168.1.100", 443, rate=4, burst=8)
+        breaker = pool.circuit_breaker(
+            "192.168.1.100", 443, failure_threshold=2, recovery_timeout=10
+        )
+        assert pool.rate_limiter("192.168.1.100", 443, rate=10, burst=20) is limiter
+        assert (
+            pool.circuit_breaker(
+                "192.168.1.100", 443, failure_threshold=3, recovery_timeout=30
+            )
+            is breaker
+        )
+        assert limiter.as_dict()["rate"] == 4
+        assert pool.rate_limiter("192.168.1.100", 8443, rate=4, burst=8) is not limiter
+
+        # A new limiter with new settings once every entry released the device
+        await pool.async_release("192.168.1.100", 443)
+        assert pool.rate_limiter("192.168.1.100", 443, rate=10, burst=20) is limiter
+        await pool.async_release("192.168.1.100", 443)
+        pool.acquire("192.168.1.100", 443)
+        new_limiter = pool.rate_limiter("192.168.1.100", 443, rate=10, burst=20)
+        assert new_limiter is not limiter
+        assert new_limiter.as_dict()["rate"] == 10
+
+        await pool.async_release("192.168.1.100", 443)
+        await pool.async_release("192.168.1.100", 8443)
+
+    @pytest.mark.asyncio
+    async def test_closed_session_replaced(self):
+        """Test that a closed session is replaced on the next acquire."""
+        pool = EltakoSessionPool()
+
+        session = pool.acquire("192.168.1.100", 443)
+        await session.close()
+
+        new_session = pool.acquire("192.168.1.100", 443)
+        assert new_session is not session
+        assert not new_session.closed
+
+        await pool.async_release("192.168.1.100", 443)
@@ -0,0 +1,129 @@
+"""Tests for incremental JSON decoding."""
+import json
+import random
+
+import pytest
+
+from custom_components.eltako_esr62pf.streaming import JSONArrayStreamDecoder
+
+
+def _decode_in_chunks(data: bytes, size: int) -> tuple[list, JSONArrayStreamDecoder]:
+    """Feed a document to a new decoder in fixed-size chunks."""
+    decoder = JSONArrayStreamDecoder()
+    items = []
+    for start in range(0, len(data), size):
+        items.extend(decoder.feed(data[start : start + size]))
+    decoder.close()
+    return items, decoder
+
+
+class TestJSONArrayStreamDecoder:
+    """Test decoding a top-level JSON array element by element."""
+
+    DOCUMENT = [
+        {
+            "deviceGuid": "device-1",
+            "displayName": "Küche",
+            "functions": [{"identifier": "relay", "value": "on"}],
+            "settings": [{"identifier": "mode", "value": [1, 2, {"nested": "]"}]}],
+        },
+        {"deviceGuid": "device-2", "displayName": "Relay, \"2\"", "functions": []},
+        12345,
+        None,
+        "text",
+    ]
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 4096])
+    def test_any_chunking_yields_all_elements(self, size):
+        """Test that chunk boundaries, including inside UTF-8 characters, are handled."""
+        data = json.dumps(self.DOCUMENT, ensure_ascii=False, indent=2).encode()
+
+        items, decoder = _decode_in_chunks(data, size)
+
+        assert items == self.DOCUMENT
+        assert decoder.is_array is True
+
+    def test_elements_are_decoded_as_they_arrive(self):
+        """Test that a complete element is returned before the array ends."""
+        decoder = JSONArrayStreamDecoder()
+
+        assert decoder.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+        assert decoder.feed(b": 2}]") == [{"b": 2}]
+        assert decoder.close() is None
+
+    def test_split_number_is_not_truncated(self):
+        """Test that a number split across chunks is decoded whole."""
+        decoder = JSONArrayStreamDecoder()
+
+        assert decoder.feed(b"[12") == []
+        assert decoder.feed(b"34]") == [1234]
+
+    @pytest.mark.parametrize(
+        "chunks",
+        [[b"[2.", b"5]"], [b"[-", b"1e", b"+3]"], [b"[1E", b"-2, 3]"], [b"[0.5, 7", b"]"]],
+    )
+    def test_split_fraction_and_exponent(self, chunks):
+        """Test that a number cut after '.', 'e' or a sign waits for its rest."""
+        decoder = JSONArrayStreamDecoder()
+        items = []
+        for chunk in chunks:
+            items.extend(decoder.feed(chunk))
+        decoder.close()
+
+        assert items == json.loads(b"".join(chunks))
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_chunk_splits_with_numbers(self, seed):
+        """Test random chunk boundaries over floats, exponents and negatives."""
+        rng = random.Random(seed)
+        document = [
+            2.5,
+            -0.125,
+            1e-7,
+            6.02e23,
+            -3E+2,
+            0,
+            -17,
+            {"value": 1.5e3, "list": [-2.25, 4]},
+            123456789,
+        ]
+        data = json.dumps(document).replace("e-07", "E-7").encode()
+
+        decoder = JSONArrayStreamDecoder()
+        items = []
+        pos = 0
+        while pos < len(data):
+            size = rng.randint(1, 6)
+            items.extend(decoder.feed(data[pos : pos + size]))
+            pos += size
+        decoder.close()
+
+        assert items == json.loads(data)
+
+    def test_empty_array(self):
+        """Test decoding an empty array."""
+        items, decoder = _decode_in_chunks(b" [ ] ", 1)
+
+        assert items == []
+        assert decoder.is_array is True
+
+    def test_non_array_document(self):
+        """Test that other documents are decoded whole by close."""
+        decoder = JSONArrayStreamDecoder()
+
+        assert decoder.feed(b'{"devices": ') == []
+        assert decoder.feed(b"[]}") == []
+        assert decoder.is_array is False
+        assert decoder.close() == {"devices": []}
+
+    @pytest.mark.parametrize(
+        "data",
+        [b'[{"a": 1}', b'[{"a": 1} {"b": 2}]', b"[1,]", b"[1] x", b"", b"{"],
+    )
+    def test_malformed_documents(self, data):
+        """Test that incomplete or malformed documents raise ValueError."""
+        decoder = JSONArrayStreamDecoder()
+
+        with pytest.raises(ValueError):
+            decoder.feed(data)
+            decoder.close()
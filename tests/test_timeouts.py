@@ -0,0 +1,121 @@
+"""Tests for Eltako adaptive request timeouts."""
+import pytest
+
+from custom_components.eltako_esr62pf.const import (
+    ADAPTIVE_TIMEOUT_MULTIPLIER,
+    ENDPOINT_DEVICES,
+    ENDPOINT_RELAY,
+)
+from custom_components.eltako_esr62pf.timeouts import (
+    PHASE_CONNECT,
+    PHASE_FIRST_BYTE,
+    PHASE_TOTAL,
+    AdaptiveTimeouts,
+)
+
+
+def _record(timeouts, endpoint, count, **timing):
+    """Record the same timing several times."""
+    for _ in range(count):
+        timeouts.record(endpoint, dict(timing))
+
+
+class TestAdaptiveTimeouts:
+    """Test timeouts learned from latency samples."""
+
+    def test_floor_above_ceiling_rejected(self):
+        """Test that inconsistent bounds are rejected."""
+        with pytest.raises(ValueError):
+            AdaptiveTimeouts(total_floor=5, total_ceiling=1)
+
+    def test_ceiling_until_enough_samples(self):
+        """Test that unobserved endpoints get the ceiling timeouts."""
+        timeouts = AdaptiveTimeouts(total_ceiling=10, min_samples=5)
+        _record(timeouts, ENDPOINT_DEVICES, 4, total=0.1)
+
+        client_timeout = timeouts.client_timeout(ENDPOINT_DEVICES)
+        assert client_timeout.total == 10
+        assert client_timeout.sock_read == 10
+
+    def test_timeouts_adapt_to_latency(self):
+        """Test that each phase timeout follows its own latencies."""
+        timeouts = AdaptiveTimeouts(
+            connect_floor=0.01,
+            first_byte_floor=0.01,
+            total_floor=0.01,
+            min_samples=5,
+        )
+        _record(
+            timeouts, ENDPOINT_RELAY, 5, connect=0.05, first_byte=0.1, total=0.2
+        )
+
+        client_timeout = timeouts.client_timeout(ENDPOINT_RELAY)
+        assert client_timeout.sock_connect == pytest.approx(
+            0.05 * ADAPTIVE_TIMEOUT_MULTIPLIER
+        )
+        assert client_timeout.sock_read == pytest.approx(
+            0.1 * ADAPTIVE_TIMEOUT_MULTIPLIER
+        )
+        assert client_timeout.total == pytest.approx(0.2 * ADAPTIVE_TIMEOUT_MULTIPLIER)
+
+        # Other endpoints keep their own, still unlearned timeouts
+        assert timeouts.get_timeout(ENDPOINT_DEVICES, PHASE_TOTAL) == 10
+
+    def test_timeouts_bounded(self):
+        """Test that floors and ceilings bound the learned timeouts."""
+        timeouts = AdaptiveTimeouts(
+            total_floor=1, total_ceiling=3, connect_ceiling=2, min_samples=1
+        )
+        _record(timeouts, ENDPOINT_RELAY, 1, total=0.01, connect=5)
+
+        assert timeouts.get_timeout(ENDPOINT_RELAY, PHASE_TOTAL) == 1
+        assert timeouts.get_timeout(ENDPOINT_RELAY, PHASE_CONNECT) == 2
+
+        _record(timeouts, ENDPOINT_RELAY, 1, total=10)
+        assert timeouts.get_timeout(ENDPOINT_RELAY, PHASE_TOTAL) == 3
+
+    def test_total_capped_by_remaining_deadline(self):
+        """Test that the total timeout never exceeds the time left."""
+        timeouts = AdaptiveTimeouts(total_ceiling=10)
+
+        assert timeouts.client_timeout(ENDPOINT_RELAY, remaining=2.5).total == 2.5
+
+    def test_as_dict(self):
+        """Test that timeouts and latencies are reported per endpoint."""
+        timeouts = AdaptiveTimeouts()
+        _record(timeouts, ENDPOINT_RELAY, 1, first_byte=0.1, total=0.2)
+
+        stats = timeouts.as_dict()[ENDPOINT_RELAY]
+        assert stats[PHASE_TOTAL]["count"] == 1
+        assert stats[PHASE_FIRST_BYTE]["p50"] == 0.1
+        assert stats[PHASE_CONNECT]["count"] == 0
+
+    def test_timeout_resets_learned_timeouts(self):
+        """Test that a timeout falls back to the ceiling until relearned."""
+        timeouts = AdaptiveTimeouts(total_ceiling=10, min_samples=5)
+        _record(timeouts, ENDPOINT_RELAY, 5, total=0.05)
+        _record(timeouts, ENDPOINT_DEVICES, 5, total=0.05)
+        assert timeouts.get_timeout(ENDPOINT_RELAY, PHASE_TOTAL) < 10
+
+        timeouts.record_timeout(ENDPOINT_RELAY)
+
+        assert timeouts.get_timeout(ENDPOINT_RELAY, PHASE_TOTAL) == 10
+        assert timeouts.get_timeout(ENDPOINT_DEVICES, PHASE_TOTAL) < 10
+
+        # Only samples at the new latency are learned again
+        _record(timeouts, ENDPOINT_RELAY, 5, total=1)
+        assert timeouts.get_timeout(ENDPOINT_RELAY, PHASE_TOTAL) == pytest.approx(
+            1 * ADAPTIVE_TIMEOUT_MULTIPLIER
+        )
+
+    def test_ceilings_when_not_learned(self):
+        """Test that learned=False ignores the learned timeouts."""
+        timeouts = AdaptiveTimeouts(
+            connect_ceiling=5, first_byte_ceiling=10, total_ceiling=10, min_samples=1
+        )
+        _record(timeouts, ENDPOINT_RELAY, 1, connect=0.01, first_byte=0.01, total=0.01)
+
+        client_timeout = timeouts.client_timeout(ENDPOINT_RELAY, learned=False)
+        assert client_timeout.total == 10
+        assert client_timeout.sock_read == 10
+        assert client_timeout.sock_connect == 5